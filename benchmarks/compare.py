@@ -0,0 +1,64 @@
+"""
+Compare two benchmark reports from benchmarks/suite.py.
+
+Cases are matched by benchmark name + parameters. Prints the median time
+of each case in both runs; exits 1 if any case got slower than
+`--tolerance` times its baseline.
+
+Usage:
+    python benchmarks/compare.py baseline.json current.json
+    python benchmarks/compare.py baseline.json current.json --tolerance 1.2
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+def _key(result: Dict) -> Tuple[str, str]:
+    return result["benchmark"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> Tuple[List[str], List[str]]:
+    """(report lines, regressions) for cases present in both reports."""
+    previous = {_key(r): r for r in baseline["results"]}
+    lines, regressions = [], []
+    for result in current["results"]:
+        base = previous.get(_key(result))
+        if base is None:
+            lines.append(f"  new   {result['benchmark']} {result['params']}: {result['median_s']:.6f}s")
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else 1.0
+        flag = "SLOW " if ratio > tolerance else "     "
+        line = (
+            f"{flag} {result['benchmark']} {result['params']}: "
+            f"{base['median_s']:.6f}s -> {result['median_s']:.6f}s ({ratio:.2f}x)"
+        )
+        lines.append(line)
+        if ratio > tolerance:
+            regressions.append(line.strip())
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor (default 1.5)")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    print(f"baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')}")
+    lines, regressions = compare(baseline, current, args.tolerance)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance}x", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
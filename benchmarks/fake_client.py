@@ -0,0 +1,83 @@
+"""
+Configurable offline stand-in for a vendor client.
+
+FakeClient implements the AIClient interface with simulated latency:
+time-to-first-token, a steady token rate, random jitter and failures at
+chosen points (whole calls, or mid-stream after N tokens). It is seeded, so
+runs are reproducible, and never touches the network.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from chambers.models.base import AIClient
+
+WORDS = (
+    "council forge plan context budget stream latency token vendor round "
+    "summary history pinned anvil blacksmith index reply model cache"
+).split()
+
+
+@dataclass
+class FakeProfile:
+    """Latency/failure behaviour of one fake vendor."""
+    ttft_s: float = 0.0            # Delay before the first chunk
+    tokens_per_s: float = 0.0      # 0 = no delay between chunks
+    jitter: float = 0.0            # +/- fraction applied to every delay
+    reply_tokens: int = 50         # Chunks (one word each) per reply
+    fail_calls: Set[int] = field(default_factory=set)  # 0-based call numbers that fail...
+    fail_after_tokens: int = 0     # ...after streaming this many chunks
+    healthy: bool = True
+
+
+class FakeClient(AIClient):
+    """Streams `reply_tokens` words per call according to a FakeProfile."""
+
+    supports_prefill = True
+
+    def __init__(self, ai_id: str = "fake", profile: Optional[FakeProfile] = None, seed: int = 0):
+        self.ai_id = ai_id
+        self.profile = profile or FakeProfile()
+        self.random = random.Random(f"{seed}:{ai_id}")
+        self.calls = 0
+
+    async def health_check(self) -> bool:
+        return self.profile.healthy
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)  # Still yield, like a real network read
+            return
+        jitter = self.profile.jitter
+        await asyncio.sleep(seconds * self.random.uniform(1 - jitter, 1 + jitter))
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        profile = self.profile
+        call = self.calls
+        self.calls += 1
+        failing = call in profile.fail_calls
+
+        await self._sleep(profile.ttft_s)
+        gap = 1 / profile.tokens_per_s if profile.tokens_per_s else 0.0
+        for i in range(profile.reply_tokens):
+            if failing and i == profile.fail_after_tokens:
+                raise ConnectionError(f"{self.ai_id}: simulated failure on call {call}")
+            if i:
+                await self._sleep(gap)
+            yield f"{self.random.choice(WORDS)} "
+
+        if failing:
+            raise ConnectionError(f"{self.ai_id}: simulated failure on call {call}")
+        if usage is not None:
+            usage.update({
+                "input_tokens": sum(len(m["content"]) for m in messages) // 4,
+                "output_tokens": profile.reply_tokens,
+            })
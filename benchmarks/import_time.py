@@ -0,0 +1,102 @@
+"""
+Cold-start import benchmark (`python -X importtime` report).
+
+Imports each entry point in a fresh interpreter, parses the importtime
+output and reports the cumulative import time plus the heaviest modules.
+It also lists which vendor SDKs got loaded: startup entry points must not
+import any of them (they are loaded lazily by chambers.models.registry).
+
+Usage:
+    python benchmarks/import_time.py                      # print report
+    python benchmarks/import_time.py --output report.json
+    python benchmarks/import_time.py --check benchmarks/import_time_baseline.json
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = ["chambers.coordinator", "chambers.app", "chambers.database"]
+VENDOR_SDKS = ["anthropic", "openai", "google.generativeai"]
+TOP_N = 10
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module: str, runs: int = 3) -> Dict:
+    """Best-of-`runs` cold import of `module` in a fresh interpreter."""
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        modules = {}
+        for line in proc.stderr.splitlines():
+            match = LINE.match(line)
+            if match:
+                self_us, cumulative_us, _, name = match.groups()
+                modules[name] = (int(self_us), int(cumulative_us))
+        total_us = modules[module][1]
+        if best is None or total_us < best[0]:
+            best = (total_us, modules)
+
+    total_us, modules = best
+    heaviest = sorted(modules.items(), key=lambda kv: kv[1][1], reverse=True)
+    return {
+        "module": module,
+        "cumulative_ms": round(total_us / 1000, 1),
+        "vendor_sdks_loaded": [sdk for sdk in VENDOR_SDKS if sdk in modules],
+        "heaviest": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 1)}
+            for name, (_, cum) in heaviest if name != module
+        ][:TOP_N],
+    }
+
+
+def check(report: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Regressions vs. a baseline: vendor SDKs at startup, or > tolerance x slower."""
+    problems = []
+    previous = {entry["module"]: entry for entry in baseline}
+    for entry in report:
+        if entry["vendor_sdks_loaded"]:
+            problems.append(f"{entry['module']} imports vendor SDKs: {entry['vendor_sdks_loaded']}")
+        base = previous.get(entry["module"])
+        if base and entry["cumulative_ms"] > base["cumulative_ms"] * tolerance:
+            problems.append(
+                f"{entry['module']}: {entry['cumulative_ms']}ms vs baseline {base['cumulative_ms']}ms"
+            )
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--check", metavar="BASELINE", help="Fail on regressions vs. this report")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor (default 1.5)")
+    args = parser.parse_args()
+
+    report = [measure(module) for module in ENTRY_POINTS]
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text())
+        problems = check(report, baseline, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
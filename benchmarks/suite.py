@@ -0,0 +1,266 @@
+"""
+Offline benchmark suite: coordinator rounds, database and stream rendering.
+
+Everything runs against FakeClient (benchmarks/fake_client.py) and a
+temporary SQLite file, so no API keys or network are needed.
+
+- round:  TurnCoordinator.run_round wall time as council size and history
+          length grow (fake vendors with configurable TTFT/rate/jitter)
+- db:     save_message / queue_messages+flush / get_session_messages throughput
+- render: StreamRenderer overhead, rendering into an off-screen Rich console
+
+Results are JSON (one entry per benchmark + parameters); compare two runs
+with benchmarks/compare.py.
+
+Usage:
+    python benchmarks/suite.py                            # print report
+    python benchmarks/suite.py --quick --output run.json
+    python benchmarks/suite.py --only round --ttft 0.05 --rate 200 --parallel
+    python benchmarks/suite.py --only round --fail-calls 1,3 --fail-after-tokens 20
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from rich.console import Console  # noqa: E402
+
+from chambers import coordinator as coordinator_module  # noqa: E402
+from chambers.config import AIModelConfig, AppConfig, UIConfig  # noqa: E402
+from chambers.coordinator import TurnCoordinator  # noqa: E402
+from chambers.database import Database  # noqa: E402
+from chambers.render import StreamRenderer  # noqa: E402
+
+from fake_client import WORDS, FakeClient, FakeProfile  # noqa: E402
+
+FULL_GRID = {"council": [1, 3, 6], "history": [10, 200, 1000], "db_messages": 2000, "render_chunks": 5000}
+QUICK_GRID = {"council": [1, 3], "history": [10, 200], "db_messages": 300, "render_chunks": 1000}
+
+
+def _text(words: int, seed: int) -> str:
+    return " ".join(WORDS[(seed + i * 7) % len(WORDS)] for i in range(words))
+
+
+def _history(length: int) -> List[Dict[str, str]]:
+    """Alternating Vinga / Council messages of ~60 words each."""
+    messages = []
+    for i in range(length):
+        if i % 2 == 0:
+            messages.append({"role": "user", "content": _text(60, i)})
+        else:
+            speaker = f"fake{i % 3}"
+            messages.append({
+                "role": "assistant",
+                "content": f"[{speaker.capitalize()}]: {_text(60, i)}",
+                "speaker": speaker,
+            })
+    return messages
+
+
+def _result(name: str, params: Dict, samples: List[float], ops: int = 1) -> Dict:
+    median = statistics.median(samples)
+    return {
+        "benchmark": name,
+        "params": params,
+        "runs": len(samples),
+        "median_s": round(median, 6),
+        "min_s": round(min(samples), 6),
+        "ops_per_s": round(ops / median, 1) if median else None,
+    }
+
+
+# --- round ---
+
+async def bench_round(council: int, history: int, profile: FakeProfile, parallel: bool, runs: int) -> Dict:
+    cfg = AppConfig(_env_file=None)
+    cfg.ai_models = {
+        f"fake{i}": AIModelConfig(model=f"fake-model-{i}", vendor=f"fake-vendor-{i}")
+        for i in range(council)
+    }
+    cfg.latency.parallel_rounds = parallel
+    cfg.latency.hedge_ttft_s = None
+    cfg.resilience.backoff_base_s = 0.0
+
+    def client_class(vendor: str) -> Callable[[str], FakeClient]:
+        return lambda ai_id: FakeClient(ai_id, profile)
+
+    with patch.object(coordinator_module, "config", cfg), \
+            patch.object(coordinator_module, "get_client_class", client_class):
+        coord = TurnCoordinator("bench")
+        await coord.initialize()
+        base = _history(history)
+        # Warm-up (tokenizer load, first prompt/view construction) is not measured
+        await coord.run_round(base + [{"role": "user", "content": "@Council warm up"}], stream_callback=_discard)
+
+        samples = []
+        for run in range(runs):
+            messages = base + [{"role": "user", "content": f"@Council run {run}"}]
+            started = time.perf_counter()
+            await coord.run_round(messages, stream_callback=_discard)
+            samples.append(time.perf_counter() - started)
+
+    params = {
+        "council": council, "history": history, "parallel": parallel,
+        "ttft_s": profile.ttft_s, "tokens_per_s": profile.tokens_per_s,
+        "reply_tokens": profile.reply_tokens, "fail_calls": sorted(profile.fail_calls),
+    }
+    return _result("round", params, samples)
+
+
+async def _discard(speaker: str, chunk) -> None:
+    pass
+
+
+# --- db ---
+
+async def bench_db(count: int, runs: int) -> List[Dict]:
+    saves, batches, reads = [], [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(Path(tmp) / "bench.db")
+            await db.open()
+            try:
+                session_id = await db.create_session()
+                content = _text(60, 1)
+
+                started = time.perf_counter()
+                for i in range(count // 10):  # Awaited one by one: one commit each
+                    await db.save_message(session_id, "claude", content, {"i": i})
+                saves.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                db.queue_messages(session_id, [("gemini", content, {"i": i}) for i in range(count)])
+                await db.flush()
+                batches.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                rows = await db.get_session_messages(session_id)
+                reads.append(time.perf_counter() - started)
+                assert len(rows) == count + count // 10
+            finally:
+                await db.close()
+
+    return [
+        _result("db.save_message", {"messages": count // 10}, saves, count // 10),
+        _result("db.queue_messages", {"messages": count}, batches, count),
+        _result("db.get_session_messages", {"rows": count + count // 10}, reads, count + count // 10),
+    ]
+
+
+# --- render ---
+
+class HeadlessLog:
+    """RichLog stand-in: renders every write into an off-screen console."""
+
+    def __init__(self):
+        self.console = Console(file=io.StringIO(), width=100, force_terminal=True)
+
+    def write(self, renderable) -> None:
+        self.console.print(renderable)
+
+
+def _markdown_chunks(count: int) -> List[str]:
+    """A Markdown reply (paragraphs, lists, code) split into word-sized chunks."""
+    chunks = []
+    for i in range(count):
+        chunks.append(f"{WORDS[i % len(WORDS)]} ")
+        if i % 40 == 39:
+            chunks.append("\n\n- item one\n- item two\n\n")
+        if i % 150 == 149:
+            chunks.append("\n```python\nprint('forge')\n```\n\n")
+    return chunks
+
+
+async def bench_render(count: int, runs: int, chunks_per_frame: int = 10) -> Dict:
+    chunks = _markdown_chunks(count)
+    samples = []
+    for _ in range(runs):
+        renderer = StreamRenderer(HeadlessLog(), UIConfig())
+        started = time.perf_counter()
+        for i, chunk in enumerate(chunks):
+            renderer.push("claude", chunk)
+            if i % chunks_per_frame == 0:
+                await renderer.flush()
+        await renderer.finish()
+        samples.append(time.perf_counter() - started)
+    return _result("render", {"chunks": len(chunks), "chunks_per_frame": chunks_per_frame}, samples, len(chunks))
+
+
+# --- main ---
+
+def _meta() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    grid = QUICK_GRID if args.quick else FULL_GRID
+    profile = FakeProfile(
+        ttft_s=args.ttft, tokens_per_s=args.rate, jitter=args.jitter, reply_tokens=args.reply_tokens,
+        fail_calls={int(n) for n in args.fail_calls.split(",") if n},
+        fail_after_tokens=args.fail_after_tokens,
+    )
+    results = []
+    if args.only in (None, "round"):
+        for council in grid["council"]:
+            for history in grid["history"]:
+                results.append(await bench_round(council, history, profile, args.parallel, args.runs))
+    if args.only in (None, "db"):
+        results.extend(await bench_db(grid["db_messages"], args.runs))
+    if args.only in (None, "render"):
+        results.append(await bench_render(grid["render_chunks"], args.runs))
+    return {"meta": _meta(), "results": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--only", choices=["round", "db", "render"], help="Run a single benchmark group")
+    parser.add_argument("--quick", action="store_true", help="Smaller grid (CI smoke run)")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per case (median reported)")
+    parser.add_argument("--parallel", action="store_true", help="Rounds with latency.parallel_rounds on")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Fake time-to-first-token (s)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Fake tokens/s (0 = unthrottled)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake latency jitter fraction")
+    parser.add_argument("--reply-tokens", type=int, default=50, help="Chunks per fake reply")
+    parser.add_argument("--fail-calls", default="", help="Comma-separated 0-based calls (per vendor) that fail")
+    parser.add_argument("--fail-after-tokens", type=int, default=0, help="Failing calls die after this many chunks")
+    args = parser.parse_args()
+    # Expected offline noise (tiktoken download, simulated failures) would swamp the report
+    logging.getLogger("chambers").setLevel(logging.ERROR)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,26 @@
 from textual.app import App, ComposeResult
+from textual.message import Message
 from textual.widgets import Header, Footer, RichLog, TextArea
 from textual.containers import Vertical
 from textual import events
 from rich.markdown import Markdown
+from rich.markup import escape
+from rich.text import Text
 import asyncio
-from typing import List, Dict
+import time
+from collections import deque
+from typing import Any, Deque, List, Dict, Optional
 from .config import config
-from .database import init_db, create_session, save_message, get_session_messages
-from .coordinator import TurnCoordinator
+from .database import db, init_db, close_db, create_session
+from .coordinator import USER_SPEAKER, TurnCoordinator
+from .export import FORMATS, export_sessions
+from .metrics import metrics
+from .pinned import pinned_store
+from .render import StreamRenderer, render_message
+from .response_cache import response_cache
+
+# Ignore scroll-to-top events for this long after a page was loaded
+SCROLLBACK_DEBOUNCE_S = 0.5
 
 class ChatInput(TextArea):
     """Custom TextArea that submits on Enter, inserts newline on Shift+Enter."""
@@ -34,6 +47,17 @@ class ChatInput(TextArea):
         else:
             await super()._on_key(event)
 
+class ChatLog(RichLog):
+    """RichLog that reports when the user scrolls to the very top."""
+
+    class ReachedTop(Message):
+        """Scrolled to the top: time to fetch older messages."""
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value == 0 and old_value > 0:
+            self.post_message(self.ReachedTop())
+
 class ChambersApp(App):
     CSS = """
     Screen {
@@ -54,6 +78,7 @@ class ChambersApp(App):
     BINDINGS = [
         ("ctrl+c", "quit", "Quit"),
         ("ctrl+d", "toggle_dark", "Dark/Light"),
+        ("ctrl+u", "load_older", "Older"),
     ]
 
     def __init__(self):
@@ -62,6 +87,12 @@ class ChambersApp(App):
         self.coordinator = None
         self.conversation_history: List[Dict[str, str]] = []
 
+        # Rendered window of a resumed session: only these rows are in the log
+        self.transcript: Deque[Dict[str, Any]] = deque(maxlen=config.ui.scrollback_max)
+        self.oldest_rendered_id: Optional[int] = None  # None: nothing older to fetch
+        self.window_detached = False  # Scrolled back far enough to drop the newest rows
+        self._paged_at = 0.0
+
     async def on_mount(self) -> None:
         """Initialize DB, Session, and Coordinator on startup."""
         log = self.query_one(RichLog)
@@ -80,72 +111,245 @@ class ChambersApp(App):
         
         log.write("Keys: " + " | ".join(keys_status))
         
+        db.metrics = metrics  # Commit latency per write batch
         await init_db()
         self.session_id = await create_session()
         log.write(f"[bold green]Session Started:[/bold green] {self.session_id}")
         
-        self.coordinator = TurnCoordinator(self.session_id)
+        self.coordinator = TurnCoordinator(
+            self.session_id, db=db, metrics=metrics,
+            response_cache=response_cache if config.response_cache.enabled else None,
+            pinned=pinned_store,
+        )
         try:
             log.write("[yellow]Initializing Council...[/yellow]")
-            await self.coordinator.initialize()
-            log.write("[green]Council Ready.[/green]")
+            # Health checks run in the background; the UI is usable right away
+            await self.coordinator.initialize(wait_for_health=False)
+            self.run_worker(self._report_council_health())
         except Exception as e:
             log.write(f"[bold red]Council Init Failed:[/bold red] {e}")
 
+    async def _report_council_health(self) -> None:
+        """Announce the Council once the background health checks finish."""
+        log = self.query_one(RichLog)
+        await self.coordinator.health_task
+        if self.coordinator.speaker_queue:
+            members = ", ".join(ai_id.capitalize() for ai_id in self.coordinator.speaker_queue)
+            log.write(f"[green]Council Ready:[/green] {members}")
+        else:
+            log.write(
+                "[bold red]Council Init Failed:[/bold red] No healthy AI models available. "
+                "Check API keys and network connectivity."
+            )
+
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
-        yield RichLog(markup=True, wrap=True)
+        yield ChatLog(markup=True, wrap=True)
         yield ChatInput()
         yield Footer()
 
     async def submit_message(self, text: str) -> None:
         """Handle user input submission."""
-        if not text.strip() or not self.coordinator:
+        if not text.strip():
             return
 
         user_msg = text.strip()
         
         log = self.query_one(RichLog)
+
+        if user_msg == "/debug":
+            # Rolling per-speaker latency percentiles (not sent to the Council)
+            log.write("[bold magenta]Metrics (rolling p50/p95):[/bold magenta]")
+            log.write(Text(metrics.summary()))
+            if self.coordinator:
+                log.write(f"[dim]{self.coordinator.context.usage_summary()}[/dim]")
+            return
+
+        if not self.coordinator:
+            return  # Council not started yet
+
+        if user_msg.startswith("/search"):
+            await self.search(user_msg[len("/search"):].strip())
+            return
+
+        if user_msg.startswith("/export"):
+            # In the background: an archive export shouldn't freeze the chat
+            self.run_worker(self.export(user_msg[len("/export"):].split()), group="export")
+            return
+
+        if user_msg.startswith("/resume"):
+            await self.resume_session(user_msg[len("/resume"):].strip())
+            return
+
+        if self.window_detached:
+            # Back to the live tail before the conversation continues
+            await self._render_tail()
         
         # 1. Update UI & State
-        log.write(f"[bold blue]Vinga:[/bold blue] {user_msg}")
+        log.write(f"[bold blue]{USER_SPEAKER}:[/bold blue] {user_msg}")
         self.conversation_history.append({"role": "user", "content": user_msg})
-        await save_message(self.session_id, "Vinga", user_msg)
+        self.transcript.append({"id": None, "speaker": USER_SPEAKER, "content": user_msg})
+        # Write-behind: committed by the DB writer while the Council thinks
+        db.queue_messages(self.session_id, [(USER_SPEAKER, user_msg, None)])
+
+        # 2. Streaming Callback (buffer only; the renderer draws at ui.render_fps)
+        renderer = StreamRenderer(log, config.ui)
+        renderer.start(self)
 
-        # 2. Streaming Callback
-        current_speaker = None
-        line_buffer = ""
-        
         async def stream_callback(speaker, chunk):
-            nonlocal current_speaker, line_buffer
-            
-            if speaker != current_speaker:
-                if line_buffer:
-                    log.write(line_buffer)
-                    line_buffer = ""
-                log.write(f"\n\n[bold yellow]🤖 {speaker.upper()}:[/bold yellow]")
-                current_speaker = speaker
-            
-            line_buffer += chunk
-            if "\n" in line_buffer:
-                lines = line_buffer.split("\n")
-                for line in lines[:-1]:
-                    log.write(line)
-                line_buffer = lines[-1]
+            renderer.push(speaker, chunk)
 
         # 3. Trigger Round
-        responses = await self.coordinator.run_round(
-            self.conversation_history, 
-            stream_callback=stream_callback
-        )
-        
-        if line_buffer:
-            log.write(line_buffer)
+        try:
+            responses = await self.coordinator.run_round(
+                self.conversation_history, 
+                stream_callback=stream_callback
+            )
+        finally:
+            await renderer.finish()
+
+        self._show_context_usage()
         
-        # 4. Finalize
-        for resp in responses:
-            if resp["success"]:
-                await save_message(self.session_id, resp["speaker"], resp["content"])
+        # 4. Finalize (whole round in one transaction, off the UI path; a bare [[PASS]] has no content)
+        succeeded = [resp for resp in responses if resp["success"] and resp["content"]]
+        db.queue_messages(self.session_id, [
+            (resp["speaker"], resp["content"], resp.get("metadata")) for resp in succeeded
+        ])
+        self.transcript.extend(
+            {"id": None, "speaker": resp["speaker"], "content": resp["content"]} for resp in succeeded
+        )
+
+    async def search(self, args: str) -> None:
+        """/search <words> [--page N]: ranked full-text search across all sessions."""
+        log = self.query_one(RichLog)
+        query, _, page = args.partition("--page")
+        query = query.strip()
+        if not query:
+            log.write("[yellow]Usage:[/yellow] /search <words> [--page N]  (word* for prefixes)")
+            return
+        try:
+            page_number = max(1, int(page)) if page.strip() else 1
+        except ValueError:
+            log.write(f"[yellow]Not a page number:[/yellow] {escape(page.strip())}")
+            return
+
+        size = config.ui.search_page
+        # Control-character markers survive escaping; swapped for markup afterwards
+        hits = await db.search_messages(
+            query, limit=size, offset=(page_number - 1) * size, highlight=("\x02", "\x03")
+        )
+        log.write(f"[bold magenta]Search:[/bold magenta] {escape(query)} (page {page_number})")
+        if not hits:
+            log.write("[dim]No matches.[/dim]")
+            return
+        for hit in hits:
+            snippet = escape(hit["snippet"].replace("\n", " "))
+            snippet = snippet.replace("\x02", "[reverse]").replace("\x03", "[/reverse]")
+            log.write(
+                f"[dim]{hit['session_id'][:8]} {hit['timestamp'][:16]}[/dim] "
+                f"[bold]{escape(hit['speaker'])}:[/bold] {snippet}"
+            )
+        if len(hits) == size:
+            log.write(f"[dim]More: /search {escape(query)} --page {page_number + 1}[/dim]")
+
+    async def export(self, args: List[str]) -> None:
+        """/export [all|last|N-M|session-id] [md|ndjson]: stream sessions to export.out_dir."""
+        log = self.query_one(RichLog)
+        fmt = next((arg for arg in args if arg in FORMATS), None)
+        selectors = [arg for arg in args if arg not in FORMATS]
+        selector = selectors[0] if selectors else "last"
+        log.write(f"[yellow]Exporting {escape(selector)}...[/yellow]")
+        try:
+            result = await export_sessions(db, selector, fmt=fmt)
+        except ValueError as e:
+            log.write(f"[bold red]Export failed:[/bold red] {escape(str(e))}")
+            return
+        log.write(f"[green]Export complete:[/green] {result.summary()} -> {config.export.out_dir}")
+
+    async def resume_session(self, session_id: str) -> None:
+        """
+        /resume <session-id>: continue a stored session.
+
+        Only the tail that fits the hot context budget is loaded into the
+        Council's memory and only the last `ui.resume_window` messages are
+        rendered; older ones are fetched page by page on scroll-back.
+        """
+        log = self.query_one(RichLog)
+        if not self.coordinator:
+            return
+        if not session_id:
+            log.write("[yellow]Usage:[/yellow] /resume <session-id>")
+            return
+        try:
+            self.conversation_history = await self.coordinator.resume(session_id)
+        except KeyError:
+            log.write(f"[bold red]No such session:[/bold red] {session_id}")
+            return
+
+        self.session_id = session_id
+        await self._render_tail()
+        log.write(f"[bold green]Session Resumed:[/bold green] {session_id}")
+        self._show_context_usage()
+
+    def _show_context_usage(self) -> None:
+        """Context budget usage in the header (status bar)."""
+        if self.coordinator:
+            self.sub_title = self.coordinator.context.usage_summary()
+
+    async def _render_tail(self) -> None:
+        """Replace the log with the newest `ui.resume_window` stored messages."""
+        rows = await db.get_messages_before(self.session_id, limit=config.ui.resume_window)
+        self.transcript.clear()
+        self.transcript.extend(rows)
+        self.oldest_rendered_id = rows[0]["id"] if rows else None
+        self.window_detached = False
+        self._rerender()
+
+    def _rerender(self, scroll_end: bool = True) -> None:
+        log = self.query_one(RichLog)
+        log.clear()
+        log.auto_scroll = scroll_end
+        try:
+            if self.oldest_rendered_id is not None:
+                log.write("[dim]↑ Older messages: scroll up or ctrl+u[/dim]")
+            for row in self.transcript:
+                render_message(log, row["speaker"], row["content"])
+        finally:
+            log.auto_scroll = True
+
+    async def on_chat_log_reached_top(self, message: ChatLog.ReachedTop) -> None:
+        # Re-rendering itself moves the scroll position; don't cascade into more pages
+        if time.monotonic() - self._paged_at > SCROLLBACK_DEBOUNCE_S:
+            await self.action_load_older()
+
+    async def action_load_older(self) -> None:
+        """Fetch the page of messages before the oldest one on screen."""
+        if self.oldest_rendered_id is None:
+            return
+        rows = await db.get_messages_before(
+            self.session_id, self.oldest_rendered_id, limit=config.ui.scrollback_page
+        )
+        self._paged_at = time.monotonic()
+        if not rows:
+            self.oldest_rendered_id = None
+            self._rerender(scroll_end=False)
+            return
+
+        # The window keeps at most ui.scrollback_max rows: the newest fall off
+        dropped = len(self.transcript) + len(rows) - config.ui.scrollback_max
+        self.window_detached = self.window_detached or dropped > 0
+        self.transcript.extendleft(reversed(rows))
+        self.oldest_rendered_id = rows[0]["id"]
+        self._rerender(scroll_end=False)  # Stay at the top, where the new page is
+
+    async def on_unmount(self) -> None:
+        """Stop the Council's background work, then close the response cache, database and metrics log."""
+        if self.coordinator:
+            await self.coordinator.close()
+        await response_cache.close()
+        pinned_store.close()
+        await close_db()
+        metrics.close()
 
 def main():
     app = ChambersApp()
@@ -0,0 +1,269 @@
+"""
+SKYFORGE Chambers - Blacksmith MCP Client
+
+Blacksmith queries run in the middle of a turn (the agentic "pull" pattern,
+ChambersPlan §3.2), so their latency is added straight to the turn:
+
+- One long-lived HTTP client with a keep-alive pool
+  (`blacksmith.max_connections`) and one MCP handshake, not one per query
+- A strict deadline per query (`latency.blacksmith_timeout_ms`): a slow or
+  unreachable Blacksmith yields [] and the turn goes on without it
+  (Resilience §4.3). The first timeout is a warning, later ones are quiet
+- Identical concurrent queries share one request (single-flight)
+- Results are cached per query for `blacksmith.cache_ttl_s`. A reindex
+  clears the cache, and requests started before it are not cached
+
+Transport: MCP over Streamable HTTP, i.e. JSON-RPC 2.0 POSTs to `mcp_url`
+(`initialize` once, then `tools/call`), answered as JSON or SSE.
+`python -m chambers.blacksmith_stub` serves a local stand-in for offline use.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+MCP_PROTOCOL_VERSION = "2025-03-26"
+SESSION_HEADER = "Mcp-Session-Id"
+MAX_CACHED_QUERIES = 512
+REINDEX_TIMEOUT_S = 60.0  # Indexing a large file is slow; it is not on a turn's path
+
+
+class BlacksmithError(Exception):
+    """Blacksmith answered with an error, or with something that isn't MCP."""
+    pass
+
+
+def _retrieve(task: asyncio.Future) -> None:
+    """Mark a shared task's exception as seen (its waiters may all have left)."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _decode(response: httpx.Response) -> Dict[str, Any]:
+    """The JSON-RPC reply in a plain JSON or an SSE (`text/event-stream`) body."""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                message = json.loads(line[len("data:"):])
+                if "result" in message or "error" in message:
+                    return message
+        raise BlacksmithError("Event stream ended without a reply")
+    return response.json()
+
+
+class BlacksmithClient:
+    """Async client for the Blacksmith MCP server, shared by every session."""
+
+    def __init__(
+        self,
+        url: str,
+        timeout_ms: int,
+        cache_ttl_s: float = 300.0,
+        max_connections: int = 4,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.url = url
+        self.timeout_s = timeout_ms / 1000
+        self.cache_ttl_s = cache_ttl_s
+        self.max_connections = max_connections
+        self._clock = clock
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self._handshake: Optional[asyncio.Task] = None
+        self._session_id: Optional[str] = None
+        self._ids = itertools.count(1)
+
+        self._cache: Dict[str, Tuple[float, List[str]]] = {}  # query -> (fetched at, chunks)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._generation = 0  # Bumped by every invalidation
+
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self.timeout_warned = False
+
+    # --- Lifecycle ---
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_s),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+            )
+        return self._http
+
+    async def close(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self._handshake is not None:
+            self._handshake.cancel()
+        self._handshake = None
+        self._session_id = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # --- MCP plumbing ---
+
+    async def _post(self, message: Dict[str, Any], timeout: Optional[float] = None):
+        headers = {"Accept": "application/json, text/event-stream"}
+        if self._session_id:
+            headers[SESSION_HEADER] = self._session_id
+        options = {"timeout": timeout} if timeout is not None else {}
+        return await self._client().post(self.url, json=message, headers=headers, **options)
+
+    async def _initialize(self) -> None:
+        self._session_id = None
+        response = await self._post({
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": "initialize",
+            "params": {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "skyforge-chambers", "version": "1.0"},
+            },
+        })
+        response.raise_for_status()
+        reply = _decode(response)
+        if "error" in reply:
+            raise BlacksmithError(reply["error"].get("message", "initialize failed"))
+        self._session_id = response.headers.get(SESSION_HEADER)
+        await self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def _ensure_session(self) -> None:
+        """Run the handshake once; concurrent first calls share it, a failed one is retried."""
+        handshake = self._handshake
+        if handshake is None or (handshake.done() and (handshake.cancelled() or handshake.exception())):
+            handshake = self._handshake = asyncio.ensure_future(self._initialize())
+            handshake.add_done_callback(_retrieve)
+        await asyncio.shield(handshake)
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> List[str]:
+        """The text content of a `tools/call` reply."""
+        for attempt in range(2):
+            await self._ensure_session()
+            response = await self._post({
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": "tools/call",
+                "params": {"name": name, "arguments": arguments},
+            }, timeout=timeout)
+            if response.status_code == 404 and self._session_id and attempt == 0:
+                # The server forgot our session (restarted): handshake again
+                self._handshake = None
+                continue
+            response.raise_for_status()
+            break
+
+        reply = _decode(response)
+        if "error" in reply:
+            raise BlacksmithError(reply["error"].get("message", f"{name} failed"))
+        result = reply.get("result", {})
+        texts = [item["text"] for item in result.get("content", []) if item.get("type") == "text"]
+        if result.get("isError"):
+            raise BlacksmithError("; ".join(texts) or f"{name} failed")
+        return texts
+
+    # --- Queries ---
+
+    async def _fetch(self, query: str) -> List[str]:
+        generation = self._generation
+        chunks = await asyncio.wait_for(self._call_tool("get_macro_chunks", {"query": query}), self.timeout_s)
+        if generation == self._generation:
+            # Not cached if a reindex happened meanwhile (the result may predate it)
+            self._cache[query] = (self._clock(), chunks)
+            while len(self._cache) > MAX_CACHED_QUERIES:
+                del self._cache[next(iter(self._cache))]
+        return chunks
+
+    def _timed_out(self, query: str) -> None:
+        self.timeouts += 1
+        if not self.timeout_warned:
+            self.timeout_warned = True
+            logger.warning(
+                f"Blacksmith query timed out after {self.timeout_s:g}s: {query!r} "
+                "(responses may be less grounded; further timeouts are logged at debug level)"
+            )
+        else:
+            logger.debug(f"Blacksmith query timed out: {query!r}")
+
+    async def get_macro_chunks(self, query: str) -> List[str]:
+        """
+        Chunks relevant to `query`, or [] if Blacksmith is slow or failing.
+
+        Never raises: a tool failure must not fail the turn that asked.
+        """
+        query = " ".join(query.split())
+        cached = self._cache.get(query)
+        if cached is not None and self._clock() - cached[0] < self.cache_ttl_s:
+            self.hits += 1
+            return list(cached[1])
+
+        task = self._inflight.get(query)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[query] = asyncio.ensure_future(self._fetch(query))
+            task.add_done_callback(_retrieve)
+
+            def landed(done: asyncio.Task) -> None:
+                if self._inflight.get(query) is done:
+                    del self._inflight[query]
+
+            task.add_done_callback(landed)
+        try:
+            # Shielded: a waiter that is cancelled must not cancel the others' request
+            return list(await asyncio.shield(task))
+        except asyncio.TimeoutError:
+            self._timed_out(query)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise  # Our own caller was cancelled
+            logger.debug(f"Blacksmith query cancelled: {query!r}")
+        except Exception as e:
+            logger.warning(f"Blacksmith query failed ({type(e).__name__}: {e}): {query!r}")
+        return []
+
+    # --- Index maintenance ---
+
+    def invalidate(self) -> None:
+        """Forget every cached result (and any result still in flight)."""
+        self._cache.clear()
+        self._generation += 1
+
+    async def reindex(self, path: str) -> bool:
+        """
+        Ask Blacksmith to re-read `path` (`/reindex @file`). Cached results
+        are dropped either way; False if the server could not be reached.
+        """
+        self.invalidate()
+        try:
+            await asyncio.wait_for(self._call_tool("reindex", {"path": str(path)}, timeout=REINDEX_TIMEOUT_S), REINDEX_TIMEOUT_S)
+            return True
+        except Exception as e:
+            logger.warning(f"Blacksmith reindex of {path} failed ({type(e).__name__}: {e})")
+            return False
+        finally:
+            # Queries answered while the index was changing may be stale too
+            self.invalidate()
+
+
+# Singleton (connects lazily on the first query)
+blacksmith = BlacksmithClient(
+    config.blacksmith.mcp_url,
+    config.latency.blacksmith_timeout_ms,
+    cache_ttl_s=config.blacksmith.cache_ttl_s,
+    max_connections=config.blacksmith.max_connections,
+)
@@ -0,0 +1,200 @@
+"""
+SKYFORGE Chambers - Blacksmith Stand-In (offline MCP server)
+
+A small local server for the two Blacksmith tools the client uses, so
+Blacksmith-backed features can be developed and tested offline
+("Mock for Speed", ChambersPlan §5):
+
+- get_macro_chunks(query) -> the paragraphs of the indexed files sharing
+  the most words with the query
+- reindex(path)           -> re-read one file (or a directory's text files)
+
+It speaks just enough MCP Streamable HTTP for BlacksmithClient: JSON-RPC
+POSTs over keep-alive HTTP/1.1 connections, with an `Mcp-Session-Id`
+issued on `initialize`. `delay_s` slows every tool call (deadline tests);
+`connections` and `calls` count traffic (pooling and single-flight tests).
+
+Usage:
+    python -m chambers.blacksmith_stub --root docs --port 8000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .blacksmith import MCP_PROTOCOL_VERSION, SESSION_HEADER
+
+logger = logging.getLogger(__name__)
+
+TEXT_SUFFIXES = {".md", ".txt", ".py", ".yaml", ".yml", ".toml", ".json"}
+MAX_CHUNKS = 5
+WORD = re.compile(r"\w+")
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def _words(text: str) -> set:
+    return {word.lower() for word in WORD.findall(text)}
+
+
+class StandInBlacksmith:
+    """In-memory paragraph index behind a minimal MCP endpoint."""
+
+    def __init__(self, documents: Optional[Dict[str, str]] = None, delay_s: float = 0.0):
+        self.documents: Dict[str, str] = dict(documents or {})
+        self.delay_s = delay_s
+        self.connections = 0
+        self.calls: Counter = Counter()  # Tool name -> calls
+        self.sessions: set = set()
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    # --- Index ---
+
+    def index_path(self, path: str) -> int:
+        """(Re-)read a file, or every text file under a directory; returns files read."""
+        target = Path(path)
+        files = [target] if target.is_file() else [
+            p for p in sorted(target.rglob("*")) if p.is_file() and p.suffix in TEXT_SUFFIXES
+        ]
+        if not target.exists():
+            self.documents.pop(str(path), None)  # Deleted: drop it from the index
+        for file in files:
+            self.documents[str(file)] = file.read_text(encoding="utf-8", errors="replace")
+        return len(files)
+
+    def search(self, query: str) -> List[str]:
+        wanted = _words(query)
+        scored: List[Tuple[int, str]] = []
+        for text in self.documents.values():
+            for paragraph in re.split(r"\n\s*\n", text):
+                score = len(wanted & _words(paragraph))
+                if score:
+                    scored.append((score, paragraph.strip()))
+        scored.sort(key=lambda item: -item[0])  # Stable: ties keep document order
+        return [paragraph for _, paragraph in scored[:MAX_CHUNKS]]
+
+    # --- MCP ---
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls[name] += 1
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        if name == "get_macro_chunks":
+            chunks = self.search(arguments.get("query", ""))
+            return {"content": [{"type": "text", "text": chunk} for chunk in chunks]}
+        if name == "reindex":
+            count = self.index_path(arguments["path"])
+            return {"content": [{"type": "text", "text": f"Reindexed {count} file(s)"}]}
+        return {"content": [{"type": "text", "text": f"Unknown tool: {name}"}], "isError": True}
+
+    async def handle(self, message: Dict[str, Any], session_id: Optional[str]) -> Tuple[int, Dict[str, str], Optional[dict]]:
+        """(HTTP status, extra headers, JSON-RPC reply or None) for one POST."""
+        method = message.get("method")
+        if method == "initialize":
+            session_id = uuid.uuid4().hex
+            self.sessions.add(session_id)
+            result = {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "blacksmith-stand-in", "version": "1.0"},
+            }
+            return 200, {SESSION_HEADER: session_id}, {"jsonrpc": "2.0", "id": message.get("id"), "result": result}
+        if session_id not in self.sessions:
+            return 404, {}, None
+        if "id" not in message:
+            return 202, {}, None  # Notification
+        if method == "tools/call":
+            params = message.get("params", {})
+            result = await self._call_tool(params.get("name"), params.get("arguments", {}))
+            return 200, {}, {"jsonrpc": "2.0", "id": message["id"], "result": result}
+        error = {"code": -32601, "message": f"Method not found: {method}"}
+        return 200, {}, {"jsonrpc": "2.0", "id": message["id"], "error": error}
+
+    # --- HTTP/1.1 ---
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:  # Keep-alive: many requests per connection
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if not request_line.startswith(b"POST "):
+                    status, extra, reply = 405, {}, None
+                else:
+                    try:
+                        message = json.loads(body)
+                    except ValueError:
+                        status, extra, reply = 400, {}, None
+                    else:
+                        status, extra, reply = await self.handle(message, headers.get(SESSION_HEADER.lower()))
+
+                payload = json.dumps(reply).encode() if reply is not None else b""
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Length: {len(payload)}"]
+                if reply is not None:
+                    head.append("Content-Type: application/json")
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Listen (port 0 picks a free one) and return the endpoint URL."""
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/mcp"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(args: argparse.Namespace) -> int:
+    stand_in = StandInBlacksmith(delay_s=args.delay)
+    for root in args.root:
+        stand_in.index_path(root)
+    url = await stand_in.start(args.host, args.port)
+    logger.info(f"Blacksmith stand-in serving {len(stand_in.documents)} file(s) at {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stand_in.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", action="append", default=[], help="File or directory to index (repeatable)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds added to every tool call")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    try:
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
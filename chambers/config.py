@@ -16,17 +16,66 @@ class ContextConfig(BaseModel):
     budget_hot: int = 20000
     budget_on_demand: int = 5000
     auto_load: List[str] = ["plan.md", "PLANNING_FRAMEWORK.md"]
+    pinned_cache_dir: str = "~/.chambers/pinned"  # Token counts and truncations per content hash
+    watch_pinned: bool = True  # Use watchdog file events (if installed) instead of a stat per round
+    summary_model: Optional[str] = "gemini-flash"  # Cheap ai_models entry that writes summaries (None = truncate only)
+    summary_chunk_tokens: int = 2000  # Evicted hot tokens gathered into one summary
+    summary_excerpt_tokens: int = 30  # Per-message excerpt in the placeholder shown until a summary lands
 
 class LatencyConfig(BaseModel):
     blacksmith_timeout_ms: int = 3000
-    summarize_async: bool = True
+    summarize_async: bool = True  # Off: a round first waits for pending summaries
+    summary_timeout_s: float = 60.0  # Give up on a summary (the truncated placeholder stays)
+    parallel_rounds: bool = False  # Opt-in: stream all targeted speakers concurrently
+    max_parallel_speakers: int = 3  # Concurrency cap for parallel rounds
+    health_check_timeout_s: float = 5.0  # Per-vendor deadline for startup probes
+    health_cache_ttl_s: int = 300  # Passed checks are reused across restarts for this long
+    # Opt-in (e.g. 8.0): no first token by then races the same-vendor fallback,
+    # billing both requests and possibly answering with the fallback model
+    hedge_ttft_s: Optional[float] = None
+    vendor_concurrency: int = 4  # Concurrent streams per vendor when many sessions share clients
+
+class ResilienceConfig(BaseModel):
+    max_retries: int = 3  # Attempts per turn (Level 1 transient retry)
+    backoff_base_s: float = 1.0  # Jittered exponential backoff: base * 2^attempt...
+    backoff_cap_s: float = 8.0  # ...capped here
+    max_retry_after_s: float = 30.0  # Give up if the server asks us to wait longer
+    breaker_failure_threshold: int = 2  # Consecutive failed turns before a vendor's circuit opens
+    breaker_cooldown_s: float = 30.0  # Open circuit: skip the vendor, probe again after this
 
 class ObservabilityConfig(BaseModel):
     enable_metrics: bool = False
     log_path: str = "~/.chambers/metrics.log"
 
+class UIConfig(BaseModel):
+    render_fps: int = 20  # Max stream flushes to the chat log per second
+    markdown_offload_chars: int = 20000  # Blocks this long are parsed off the UI loop
+    resume_window: int = 50  # Messages rendered when a session is resumed
+    scrollback_page: int = 50  # Older messages fetched per scroll-back
+    scrollback_max: int = 200  # Messages kept rendered while scrolling back
+    search_page: int = 20  # /search hits per page
+
+class ExportConfig(BaseModel):
+    out_dir: str = "exports"
+    format: str = "md"  # "md" or "ndjson"
+    concurrency: int = 4  # Sessions exported at once
+
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = False  # Opt-in: identical turns are replayed locally instead of re-billed
+    path: str = "~/.chambers/response_cache.db"
+    memory_entries: int = 256  # Recent responses kept in memory (LRU)
+    max_mb: float = 100.0  # Disk store cap; least recently used responses go first
+    max_age_days: float = 7.0  # Older responses are never replayed
+
+class ServerConfig(BaseModel):
+    socket_path: str = "~/.chambers/council.sock"
+    max_active_rounds: int = 8  # Rounds streaming at once across all sessions
+    vendor_rpm: Dict[str, float] = {}  # Requests per minute per vendor, e.g. {"xai": 60} (missing = unlimited)
+
 class BlacksmithConfig(BaseModel):
-    mcp_url: str = "http://localhost:8000"
+    mcp_url: str = "http://localhost:8000"  # MCP Streamable HTTP endpoint
+    cache_ttl_s: float = 300.0  # Query results are reused this long (any reindex clears them)
+    max_connections: int = 4  # Keep-alive connection pool size
     auto_index_on_write: bool = True
     enable_sentry: bool = True
 
@@ -42,8 +91,13 @@ class AppConfig(BaseSettings):
     # Sub-configs
     context: ContextConfig = ContextConfig()
     latency: LatencyConfig = LatencyConfig()
+    resilience: ResilienceConfig = ResilienceConfig()
     observability: ObservabilityConfig = ObservabilityConfig()
     blacksmith: BlacksmithConfig = BlacksmithConfig()
+    ui: UIConfig = UIConfig()
+    export: ExportConfig = ExportConfig()
+    server: ServerConfig = ServerConfig()
+    response_cache: ResponseCacheConfig = ResponseCacheConfig()
     
     # Model Definitions (Bleeding Edge 2025)
     ai_models: Dict[str, AIModelConfig] = {
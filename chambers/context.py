@@ -0,0 +1,390 @@
+"""
+SKYFORGE Chambers - Context Assembler
+
+Enforces the Context Budget (ChambersPlan §3.1) between the coordinator and
+the AI clients. Four slots, each with its own token budget:
+
+1. Pinned     - foundation docs, loaded at session start
+2. History    - summaries of messages that fell out of the hot window
+3. Hot        - verbatim recent messages (FIFO)
+4. On-Demand  - per-turn scratchpad (Blacksmith results)
+
+Pinned, History and On-Demand are rendered into the system prompt; Hot is
+the message list. Token counts are computed once per message and memoized.
+
+Each Council member also gets a subjective view of the hot window (self as
+'assistant', everyone else as 'user'), appended once per new message.
+"""
+
+import logging
+import re
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from .config import ContextConfig
+
+logger = logging.getLogger(__name__)
+
+# Fallback estimate when the tiktoken encoding can't be loaded (e.g. offline)
+CHARS_PER_TOKEN = 4
+# Per-message framing overhead (role markers etc.)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Legacy identity tag format: "[Speaker]: ..."
+SPEAKER_TAG = re.compile(r"\s*\[([^\]]+)\]:")
+
+
+def message_speaker(message: Dict[str, str]) -> str:
+    """
+    Speaker id of a message: 'user' for Vinga, the AI id for Council members.
+
+    Uses the structured `speaker` key; messages without one (older sessions)
+    fall back to parsing the `[Name]:` prefix.
+    """
+    speaker = message.get("speaker")
+    if speaker:
+        return speaker
+    if message["role"] == "user":
+        return "user"
+    match = SPEAKER_TAG.match(message["content"])
+    return match.group(1).lower() if match else "unknown"
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken (cl100k_base), memoized per text.
+
+    cl100k is not any Council member's exact tokenizer, but it is close
+    enough for budgeting. If the encoding is unavailable we fall back to a
+    chars/4 estimate instead of failing the turn.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base", memo_size: int = 4096):
+        self.encoding_name = encoding_name
+        self.memo_size = memo_size
+        self._memo: Dict[str, int] = {}
+        self._encoding = None
+        self._encoding_loaded = False
+
+    def _get_encoding(self):
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                import tiktoken
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                logger.warning(f"tiktoken unavailable ({e}); estimating tokens from length")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        """Token count for `text` (memoized)."""
+        cached = self._memo.get(text)
+        if cached is not None:
+            return cached
+
+        encoding = self._get_encoding()
+        if encoding is not None:
+            tokens = len(encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+        if len(self._memo) >= self.memo_size:
+            # Drop the oldest entry (dicts keep insertion order)
+            del self._memo[next(iter(self._memo))]
+        self._memo[text] = tokens
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut `text` down to at most `max_tokens` tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+
+class SystemPrompt(str):
+    """
+    A rendered system prompt that remembers its sections.
+
+    Behaves as the plain joined string for every client; clients that can
+    exploit the structure (Claude prompt caching) read `blocks`, ordered
+    from most to least stable: identity, pinned, history, on-demand. The
+    first `stable_blocks` entries change rarely and are safe cache prefixes.
+    """
+
+    blocks: Tuple[str, ...]
+    stable_blocks: int
+
+    def __new__(cls, blocks: List[str], stable_blocks: int):
+        prompt = super().__new__(cls, "\n\n".join(blocks))
+        prompt.blocks = tuple(blocks)
+        prompt.stable_blocks = stable_blocks
+        return prompt
+
+
+class _Block(NamedTuple):
+    text: str
+    tokens: int
+
+
+class _Summary(NamedTuple):
+    key: Optional[int]  # Handle for replace_summary()
+    text: str
+    tokens: int
+
+
+class _HotEntry(NamedTuple):
+    message: Dict[str, str]
+    tokens: int
+    speaker: str
+    as_self: Dict[str, str]   # How the author sees it
+    as_other: Dict[str, str]  # How everyone else sees it
+
+
+class ContextAssembler:
+    """
+    Fills the four budget slots and hands the coordinator a bounded context.
+
+    The hot window is a deque with a running token total: appending is O(1)
+    and each message is evicted at most once, so eviction is O(1) amortized.
+    Evicted messages are passed to `on_evict` (the summarizer hook);
+    `evicted_seq` counts evictions session-wide, so the batch covers
+    positions `evicted_seq - len(batch)` up to `evicted_seq`.
+
+    Subjective views mirror the hot window one-to-one: a new message is
+    appended to every view once and evictions pop from every view, so a
+    speaker's prompt never has to be rebuilt from the full history.
+    """
+
+    def __init__(
+        self,
+        settings: ContextConfig,
+        counter: Optional[TokenCounter] = None,
+        on_evict: Optional[Callable[[List[Dict[str, str]]], None]] = None
+    ):
+        self.settings = settings
+        self.counter = counter or TokenCounter()
+        self.on_evict = on_evict
+
+        self.pinned: List[_Block] = []
+        self.pinned_docs = 0
+        self.history: Deque[_Summary] = deque()
+        self._summary_keys = 0
+        self.on_demand: List[_Block] = []
+        self.hot: Deque[_HotEntry] = deque()
+        self.views: Dict[str, Deque[Dict[str, str]]] = {}
+
+        self.pinned_tokens = 0
+        self.history_tokens = 0
+        self.on_demand_tokens = 0
+        self.hot_tokens = 0
+
+        # Incremental sync with the caller's conversation list
+        self._source: Optional[List[Dict[str, str]]] = None
+        self._synced = 0
+        # Session-wide position of the next message to be evicted
+        self.evicted_seq = 0
+
+    # --- Slot: Pinned ---
+
+    def set_pinned(
+        self,
+        docs: List[str],
+        fit: Optional[Callable[[str, int], Tuple[str, int]]] = None
+    ) -> None:
+        """
+        Replace the pinned docs, truncating whatever overflows budget_pinned.
+
+        `fit(doc, max_tokens) -> (text, tokens)` overrides the truncation
+        (PinnedStore serves it from its pre-tokenized cache).
+        """
+        self.pinned = []
+        self.pinned_tokens = 0
+        self.pinned_docs = len(docs)
+        for doc in docs:
+            remaining = self.settings.budget_pinned - self.pinned_tokens
+            if remaining <= 0:
+                logger.warning("Pinned budget exhausted; dropping remaining docs")
+                break
+            if fit is not None:
+                text, tokens = fit(doc, remaining)
+            else:
+                text = self.counter.truncate(doc, remaining)
+                tokens = self.counter.count(text)
+            self.pinned.append(_Block(text, tokens))
+            self.pinned_tokens += tokens
+
+    # --- Slot: History (summaries) ---
+
+    def add_summary(self, summary: str) -> int:
+        """
+        Append a summary; the oldest summaries go when budget_history overflows.
+
+        Returns a key for replace_summary().
+        """
+        self._summary_keys += 1
+        block = _Summary(self._summary_keys, summary, self.counter.count(summary))
+        self.history.append(block)
+        self.history_tokens += block.tokens
+        self._trim_history()
+        return block.key
+
+    def replace_summary(self, key: int, summary: str) -> bool:
+        """
+        Swap the text of a history block in place (e.g. a truncated
+        placeholder for the real summary). False if it already aged out.
+        """
+        for i, block in enumerate(self.history):
+            if block.key == key:
+                tokens = self.counter.count(summary)
+                self.history[i] = _Summary(key, summary, tokens)
+                self.history_tokens += tokens - block.tokens
+                self._trim_history()
+                return True
+        return False
+
+    def clear_history(self) -> None:
+        """Drop every summary (switching sessions)."""
+        self.history.clear()
+        self.history_tokens = 0
+
+    def _trim_history(self) -> None:
+        while self.history_tokens > self.settings.budget_history and len(self.history) > 1:
+            self.history_tokens -= self.history.popleft().tokens
+
+    # --- Slot: On-Demand ---
+
+    def set_on_demand(self, chunks: List[str]) -> None:
+        """Replace the per-turn scratchpad, truncating to budget_on_demand."""
+        self.on_demand = []
+        self.on_demand_tokens = 0
+        for chunk in chunks:
+            remaining = self.settings.budget_on_demand - self.on_demand_tokens
+            if remaining <= 0:
+                break
+            text = self.counter.truncate(chunk, remaining)
+            tokens = self.counter.count(text)
+            self.on_demand.append(_Block(text, tokens))
+            self.on_demand_tokens += tokens
+
+    # --- Slot: Hot ---
+
+    def message_tokens(self, message: Dict[str, str]) -> int:
+        """What `message` costs in the hot window."""
+        return self.counter.count(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+    def add_message(self, message: Dict[str, str]) -> None:
+        """Append a message to the hot window, evicting the oldest on overflow."""
+        content = message["content"]
+        speaker = message_speaker(message)
+        as_other = {"role": "user", "content": content}
+        # Vinga is always User; an AI sees its own words as Assistant
+        as_self = as_other if speaker == "user" else {"role": "assistant", "content": content}
+
+        entry = _HotEntry(
+            message,
+            self.message_tokens(message),
+            speaker,
+            as_self,
+            as_other,
+        )
+        self.hot.append(entry)
+        self.hot_tokens += entry.tokens
+        for view_id, view in self.views.items():
+            view.append(as_self if view_id == speaker else as_other)
+
+        evicted = []
+        # Always keep the newest message, even if it alone exceeds the budget
+        while self.hot_tokens > self.settings.budget_hot and len(self.hot) > 1:
+            entry = self.hot.popleft()
+            self.hot_tokens -= entry.tokens
+            for view in self.views.values():
+                view.popleft()
+            evicted.append(entry.message)
+
+        if evicted:
+            self.evicted_seq += len(evicted)
+            if self.on_evict:
+                self.on_evict(evicted)
+
+    def sync(self, messages: List[Dict[str, str]], first_seq: int = 0) -> None:
+        """
+        Ingest whatever was appended to `messages` since the last sync.
+
+        A different list (or a shorter one) resets the hot window;
+        `first_seq` is then the session-wide position of `messages[0]`
+        (non-zero when a resumed session starts mid-history).
+        """
+        if messages is not self._source or len(messages) < self._synced:
+            self.hot.clear()
+            self.hot_tokens = 0
+            for view in self.views.values():
+                view.clear()
+            self._source = messages
+            self._synced = 0
+            self.evicted_seq = first_seq
+
+        for message in messages[self._synced:]:
+            self.add_message(message)
+        self._synced = len(messages)
+
+    def hot_messages(self) -> List[Dict[str, str]]:
+        """The verbatim messages currently inside the hot budget (oldest first)."""
+        return [entry.message for entry in self.hot]
+
+    def view(self, speaker_id: str) -> List[Dict[str, str]]:
+        """
+        `speaker_id`'s subjective hot window, ready to send to its vendor.
+
+        The first call for a speaker converts the hot window; after that,
+        add_message() converts each new message once. Each call still
+        copies the view into a new list, which costs O(hot) (references
+        only). The copy is deliberate: a parallel round's prompts are
+        snapshots that the round's own commits must not change. The dicts
+        are shared: treat them as read-only.
+        """
+        view = self.views.get(speaker_id)
+        if view is None:
+            view = self.views[speaker_id] = deque(
+                entry.as_self if entry.speaker == speaker_id else entry.as_other
+                for entry in self.hot
+            )
+        return list(view)
+
+    # --- Assembly ---
+
+    def render_system(self, base_prompt: str) -> SystemPrompt:
+        """The system prompt with the Pinned, History and On-Demand slots appended."""
+        sections = [base_prompt]
+        if self.pinned:
+            sections.append("## Pinned Context\n\n" + "\n\n".join(b.text for b in self.pinned))
+        if self.history:
+            sections.append("## Summarized History\n\n" + "\n\n".join(b.text for b in self.history))
+        stable_blocks = len(sections)
+        if self.on_demand:
+            sections.append("## On-Demand Context\n\n" + "\n\n".join(b.text for b in self.on_demand))
+        return SystemPrompt(sections, stable_blocks)
+
+    def usage(self) -> Dict[str, Tuple[int, int]]:
+        """Current (used, budget) tokens per slot."""
+        return {
+            "pinned": (self.pinned_tokens, self.settings.budget_pinned),
+            "history": (self.history_tokens, self.settings.budget_history),
+            "hot": (self.hot_tokens, self.settings.budget_hot),
+            "on_demand": (self.on_demand_tokens, self.settings.budget_on_demand),
+        }
+
+    def usage_summary(self) -> str:
+        """Status bar text, e.g. `[Hot: 12k/20k] [History: 3k/20k] [Pinned: 3 docs]`."""
+        def k(tokens: int) -> str:
+            return f"{tokens / 1000:.0f}k" if tokens >= 1000 else str(tokens)
+
+        parts = [f"[Hot: {k(self.hot_tokens)}/{k(self.settings.budget_hot)}]"]
+        if self.history:
+            parts.append(f"[History: {k(self.history_tokens)}/{k(self.settings.budget_history)}]")
+        parts.append(f"[Pinned: {self.pinned_docs} docs]")
+        return " ".join(parts)
@@ -0,0 +1,133 @@
+"""
+SKYFORGE Chambers - Control Tokens (AI Comfort Suite)
+
+Incremental parser for the in-band tokens of AI_COMFORT_FEATURES.md:
+
+- `[[PASS]]`            Yield the turn (nothing to add)
+- `[[PASS: Claude]]`    Yield and hand the turn to Claude
+- `[[NOD]]`, `[[THINKING]]`, `[[CELEBRATE]]`   Social signals (no text)
+- `[[UPDATE_BOARD: ...]]`                       Replace the Blackboard
+
+The parser sits in the coordinator's stream loop. Each chunk is scanned
+once; only text that might still turn into a tag (an open `[[` with a
+plausible name, or a trailing `[`) is held back, so ordinary text streams
+through immediately and tags split across chunks are still recognized.
+Anything that is not a known token (e.g. a `[[wiki link]]`) is released as
+plain text.
+"""
+
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+
+TAG_OPEN = "[["
+TAG_CLOSE = "]]"
+MAX_TAG_CHARS = 4000  # A longer "tag" is just text (bounds what is held back)
+
+
+class Control(Enum):
+    PASS = "pass"
+    NOD = "nod"
+    THINKING = "thinking"
+    CELEBRATE = "celebrate"
+    UPDATE_BOARD = "update_board"
+
+
+# Tokens that may carry an argument after a colon
+TAKES_ARGUMENT = {Control.PASS, Control.UPDATE_BOARD}
+SIGNALS = {Control.NOD, Control.THINKING, Control.CELEBRATE}
+
+
+class ControlToken(NamedTuple):
+    kind: Control
+    argument: Optional[str] = None  # PASS target or the new Blackboard text
+
+    @property
+    def ends_turn(self) -> bool:
+        return self.kind is Control.PASS
+
+
+def _parse_tag(body: str) -> Optional[ControlToken]:
+    """The token for a complete `[[body]]`, or None if it isn't one."""
+    name, colon, argument = body.partition(":")
+    kind = Control.__members__.get(name.strip())
+    if kind is None:
+        return None
+    if not colon:
+        return ControlToken(kind)
+    if kind not in TAKES_ARGUMENT:
+        return None
+    argument = argument.strip()
+    if kind is Control.PASS:
+        return ControlToken(kind, argument or None)
+    return ControlToken(kind, argument)
+
+
+def _could_become_tag(body: str) -> bool:
+    """Whether an unterminated `[[body` may still complete into a known token."""
+    if len(body) > MAX_TAG_CHARS:
+        return False
+    name, colon, _ = body.partition(":")
+    name = name.lstrip()
+    if colon:
+        kind = Control.__members__.get(name.strip())
+        return kind in TAKES_ARGUMENT
+    name = name.rstrip("]")  # First half of a split "]]"
+    return any(member.startswith(name.rstrip()) for member in Control.__members__)
+
+
+class ControlParser:
+    """Splits a stream into visible text and control tokens, chunk by chunk."""
+
+    def __init__(self):
+        self._held = ""  # Possible start of a tag, not yet shown
+        self._scanned = 0  # How much of _held has been searched for TAG_CLOSE
+
+    def feed(self, chunk: str) -> Tuple[str, List[ControlToken]]:
+        """Visible text and the tokens completed by `chunk`."""
+        text = self._held + chunk
+        resume = self._scanned
+        self._held = ""
+        self._scanned = 0
+
+        visible: List[str] = []
+        tokens: List[ControlToken] = []
+        pos = 0
+        while pos < len(text):
+            start = text.find(TAG_OPEN, pos) if not resume else pos
+            if start < 0:
+                if text.endswith("["):
+                    # Might be the first half of "[["
+                    visible.append(text[pos:-1])
+                    self._held = "["
+                else:
+                    visible.append(text[pos:])
+                break
+
+            visible.append(text[pos:start])
+            # A held tag was already searched: continue after what was scanned
+            search_from = max(start + len(TAG_OPEN), resume - 1)
+            resume = 0
+            end = text.find(TAG_CLOSE, search_from)
+            if end < 0:
+                if _could_become_tag(text[start + len(TAG_OPEN):]):
+                    self._held = text[start:]
+                    self._scanned = len(self._held)
+                    break
+                visible.append(TAG_OPEN)
+                pos = start + len(TAG_OPEN)
+                continue
+
+            token = _parse_tag(text[start + len(TAG_OPEN):end])
+            if token is None:
+                visible.append(TAG_OPEN)
+                pos = start + len(TAG_OPEN)
+                continue
+            tokens.append(token)
+            pos = end + len(TAG_CLOSE)
+
+        return "".join(visible), tokens
+
+    def finish(self) -> str:
+        """End of stream: an unterminated tag is just text."""
+        held, self._held, self._scanned = self._held, "", 0
+        return held
@@ -8,23 +8,31 @@ Stage 2.1 additions (deferred retry, fallback prompts, etc.) will come later.
 """
 
 import asyncio
+import contextlib
 import logging
-from typing import List, Dict, Optional, Set
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Dict, Optional, Set
 from enum import Enum
 from collections import deque
 
 from .config import config
+from .context import ContextAssembler
+from .control import Control, ControlParser, ControlToken
 from .models.base import AIClient
-from .models.claude import ClaudeClient
-from .models.gemini import GeminiClient
-from .models.grok import GrokClient
+from .models.registry import get_client_class
+from .pinned import PinnedStore
+from .resilience import (
+    CircuitBreaker, ErrorKind, TokenBucket, backoff_delay, classify_error, retry_after
+)
+from .response_cache import CachingClient, ResponseCache
+from .speaker_guard import SpeakerGuard, stop_sequences
+from .summarizer import Summarizer
 
-logger = logging.getLogger(__name__)
-
-# Retry configuration
-MAX_RETRIES = 3
-BACKOFF_DELAYS = [1.0, 2.0, 4.0]  # Exponential backoff in seconds
+if TYPE_CHECKING:
+    from .database import Database
+    from .metrics import MetricsRecorder
 
+logger = logging.getLogger(__name__)
 
 class State(Enum):
     """Coordinator states."""
@@ -33,6 +41,26 @@ class State(Enum):
     PAUSED_FOR_USER = "paused_for_user"
 
 
+class StreamEvent(Enum):
+    """Out-of-band events passed to stream callbacks in place of a text chunk."""
+    # Text already streamed for this turn is void; the reply restarts from scratch
+    REWIND = "rewind"
+
+
+# Speaker name stored for the user's messages
+USER_SPEAKER = "Vinga"
+
+# Turn metadata set by control tokens (see TurnCoordinator._apply_controls)
+CONTROL_METADATA = ("passed", "board", "signals")
+
+
+def history_message(speaker: str, content: str) -> Dict[str, str]:
+    """Conversation entry for a stored (speaker, content) message."""
+    if speaker == USER_SPEAKER:
+        return {"role": "user", "content": content}
+    return {"role": "assistant", "content": f"[{speaker.capitalize()}]: {content}", "speaker": speaker}
+
+
 class ConfigError(Exception):
     """Raised when configuration is invalid."""
     pass
@@ -95,9 +123,25 @@ class TurnCoordinator:
     - Graceful degradation
     """
 
-    def __init__(self, session_id: str):
+    def __init__(
+        self,
+        session_id: str,
+        db: Optional["Database"] = None,
+        metrics: Optional["MetricsRecorder"] = None,
+        response_cache: Optional[ResponseCache] = None,
+        pinned: Optional[PinnedStore] = None
+    ):
         self.session_id = session_id
         self.state = State.IDLE
+        # Optional: persists health results so quick restarts skip re-probing
+        self.db = db
+        # Optional: receives per-turn timings (queue wait, TTFT, tokens/s)
+        self.metrics = metrics
+        # Optional: identical turns are replayed from here instead of the vendor
+        self.response_cache = response_cache
+        # Optional: the auto-loaded docs for the Pinned slot (shared by forks)
+        self.pinned = pinned
+        self._pinned_version: Optional[int] = None
 
         # AI client registry
         self.clients: Dict[str, AIClient] = {}
@@ -106,17 +150,59 @@ class TurnCoordinator:
         # Health tracking (checked at startup, cached for session)
         self.healthy_speakers: Set[str] = set()
         self.unhealthy_speakers: Set[str] = set()
+        self.health_task: Optional[asyncio.Task] = None
+
+        # Same-vendor fallback clients for latency hedging (created on first use)
+        self.fallback_clients: Dict[str, AIClient] = {}
+
+        # Per-vendor circuit breakers and their background probes
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._probes: Dict[str, asyncio.Task] = {}
+
+        # Optional per-vendor caps on concurrent streams and request rate (shared by forks)
+        self.vendor_slots: Dict[str, asyncio.Semaphore] = {}
+        self.vendor_rates: Dict[str, TokenBucket] = {}
+        self._forked = False  # Forks never stop the shared health checks
+
+        # Per-speaker metadata of the last successful turn (usage, cache hits)
+        self.turn_metadata: Dict[str, Dict[str, Any]] = {}
 
-    async def initialize(self) -> None:
+        # Blackboard text, last set by a [[UPDATE_BOARD: ...]] token
+        self.board: Optional[str] = None
+
+        # Context budget (Pinned / History / Hot / On-Demand)
+        self.context = ContextAssembler(config.context)
+
+        # Evicted hot context becomes History summaries in the background
+        summary_model = config.ai_models.get(config.context.summary_model or "")
+        self.summarizer = Summarizer(
+            self.context,
+            config.context,
+            config.latency,
+            session_id,
+            self._summary_client,
+            model=summary_model.model if summary_model else "",
+            db=db,
+        )
+        self.context.on_evict = self.summarizer.on_evict
+
+    async def initialize(self, wait_for_health: bool = True) -> None:
         """
         Initialize the coordinator:
         1. Validate config
         2. Instantiate AI clients
-        3. Run health checks
+        3. Run health checks (concurrent, time-boxed, cached with a TTL)
         4. Build speaker queue
+
+        With wait_for_health=False the probes run in the background
+        (`health_task`): cached-healthy speakers are available immediately
+        and the others join the queue as soon as their check passes.
         """
         # Step 1: Validate config
         ConfigValidator.validate_all()
+        if self.response_cache is not None:
+            await self.response_cache.open()
+        self._sync_pinned()
 
         # Step 2: Instantiate clients for enabled models
         for ai_id, settings in config.ai_models.items():
@@ -124,23 +210,22 @@ class TurnCoordinator:
                 logger.info(f"Skipping {ai_id} (disabled in config)")
                 continue
 
-            # Create client instance
-            if ai_id == "claude":
-                self.clients[ai_id] = ClaudeClient()
-            elif ai_id == "gemini":
-                self.clients[ai_id] = GeminiClient()
-            elif ai_id == "grok":
-                self.clients[ai_id] = GrokClient()
-            else:
-                logger.warning(f"Unknown AI model: {ai_id}")
+            # Create client instance (imports the vendor SDK on first use)
+            client_cls = get_client_class(settings.vendor)
+            if client_cls is None:
+                logger.warning(f"Unknown AI model: {ai_id} (vendor '{settings.vendor}')")
+                continue
+            self.clients[ai_id] = self._build_client(client_cls, ai_id)
 
         # Step 3: Health checks (startup only, cached for session)
+        await self._load_cached_health()
         logger.info("Starting health checks...")
-        await self._run_health_checks()
-        logger.info(f"Health checks complete. Healthy: {self.healthy_speakers}")
+        self.health_task = asyncio.create_task(self._run_health_checks())
+        if not wait_for_health:
+            self._rebuild_speaker_queue()
+            return
 
-        # Step 4: Build speaker queue from healthy AIs
-        self.speaker_queue = deque(self.healthy_speakers)
+        await self.health_task
 
         if not self.speaker_queue:
             logger.error("CRITICAL: No healthy speakers found!")
@@ -150,25 +235,131 @@ class TurnCoordinator:
 
         logger.info(f"Council initialized: {list(self.speaker_queue)} ({len(self.speaker_queue)} members)")
 
+    def _rebuild_speaker_queue(self) -> None:
+        """Step 4: Speaker queue from healthy AIs, in config order (deterministic)."""
+        # Updated in place: forked coordinators share this deque
+        self.speaker_queue.clear()
+        self.speaker_queue.extend(
+            ai_id for ai_id in self.clients if ai_id in self.healthy_speakers
+        )
+        # One incrementally maintained subjective history view per member
+        for ai_id in self.speaker_queue:
+            self.context.view(ai_id)
+
+    async def _load_cached_health(self) -> None:
+        """Trust checks that passed within `health_cache_ttl_s` (same model only)."""
+        if self.db is None:
+            return
+        try:
+            cached = await self.db.get_cached_health(config.latency.health_cache_ttl_s)
+        except Exception as e:
+            logger.warning(f"Health cache unavailable: {e}")
+            return
+
+        for ai_id in self.clients:
+            if cached.get(ai_id) == config.ai_models[ai_id].model:
+                self.healthy_speakers.add(ai_id)
+                logger.info(f"  ✓ {ai_id} is healthy (cached)")
+
     async def _run_health_checks(self) -> None:
         """
-        Run health checks on all clients (startup only).
-        Results are cached for the session.
+        Run health checks on all unchecked clients (startup only).
+
+        All vendors are probed concurrently, each bounded by
+        `health_check_timeout_s`, so one hung vendor can't stall startup.
+        Results are cached for the session (and persisted to the DB).
         """
         logger.info("Running health checks...")
+        pending = [ai_id for ai_id in self.clients if ai_id not in self.healthy_speakers]
+        await asyncio.gather(*(self._check_health(ai_id) for ai_id in pending))
+        self._rebuild_speaker_queue()
+        logger.info(f"Health checks complete. Healthy: {self.healthy_speakers}")
 
-        for ai_id, client in self.clients.items():
-            try:
-                is_healthy = await client.health_check()
-                if is_healthy:
-                    self.healthy_speakers.add(ai_id)
-                    logger.info(f"  ✓ {ai_id} is healthy")
-                else:
-                    self.unhealthy_speakers.add(ai_id)
-                    logger.warning(f"  ✗ {ai_id} health check failed")
-            except Exception as e:
+    async def _check_health(self, ai_id: str) -> None:
+        client = self.clients[ai_id]
+        timeout = config.latency.health_check_timeout_s
+        try:
+            is_healthy = await asyncio.wait_for(client.health_check(), timeout)
+            if is_healthy:
+                self.healthy_speakers.add(ai_id)
+                logger.info(f"  ✓ {ai_id} is healthy")
+            else:
                 self.unhealthy_speakers.add(ai_id)
-                logger.error(f"  ✗ {ai_id} health check error: {e}")
+                logger.warning(f"  ✗ {ai_id} health check failed")
+        except asyncio.TimeoutError:
+            is_healthy = False
+            self.unhealthy_speakers.add(ai_id)
+            logger.error(f"  ✗ {ai_id} health check timed out after {timeout}s")
+        except Exception as e:
+            is_healthy = False
+            self.unhealthy_speakers.add(ai_id)
+            logger.error(f"  ✗ {ai_id} health check error: {e}")
+
+        # Join the Council as soon as this check passes (background mode)
+        self._rebuild_speaker_queue()
+
+        # Failures are recorded too, so they invalidate an earlier cached pass
+        if self.db is not None:
+            self.db.record_health(ai_id, config.ai_models[ai_id].model, is_healthy)
+
+    def fork(self, session_id: str) -> "TurnCoordinator":
+        """
+        A coordinator for another session that shares this one's clients.
+
+        Clients, health state, circuit breakers and vendor slots are shared,
+        so many sessions cost one set of connections and one round of
+        startup probes. Context, metadata and state are per session.
+        """
+        child = TurnCoordinator(
+            session_id, db=self.db, metrics=self.metrics,
+            response_cache=self.response_cache, pinned=self.pinned,
+        )
+        child.clients = self.clients
+        child.fallback_clients = self.fallback_clients
+        child.speaker_queue = self.speaker_queue
+        child.healthy_speakers = self.healthy_speakers
+        child.unhealthy_speakers = self.unhealthy_speakers
+        child.health_task = self.health_task
+        child.breakers = self.breakers
+        child._probes = self._probes
+        child.vendor_slots = self.vendor_slots
+        child.vendor_rates = self.vendor_rates
+        child._forked = True
+        return child
+
+    def _sync_pinned(self) -> None:
+        """Re-pin the auto-loaded docs if their content changed (a stat per doc otherwise)."""
+        if self.pinned is None:
+            return
+        version = self.pinned.refresh()
+        if version != self._pinned_version:
+            self._pinned_version = version
+            self.context.set_pinned(self.pinned.texts(), fit=self.pinned.fit)
+
+    def limit_vendor_concurrency(self, limit: int) -> None:
+        """Allow at most `limit` concurrent streams per vendor (across forks)."""
+        for settings in config.ai_models.values():
+            self.vendor_slots.setdefault(settings.vendor, asyncio.Semaphore(max(1, limit)))
+
+    def limit_vendor_rate(self, vendor: str, per_minute: float) -> None:
+        """Start at most `per_minute` streams a minute for `vendor` (across forks)."""
+        self.vendor_rates[vendor] = TokenBucket(per_minute)
+
+    @contextlib.asynccontextmanager
+    async def _vendor_slot(self, ai_id: str) -> AsyncIterator[None]:
+        vendor = config.ai_models[ai_id].vendor
+        slots = self.vendor_slots.get(vendor)
+        async with slots if slots is not None else contextlib.nullcontext():
+            # Rate token last: the request goes out as soon as we have it
+            bucket = self.vendor_rates.get(vendor)
+            if bucket is not None:
+                await bucket.acquire()
+            yield
+
+    async def wait_until_ready(self) -> None:
+        """Wait for background health checks if nobody is available yet."""
+        if not self.speaker_queue and self.health_task and not self.health_task.done():
+            await self.health_task
 
     async def get_next_speaker(self) -> Optional[str]:
         """
@@ -192,58 +383,440 @@ class TurnCoordinator:
         stream_callback=None
     ) -> Optional[str]:
         """
-        Execute a single AI turn with retry logic (Stage 2.0 MVP).
+        Execute a single AI turn with per-vendor resilience.
+
+        - Skipped instantly while the vendor's circuit is open
+        - Fatal errors (auth, bad request) are not retried
+        - Retryable errors back off with jitter, honoring Retry-After hints
+        - A stream that dies mid-reply is resumed from its partial text
+          (assistant prefill) where the vendor supports it, so only the
+          missing text is generated and streamed; otherwise the callback
+          gets StreamEvent.REWIND before the reply restarts
+        - Control tokens ([[PASS]], [[NOD]], ...) are parsed out of the
+          stream as it arrives; [[PASS]] cancels the vendor stream at once
+          (see _apply_controls for the rest)
+        - Speaker bleed: vendor stop sequences end generation at another
+          member's tag, and SpeakerGuard cuts the reply at any tag that
+          still gets through (`bleed` in turn_metadata)
 
         Args:
             ai_id: Which AI to use
             messages: Conversation history
             system_prompt: System instruction
-            stream_callback: Async function(text: str) -> None
+            stream_callback: Async function(text: str | StreamEvent) -> None
 
         Returns:
-            Full response text, or None if all retries failed
+            Full response text ("" for a reply of only control tokens), or None if the
+            turn failed (reason in turn_metadata[ai_id]["error"])
         """
         client = self.clients.get(ai_id)
         if not client:
             logger.error(f"{ai_id} client not found")
             return None
 
+        started = time.monotonic()
+        first_token_at = None
+        queue_wait = 0.0  # Time spent waiting for the vendor slot
+        sent_at = None  # When the request went out (TTFT counts from the latest attempt)
+        breaker = self._breaker_for(ai_id)
+        if not breaker.allow():
+            logger.warning(f"Skipping {ai_id}: circuit open for {breaker.vendor}")
+            self.turn_metadata[ai_id] = {"error": "circuit open"}
+            self._emit_turn_metrics(ai_id, started, first_token_at, None, None, None)
+            return None
+
+        settings = config.resilience
         self.state = State.AI_GENERATING
 
+        # Everyone this member must not speak for
+        others = [speaker for speaker in self.clients if speaker != ai_id] + [USER_SPEAKER]
+        stops = stop_sequences(others)
+
         # Retry loop (Level 1 resilience)
-        for attempt in range(MAX_RETRIES):
+        partial = ""  # Text of this turn already delivered to stream_callback
+        resumed = 0
+        for attempt in range(settings.max_retries):
+            attempt_messages = messages
+            skip_whitespace = False
+            if partial.strip() and client.supports_prefill:
+                # Resume: the model continues its own partial reply
+                prefill = partial.rstrip()  # Prefill may not end in whitespace
+                attempt_messages = messages + [{"role": "assistant", "content": prefill}]
+                skip_whitespace = len(prefill) < len(partial)
+                resumed += 1
+                logger.info(f"{ai_id}: resuming after {len(partial)} chars")
+            elif partial:
+                # Can't continue: tell the UI to drop what it showed, then restart
+                if stream_callback:
+                    await stream_callback(StreamEvent.REWIND)
+                partial = ""
+
             try:
-                # Stream the response
-                response_chunks = []
-                async for chunk in client.stream_response(messages, system_prompt):
-                    response_chunks.append(chunk)
-                    if stream_callback:
-                        await stream_callback(chunk)
+                # Stream the response (only new text reaches the callback)
+                response_chunks = [partial]
+                hedge = {}
+                parser = ControlParser()
+                guard = SpeakerGuard(others)
+                controls: List[ControlToken] = []
+                cut = False  # Closed before the vendor reported usage
+
+                async def emit(text: str) -> None:
+                    if text:
+                        response_chunks.append(text)
+                        if stream_callback:
+                            await stream_callback(text)
+
+                waiting = time.monotonic()
+                async with self._vendor_slot(ai_id):
+                    acquired = time.monotonic()
+                    queue_wait += acquired - waiting
+                    if first_token_at is None:
+                        sent_at = acquired
+                    stream = self._hedged_stream(ai_id, attempt_messages, system_prompt, hedge, stops)
+                    async with contextlib.aclosing(stream):
+                        async for chunk in stream:
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
+                            chunk, found = parser.feed(chunk)
+                            controls.extend(found)
+                            chunk, bled = guard.feed(chunk)
+                            if skip_whitespace and chunk:
+                                # The whitespace we stripped from the prefill was already shown
+                                chunk = chunk.lstrip()
+                                skip_whitespace = not chunk
+                            await emit(chunk)
+                            if bled or any(token.ends_turn for token in found):
+                                cut = True
+                                break  # Leaving aclosing() cancels the vendor stream
+                        else:
+                            tail, _ = guard.feed(parser.finish())
+                            await emit(tail + guard.finish())
 
                 # Success!
                 full_response = "".join(response_chunks)
+                if not full_response.strip():
+                    full_response = ""  # Nothing but control tokens
+                if guard.speaker is not None:
+                    # Cut where the impersonation began; that text is never stored
+                    logger.warning(f"{ai_id} started speaking as {guard.speaker}; reply cut there")
+                    full_response = full_response.rstrip()
+                breaker.record_success()
+                winner_id = hedge.get("winner", ai_id)
+                metadata = {
+                    "model": config.ai_models[winner_id].model,
+                    "usage": dict(hedge.get("usage", {})),
+                    "retries": attempt,
+                    "resumed": resumed,
+                    "hedged": hedge.get("hedged", False),
+                }
+                if winner_id != ai_id:
+                    # Switched to the same-vendor fallback (Authenticity Protocol)
+                    metadata["fallback_from"] = config.ai_models[ai_id].model
+                metadata.update(self._apply_controls(ai_id, controls))
+                if guard.speaker is not None:
+                    metadata["bleed"] = guard.speaker
+                if cut:
+                    # Billed for what was generated before the cancel, but
+                    # the vendor never said how much: `usage` is incomplete
+                    metadata["usage_partial"] = True
+                self.turn_metadata[ai_id] = metadata
+                self._emit_turn_metrics(ai_id, started, first_token_at, full_response, queue_wait, sent_at)
                 self.state = State.IDLE
                 return full_response
 
             except Exception as e:
-                if attempt < MAX_RETRIES - 1:
-                    # Retry with backoff
-                    delay = BACKOFF_DELAYS[attempt]
+                partial = "".join(response_chunks)
+                if classify_error(e) is ErrorKind.FATAL:
+                    logger.error(f"{ai_id} fatal error (not retrying): {e}")
+                    self.turn_metadata[ai_id] = {"error": f"{type(e).__name__}", "retries": attempt}
+                    self._emit_turn_metrics(ai_id, started, first_token_at, None, queue_wait, sent_at)
+                    self.state = State.IDLE
+                    return None
+
+                delay = backoff_delay(attempt, settings, retry_after(e))
+                if attempt < settings.max_retries - 1 and delay is not None:
                     logger.warning(
-                        f"{ai_id} error (attempt {attempt + 1}/{MAX_RETRIES}): {e}. "
-                        f"Retrying in {delay}s..."
+                        f"{ai_id} error (attempt {attempt + 1}/{settings.max_retries}): {e}. "
+                        f"Retrying in {delay:.1f}s..."
                     )
                     await asyncio.sleep(delay)
-                else:
-                    # All retries exhausted
-                    logger.error(
-                        f"{ai_id} failed after {MAX_RETRIES} attempts: {e}"
-                    )
-                    self.state = State.IDLE
-                    return None
+                    continue
+
+                # Retries exhausted (or the server asked for a longer wait than we allow)
+                logger.error(f"{ai_id} failed after {attempt + 1} attempts: {e}")
+                self.turn_metadata[ai_id] = {"error": f"{attempt + 1} attempts failed", "retries": attempt}
+                self._emit_turn_metrics(ai_id, started, first_token_at, None, queue_wait, sent_at)
+                if breaker.record_failure():
+                    self._schedule_probe(ai_id, breaker)
+                self.state = State.IDLE
+                return None
 
         return None  # Should never reach here, but for safety
 
+    def _apply_controls(self, ai_id: str, controls: List[ControlToken]) -> Dict[str, Any]:
+        """
+        Act on a turn's control tokens; returns them as turn metadata.
+
+        - PASS: the turn is yielded (`passed`); a named healthy speaker who
+          hasn't spoken this round goes next (`pass_to`, see _run_sequential)
+        - UPDATE_BOARD: replaces `board`
+        - NOD / THINKING / CELEBRATE: listed under `signals` for the UI
+        """
+        metadata: Dict[str, Any] = {}
+        for token in controls:
+            if token.kind is Control.PASS:
+                metadata["passed"] = True
+                target = (token.argument or "").lower()
+                if target in self.healthy_speakers and target != ai_id:
+                    metadata["pass_to"] = target
+            elif token.kind is Control.UPDATE_BOARD:
+                self.board = metadata["board"] = token.argument
+            else:
+                metadata.setdefault("signals", []).append(token.kind.value)
+        return metadata
+
+    def _emit_turn_metrics(
+        self,
+        ai_id: str,
+        started: float,
+        first_token_at: Optional[float],
+        response: Optional[str],
+        queue_wait: Optional[float],
+        sent_at: Optional[float]
+    ) -> None:
+        """
+        Report one turn's timings and token counts to the metrics recorder.
+
+        `queue_wait_s` is the time spent waiting for a vendor slot (and rate
+        token). `ttft_s` runs from when the request went out, so it is the
+        vendor's latency alone. Without a slot (circuit open) both are None.
+        """
+        if self.metrics is None:
+            return
+        finished = time.monotonic()
+        metadata = self.turn_metadata.get(ai_id, {})
+        usage = metadata.get("usage", {})
+
+        tokens_per_s = None
+        if response and first_token_at is not None:
+            # Vendor-reported output tokens; our own estimate if it didn't say
+            output_tokens = usage.get("output_tokens") or self.context.counter.count(response)
+            generating = finished - first_token_at
+            if generating > 0:
+                tokens_per_s = round(output_tokens / generating, 1)
+
+        self.metrics.record(
+            "turn",
+            ai_id,
+            session=self.session_id,
+            model=metadata.get("model"),
+            queue_wait_s=round(queue_wait, 3) if queue_wait is not None else None,
+            ttft_s=(
+                round(first_token_at - sent_at, 3)
+                if first_token_at is not None and sent_at is not None else None
+            ),
+            total_s=round(finished - started, 3),
+            tokens_per_s=tokens_per_s,
+            retries=metadata.get("retries", 0),
+            hedged=metadata.get("hedged", False),
+            failed=response is None,
+            error=metadata.get("error"),
+            usage=usage,
+        )
+
+    def _fallback_client(self, ai_id: str) -> Optional[AIClient]:
+        """Client for the configured same-vendor fallback of `ai_id`, if any."""
+        fallback_id = config.ai_models[ai_id].fallback
+        if fallback_id is None:
+            return None
+        client = self.fallback_clients.get(ai_id)
+        if client is None:
+            # validate_vendor_boundaries guarantees the fallback shares the vendor
+            client_cls = get_client_class(config.ai_models[fallback_id].vendor)
+            if client_cls is None:
+                return None
+            client = self.fallback_clients[ai_id] = self._build_client(client_cls, fallback_id)
+        return client
+
+    def _build_client(self, client_cls, ai_id: str) -> AIClient:
+        """Instantiate a vendor client, behind the response cache if one is set."""
+        client = client_cls(ai_id)
+        if self.response_cache is None:
+            return client
+        settings = config.ai_models[ai_id]
+        return CachingClient(client, self.response_cache, settings.model, settings.temperature)
+
+    async def _hedged_stream(
+        self,
+        ai_id: str,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        hedge: Dict[str, Any],
+        stop_sequences: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream from `ai_id`, hedging on time-to-first-token.
+
+        Off unless `latency.hedge_ttft_s` is set. If the primary model
+        hasn't produced a first chunk within it, the same turn is started
+        on the configured same-vendor fallback; whichever streams first
+        wins and the other is cancelled. `hedge` receives the winner's id and
+        its stream's own usage dict (clients are shared by forks, so usage is
+        never read off a client). Both streams get the same `stop_sequences`.
+        """
+        def open_stream(client: AIClient, usage: Dict[str, int]) -> AsyncIterator[str]:
+            return client.stream_response(messages, system_prompt, stop_sequences=stop_sequences, usage=usage)
+
+        primary = self.clients[ai_id]
+        deadline = config.latency.hedge_ttft_s
+        fallback = self._fallback_client(ai_id) if deadline is not None else None
+        if fallback is None:
+            hedge["usage"] = {}
+            # Closed explicitly, so an early stop ([[PASS]]) cancels the vendor request
+            async with contextlib.aclosing(open_stream(primary, hedge["usage"])) as stream:
+                async for chunk in stream:
+                    yield chunk
+            return
+
+        fallback_id = config.ai_models[ai_id].fallback
+        usage: Dict[str, int] = {}
+        streams = {open_stream(primary, usage): (ai_id, usage)}
+        pending = {asyncio.ensure_future(stream.__anext__()): stream for stream in streams}
+        winner = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=deadline)
+            if not done:
+                logger.info(f"{ai_id}: no first token after {deadline}s, hedging with {fallback_id}")
+                hedge["hedged"] = True
+                usage = {}
+                backup = open_stream(fallback, usage)
+                streams[backup] = (fallback_id, usage)
+                pending[asyncio.ensure_future(backup.__anext__())] = backup
+
+            error = None
+            while pending and winner is None:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both arrive together
+                for future in sorted(done, key=lambda f: streams[pending[f]][0] != ai_id):
+                    stream = pending.pop(future)
+                    exc = future.exception()
+                    if exc is None or isinstance(exc, StopAsyncIteration):
+                        winner, first = stream, future
+                        break
+                    error = exc
+            if winner is None:
+                raise error
+
+            hedge["winner"], hedge["usage"] = streams[winner]
+        finally:
+            # Cancel and close the loser(s) (and everything, if we're unwinding)
+            for future, stream in pending.items():
+                future.cancel()
+                try:
+                    await future
+                except BaseException:
+                    pass
+            for stream in streams:
+                if stream is not winner:
+                    await stream.aclose()
+
+        if isinstance(first.exception(), StopAsyncIteration):
+            return  # Winner produced an empty reply
+        try:
+            yield first.result()
+            async for chunk in winner:
+                yield chunk
+        finally:
+            await winner.aclose()
+
+    def _summary_client(self) -> Optional[AIClient]:
+        """Client for the cheap summary model (built on the first summary)."""
+        model_id = config.context.summary_model
+        if model_id is None or model_id not in config.ai_models:
+            return None
+        client_cls = get_client_class(config.ai_models[model_id].vendor)
+        return client_cls(model_id) if client_cls is not None else None
+
+    def _breaker_for(self, ai_id: str) -> CircuitBreaker:
+        """The circuit breaker shared by every model of this AI's vendor."""
+        vendor = config.ai_models[ai_id].vendor
+        breaker = self.breakers.get(vendor)
+        if breaker is None:
+            breaker = self.breakers[vendor] = CircuitBreaker(vendor, config.resilience)
+        return breaker
+
+    def _schedule_probe(self, ai_id: str, breaker: CircuitBreaker) -> None:
+        """Re-probe an open vendor in the background once its cooldown elapses."""
+        task = self._probes.get(breaker.vendor)
+        if task is None or task.done():
+            self._probes[breaker.vendor] = asyncio.create_task(self._probe_vendor(ai_id, breaker))
+
+    async def _probe_vendor(self, ai_id: str, breaker: CircuitBreaker) -> None:
+        client = self.clients[ai_id]
+        while breaker.opened_at is not None:
+            await asyncio.sleep(config.resilience.breaker_cooldown_s)
+            if breaker.opened_at is None:
+                return  # A half-open trial turn already closed it
+            try:
+                healthy = await asyncio.wait_for(
+                    client.health_check(), config.latency.health_check_timeout_s
+                )
+            except Exception:
+                healthy = False
+            if healthy:
+                breaker.record_success()
+                logger.info(f"{breaker.vendor} is back (background probe)")
+            else:
+                breaker.record_failure()
+
+    async def resume(self, session_id: str) -> List[Dict[str, str]]:
+        """
+        Switch to a stored session and load just the tail the context needs.
+
+        Messages are streamed newest-first and collected until the hot budget
+        is full, so resuming costs the same for a 20-message session and a
+        20,000-message one. Returns the conversation list to continue with.
+        """
+        if self.db is None:
+            raise RuntimeError("resume() needs a database")
+        if await self.db.get_session(session_id) is None:
+            raise KeyError(f"No session {session_id}")
+
+        tail: List[Dict[str, str]] = []
+        first_id = None
+        used = 0
+        async for row in self.db.iter_session_messages(session_id, newest_first=True):
+            message = history_message(row["speaker"], row["content"])
+            used += self.context.message_tokens(message)
+            if used > config.context.budget_hot and tail:
+                break
+            tail.append(message)
+            first_id = row["id"]
+        tail.reverse()
+
+        # Older messages come back as their stored summaries
+        first_seq = await self.db.count_messages_before(session_id, first_id) if tail else 0
+        self.session_id = session_id
+        self.context.sync(tail, first_seq=first_seq)
+        summaries = await self.summarizer.restore(session_id, first_seq)
+        logger.info(
+            f"Resumed {session_id}: {len(tail)} messages in the hot window, {summaries} summaries"
+        )
+        return tail
+
+    async def close(self) -> None:
+        """Stop background work (health checks, probes, summaries)."""
+        if self._forked:
+            await self.summarizer.close()
+            return
+        tasks = [self.health_task, *self._probes.values()]
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(t for t in tasks if t is not None), return_exceptions=True)
+        self._probes.clear()
+        await self.summarizer.close()
+
     async def run_round(
         self,
         messages: List[Dict[str, str]],
@@ -255,106 +828,208 @@ class TurnCoordinator:
         
         Stage 2.1: Supports @Mentions to target specific speakers.
         Default: All speakers (Round Robin).
+
+        With `latency.parallel_rounds` enabled, every target speaker streams
+        concurrently against the same history snapshot (see _run_parallel).
         """
-        responses = []
-        
-        # 1. Determine Target Speakers
-        # Check the last user message for @mentions
+        await self.wait_until_ready()
+        target_speakers = self._select_targets(messages)
+        self._sync_pinned()
+        self.context.sync(messages)
+        if not config.latency.summarize_async:
+            # Strict mode: every speaker sees finished summaries, at a latency cost
+            await self.summarizer.drain()
+        logger.info(f"Target Speakers for this round: {target_speakers}")
+
+        if config.latency.parallel_rounds and len(target_speakers) > 1:
+            responses = await self._run_parallel(
+                target_speakers, messages, system_prompt, stream_callback
+            )
+        else:
+            responses = await self._run_sequential(
+                target_speakers, messages, system_prompt, stream_callback
+            )
+
+        self.state = State.PAUSED_FOR_USER
+        return responses
+
+    def _select_targets(self, messages: List[Dict[str, str]]) -> List[str]:
+        """Determine who speaks this round from @mentions in the last user message."""
         last_user_msg = messages[-1]["content"].lower() if messages else ""
-        target_speakers = []
-        
+
         # Check for explicit @Council override (All speak)
         if "@council" in last_user_msg:
-            # Use the current queue order (rotation happens below if we used get_next, 
-            # but here we just grab the list)
-            target_speakers = list(self.speaker_queue)
-        else:
-            # Check for specific mentions
-            found_mentions = []
-            # iterating over healthy speakers to find mentions
-            for ai_id in self.speaker_queue:
-                if f"@{ai_id}" in last_user_msg:
-                    found_mentions.append(ai_id)
-            
-            if found_mentions:
-                target_speakers = found_mentions
-            else:
-                # Default: All Speak (Round Robin sequence)
-                # To maintain the rotation effect, we rotate the queue once per round?
-                # Or just iterate the current order. 
-                # For MVP behavior (everyone speaks), we just list them.
-                target_speakers = list(self.speaker_queue)
-                # Optional: Rotate the main queue so next time the order changes?
-                # self.speaker_queue.rotate(-1) 
+            return list(self.speaker_queue)
 
-        logger.info(f"Target Speakers for this round: {target_speakers}")
+        # Check for specific mentions (iterating over healthy speakers)
+        found_mentions = [
+            ai_id for ai_id in self.speaker_queue if f"@{ai_id}" in last_user_msg
+        ]
+        if found_mentions:
+            return found_mentions
 
-        for speaker_id in target_speakers:
+        # Default: All Speak (Round Robin sequence)
+        # Optional: Rotate the main queue so next time the order changes?
+        # self.speaker_queue.rotate(-1)
+        return list(self.speaker_queue)
+
+    @staticmethod
+    def _identity_prompt(speaker_id: str, system_prompt: str) -> str:
+        """Identity Injection in System Prompt."""
+        return (
+            f"{system_prompt}\n\n"
+            f"You are {speaker_id.upper()}. You are a member of the Skyforge Council. "
+            f"Speak ONLY as {speaker_id.upper()}. Do NOT generate text for other speakers. "
+            f"Stop speaking immediately after your contribution. "
+            f"If you have nothing to add, reply with just [[PASS]] "
+            f"(or [[PASS: Name]] to hand the turn to another member)."
+        )
+
+    def _record_response(
+        self,
+        speaker_id: str,
+        response_text: Optional[str],
+        messages: List[Dict[str, str]]
+    ) -> Dict[str, str]:
+        """Build the round result for a speaker and commit it to the history."""
+        metadata = self.turn_metadata.pop(speaker_id, {})
+        if response_text == "" and any(key in metadata for key in CONTROL_METADATA + ("bleed",)):
+            # Only control tokens (a pass, a signal, a board update), or a
+            # reply cut by SpeakerGuard at its first line: a successful turn
+            # with nothing to show, store or add to the history
+            return {"speaker": speaker_id, "content": "", "success": True, "metadata": metadata}
+        if not response_text:
+            # Turn failed (retries exhausted, fatal error or open circuit)
+            logger.warning(f"Skipping {speaker_id} (unavailable)")
+            reason = metadata.get("error", "unavailable")
+            return {
+                "speaker": speaker_id,
+                "content": f"⚠️ {speaker_id} unavailable ({reason}). Skipping turn.",
+                "success": False
+            }
+
+        # Add AI response to message history for next speaker (or for next round)
+        # Even if other AIs didn't speak, they will see this in the history next time they are called.
+        messages.append(history_message(speaker_id, response_text))
+        self.context.sync(messages)
+        return {
+            "speaker": speaker_id,
+            "content": response_text,
+            "success": True,
+            "metadata": metadata
+        }
+
+    async def _run_sequential(
+        self,
+        target_speakers: List[str],
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stream_callback
+    ) -> List[Dict[str, str]]:
+        """
+        Classic round: each speaker sees everything said before it this round.
+
+        A directed [[PASS: Name]] moves Name to the front of the remaining
+        speakers (or adds them, if they weren't targeted and haven't spoken).
+        """
+        responses = []
+        remaining = deque(target_speakers)
+        spoken: Set[str] = set()
+
+        while remaining:
             # We do not use get_next_speaker() here because we have a specific list.
-            
+            speaker_id = remaining.popleft()
+            spoken.add(speaker_id)
             logger.info(f"Turn: {speaker_id}")
-            
+
             # Wrap callback to include speaker ID context
-            async def scoped_callback(chunk: str):
+            async def scoped_callback(chunk: str, speaker_id=speaker_id):
                 if stream_callback:
                     await stream_callback(speaker_id, chunk)
 
-            # Identity Injection in System Prompt
-            identity_prompt = (
-                f"{system_prompt}\n\n"
-                f"You are {speaker_id.upper()}. You are a member of the Skyforge Council. "
-                f"Speak ONLY as {speaker_id.upper()}. Do NOT generate text for other speakers. "
-                f"Stop speaking immediately after your contribution."
-            )
-
-            # Subjective History Transformation (Claude's Fix)
-            # Transform history so current speaker sees others as 'user' and self as 'assistant'
-            subjective_messages = []
-            for msg in messages:
-                content = msg["content"]
-                role = msg["role"]
-                
-                if role == "user":
-                    # Vinga is always User
-                    subjective_messages.append(msg)
-                elif role == "assistant":
-                    # Check if this is ME speaking
-                    # We check specific identity tag format: [Speaker]: ...
-                    my_tag = f"[{speaker_id.capitalize()}]:"
-                    
-                    if content.strip().startswith(my_tag):
-                        # It's me -> Assistant (Internal Memory)
-                        subjective_messages.append({"role": "assistant", "content": content})
-                    else:
-                        # It's someone else -> User (External Input)
-                        subjective_messages.append({"role": "user", "content": content})
-
             # Execute turn with retry logic
             response_text = await self.execute_turn(
-                speaker_id, 
-                subjective_messages, 
-                identity_prompt, 
+                speaker_id,
+                self.context.view(speaker_id),
+                self.context.render_system(self._identity_prompt(speaker_id, system_prompt)),
                 stream_callback=scoped_callback
             )
+            response = self._record_response(speaker_id, response_text, messages)
+            responses.append(response)
 
-            if response_text:
-                responses.append({
-                    "speaker": speaker_id,
-                    "content": response_text,
-                    "success": True
-                })
-                # Add AI response to message history for next speaker (or for next round)
-                # Even if other AIs didn't speak, they will see this in the history next time they are called.
-                identity_content = f"[{speaker_id.capitalize()}]: {response_text}"
-                messages.append({"role": "assistant", "content": identity_content})
-            else:
-                # All retries failed
-                logger.warning(f"Skipping {speaker_id} (unavailable)")
-                responses.append({
-                    "speaker": speaker_id,
-                    "content": f"⚠️ {speaker_id} unavailable (3 retries failed). Skipping turn.",
-                    "success": False
-                })
+            pass_to = response.get("metadata", {}).get("pass_to")
+            if pass_to and pass_to not in spoken:
+                if pass_to in remaining:
+                    remaining.remove(pass_to)
+                remaining.appendleft(pass_to)
+                logger.info(f"{speaker_id} passes to {pass_to}")
 
-        self.state = State.PAUSED_FOR_USER
         return responses
+
+    async def _run_parallel(
+        self,
+        target_speakers: List[str],
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stream_callback
+    ) -> List[Dict[str, str]]:
+        """
+        Parallel round: all speakers stream at once from the same snapshot.
+
+        Nobody sees this round's other replies. Each stream is buffered in
+        its own queue; buffers are forwarded to `stream_callback` strictly in
+        speaker order (the first speaker is effectively live, the rest replay
+        as soon as their predecessor finishes), so the UI never interleaves.
+        Responses are committed to `messages` in the same order. A directed
+        [[PASS: Name]] can't reorder anything here: everyone already spoke.
+        """
+        limit = asyncio.Semaphore(max(1, config.latency.max_parallel_speakers))
+        buffers = {speaker_id: asyncio.Queue() for speaker_id in target_speakers}
+
+        # Build every prompt before anyone commits, so all share one snapshot
+        prompts = {
+            speaker_id: (
+                self.context.view(speaker_id),
+                self.context.render_system(self._identity_prompt(speaker_id, system_prompt)),
+            )
+            for speaker_id in target_speakers
+        }
+
+        async def run_speaker(speaker_id: str) -> Optional[str]:
+            buffer = buffers[speaker_id]
+
+            async def buffered_callback(chunk: str):
+                buffer.put_nowait(chunk)
+
+            try:
+                async with limit:
+                    logger.info(f"Turn (parallel): {speaker_id}")
+                    subjective_messages, identity_prompt = prompts[speaker_id]
+                    return await self.execute_turn(
+                        speaker_id,
+                        subjective_messages,
+                        identity_prompt,
+                        stream_callback=buffered_callback
+                    )
+            finally:
+                buffer.put_nowait(None)  # End-of-stream marker
+
+        async def forward_in_order() -> None:
+            for speaker_id in target_speakers:
+                buffer = buffers[speaker_id]
+                while (chunk := await buffer.get()) is not None:
+                    if stream_callback:
+                        await stream_callback(speaker_id, chunk)
+
+        turns = asyncio.gather(*(run_speaker(s) for s in target_speakers))
+        try:
+            await forward_in_order()
+            results = await turns
+        except BaseException:
+            turns.cancel()
+            raise
+
+        return [
+            self._record_response(speaker_id, response_text, messages)
+            for speaker_id, response_text in zip(target_speakers, results)
+        ]
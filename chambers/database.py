@@ -1,11 +1,21 @@
 import aiosqlite
+import asyncio
+import logging
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, AsyncIterator, Iterable, NamedTuple, Tuple
 import json
 
+if TYPE_CHECKING:
+    from .metrics import MetricsRecorder
+
+logger = logging.getLogger(__name__)
+
 DB_PATH = Path("chambers.db")
+# Rows fetched per keyset page when streaming a session
+PAGE_SIZE = 500
 
 INIT_SCRIPT = """
 PRAGMA journal_mode=WAL;
@@ -28,52 +38,467 @@ CREATE TABLE IF NOT EXISTS messages (
     FOREIGN KEY(session_id) REFERENCES sessions(id)
 );
 
+-- Keys are (session_id, rowid): serves keyset paging on (session_id, id) in both directions
 CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id);
+
+-- Second-Order Summaries of evicted hot context, by session-wide message position
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT,
+    start_seq INTEGER,  -- First message covered (0-based position in the session)
+    end_seq INTEGER,    -- One past the last message covered
+    content TEXT,
+    model TEXT,
+    created_at TIMESTAMP,
+    FOREIGN KEY(session_id) REFERENCES sessions(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_summaries_session ON summaries(session_id, end_seq);
+
+CREATE TABLE IF NOT EXISTS health_checks (
+    ai_id TEXT PRIMARY KEY,
+    model TEXT,
+    healthy INTEGER,
+    checked_at REAL  -- Unix time
+);
 """
 
+# Versioned migrations (PRAGMA user_version): (version, script), applied in order.
+# Each script runs in one transaction together with its version bump.
+MIGRATIONS = [
+    # 1: Full-text index over messages (external content: no duplicated text),
+    #    kept in sync by triggers and backfilled from existing rows.
+    (1, """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, speaker,
+    content='messages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content, speaker) VALUES (new.id, new.content, new.speaker);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content, speaker)
+    VALUES ('delete', old.id, old.content, old.speaker);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content, speaker ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content, speaker)
+    VALUES ('delete', old.id, old.content, old.speaker);
+    INSERT INTO messages_fts(rowid, content, speaker) VALUES (new.id, new.content, new.speaker);
+END;
+
+INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
+"""),
+]
+
+# Ranked search; content matches weigh more than speaker-name matches
+SEARCH_MESSAGES = """
+SELECT m.id, m.session_id, m.speaker, m.timestamp,
+       snippet(messages_fts, 0, ?, ?, '…', ?) AS snippet,
+       bm25(messages_fts, 1.0, 0.5) AS rank
+FROM messages_fts
+JOIN messages AS m ON m.id = messages_fts.rowid
+WHERE messages_fts MATCH ? {session_filter}
+ORDER BY rank
+LIMIT ? OFFSET ?
+"""
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match.
+
+    Words are quoted so punctuation and FTS operators in user input are
+    searched literally; a trailing `*` keeps prefix matching (`forg*`).
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+INSERT_MESSAGE = (
+    "INSERT INTO messages (session_id, speaker, content, timestamp, metadata) VALUES (?, ?, ?, ?, ?)"
+)
+TOUCH_SESSION = "UPDATE sessions SET last_updated = ? WHERE id = ?"
+
+
+class _PendingWrite(NamedTuple):
+    """One unit of queued work: statements committed together, then `done` resolves."""
+    statements: List[Tuple[str, tuple]]
+    done: asyncio.Future
+
+
+class Database:
+    """
+    Long-lived database service: one shared connection plus a write-behind queue.
+
+    All writes go through a single background writer task. Whatever is queued
+    when the writer wakes up (e.g. every message of a round) is committed in
+    ONE transaction, so the UI never pays connection setup or a per-message
+    fsync. Durability is unchanged: a turn is committed as soon as the writer
+    reaches it, and `flush()` / `close()` wait until everything is on disk.
+    """
+
+    def __init__(self, path: Path = DB_PATH, metrics: Optional["MetricsRecorder"] = None):
+        self.path = Path(path)
+        self.metrics = metrics  # Optional: receives commit latency per batch
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    async def open(self) -> None:
+        """Connect, apply the schema (WAL mode) and start the writer."""
+        if self._conn is not None:
+            return
+        self._conn = await aiosqlite.connect(self.path)
+        self._conn.row_factory = aiosqlite.Row
+        await self._conn.executescript(INIT_SCRIPT)
+        await self._conn.commit()
+        await self._migrate()
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def _migrate(self) -> None:
+        """Bring an older database file up to the latest schema version."""
+        async with self._conn.execute("PRAGMA user_version") as cursor:
+            current = (await cursor.fetchone())[0]
+        for version, script in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info(f"Migrating database to schema v{version}")
+            # executescript commits first; BEGIN makes script + version bump atomic
+            await self._conn.executescript(
+                f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;"
+            )
+
+    async def flush(self) -> None:
+        """Wait until every queued write has been committed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Shutdown hook: flush pending writes, stop the writer, close the connection."""
+        if self._conn is None:
+            return
+        await self.flush()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        await self._conn.close()
+        self._conn = None
+        self._queue = None
+        self._writer = None
+
+    # --- Writes (write-behind) ---
+
+    def _enqueue(self, statements: List[Tuple[str, tuple]]) -> asyncio.Future:
+        if self._queue is None:
+            raise RuntimeError("Database is not open (call open() first)")
+        done = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved; fire-and-forget callers rely on the writer's log
+        done.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._queue.put_nowait(_PendingWrite(statements, done))
+        return done
+
+    def queue_messages(
+        self,
+        session_id: str,
+        entries: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> asyncio.Future:
+        """
+        Queue (speaker, content, metadata) entries for one session.
+
+        Returns immediately; the returned future resolves once the batch is
+        committed. Await it (or `flush()`) when durability must be confirmed.
+        """
+        now = datetime.now().isoformat()
+        statements = [
+            (INSERT_MESSAGE, (session_id, speaker, content, now, json.dumps(metadata or {})))
+            for speaker, content, metadata in entries
+        ]
+        # Update session timestamp
+        statements.append((TOUCH_SESSION, (now, session_id)))
+        return self._enqueue(statements)
+
+    async def save_message(
+        self, session_id: str, speaker: str, content: str, metadata: Dict[str, Any] = None
+    ) -> None:
+        """Save a message and wait for it to be committed."""
+        await self.queue_messages(session_id, [(speaker, content, metadata)])
+
+    async def create_session(self) -> str:
+        """Create a new session and return its ID."""
+        session_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        await self._enqueue([(
+            "INSERT INTO sessions (id, created_at, last_updated, status, rotation_state) VALUES (?, ?, ?, ?, ?)",
+            (session_id, now, now, "active", "{}")
+        )])
+        return session_id
+
+    def record_health(self, ai_id: str, model: str, healthy: bool) -> asyncio.Future:
+        """Queue a health check result (used to skip re-probing on quick restarts)."""
+        return self._enqueue([(
+            "INSERT OR REPLACE INTO health_checks (ai_id, model, healthy, checked_at) VALUES (?, ?, ?, ?)",
+            (ai_id, model, int(healthy), time.time())
+        )])
+
+    def save_summary(
+        self, session_id: str, start_seq: int, end_seq: int, content: str, model: str
+    ) -> asyncio.Future:
+        """Queue a summary of messages [start_seq, end_seq) of a session."""
+        return self._enqueue([(
+            "INSERT INTO summaries (session_id, start_seq, end_seq, content, model, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, start_seq, end_seq, content, model, datetime.now().isoformat())
+        )])
+
+    async def _commit(self, batch: List[_PendingWrite]) -> None:
+        """Run `batch` as one transaction (rolled back if any statement fails)."""
+        try:
+            for pending in batch:
+                for sql, params in pending.statements:
+                    await self._conn.execute(sql, params)
+            await self._conn.commit()
+        except Exception:
+            try:
+                await self._conn.rollback()
+            except Exception:
+                pass
+            raise
+
+    async def _write_loop(self) -> None:
+        """
+        Drain the queue, committing everything pending as one transaction.
+
+        If that transaction fails, each write is retried in its own, so
+        only the bad write fails and the unrelated ones still land.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            started = time.monotonic()
+            try:
+                await self._commit(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    logger.error(f"Database write failed: {e}")
+                    if not batch[0].done.done():
+                        batch[0].done.set_exception(e)
+                else:
+                    logger.warning(f"Batch of {len(batch)} writes failed ({e}); retrying one by one")
+                    for pending in batch:
+                        try:
+                            await self._commit([pending])
+                        except Exception as item_error:
+                            logger.error(f"Database write failed: {item_error}")
+                            if not pending.done.done():
+                                pending.done.set_exception(item_error)
+                        else:
+                            if not pending.done.done():
+                                pending.done.set_result(None)
+            else:
+                if self.metrics is not None:
+                    self.metrics.record(
+                        "db_write",
+                        "db",
+                        write_s=round(time.monotonic() - started, 4),
+                        batch=len(batch),
+                        statements=sum(len(pending.statements) for pending in batch),
+                    )
+                for pending in batch:
+                    if not pending.done.done():
+                        pending.done.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    # --- Reads ---
+
+    async def get_session_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        """Retrieve all messages for a session (pending writes are flushed first)."""
+        await self.flush()
+        async with self._conn.execute(
+            "SELECT * FROM messages WHERE session_id = ? ORDER BY id ASC",
+            (session_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """The session row, or None if there is no such session."""
+        await self.flush()
+        async with self._conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row is not None else None
+
+    async def iter_session_messages(
+        self,
+        session_id: str,
+        newest_first: bool = False,
+        start_after: Optional[int] = None,
+        page_size: int = PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a session's messages with keyset pagination on (session_id, id).
+
+        Each page is one short indexed query that resumes after the last id
+        seen, so memory stays at one page however long the session is and
+        no read transaction is held between pages. `start_after` is an
+        exclusive message id in iteration order.
+        """
+        await self.flush()
+        if newest_first:
+            sql = "SELECT * FROM messages WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?"
+        else:
+            sql = "SELECT * FROM messages WHERE session_id = ? AND id > ? ORDER BY id ASC LIMIT ?"
+        cursor_id = start_after
+        if cursor_id is None:
+            cursor_id = (1 << 63) - 1 if newest_first else 0
+
+        while True:
+            async with self._conn.execute(sql, (session_id, cursor_id, page_size)) as cursor:
+                rows = await cursor.fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < page_size:
+                return
+            cursor_id = rows[-1]["id"]
+
+    async def list_sessions(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Sessions by recency (most recently updated first)."""
+        await self.flush()
+        async with self._conn.execute(
+            "SELECT * FROM sessions ORDER BY last_updated DESC, id LIMIT ? OFFSET ?", (limit, offset)
+        ) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def iter_sessions(self, page_size: int = PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        """Every session, streamed in creation order with keyset pagination on rowid."""
+        await self.flush()
+        last_rowid = 0
+        while True:
+            async with self._conn.execute(
+                "SELECT rowid AS _rowid, * FROM sessions WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, page_size)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            for row in rows:
+                session = dict(row)
+                del session["_rowid"]
+                yield session
+            if len(rows) < page_size:
+                return
+            last_rowid = rows[-1]["_rowid"]
+
+    async def count_messages_before(
+        self, session_id: str, before_id: int = (1 << 63) - 1
+    ) -> int:
+        """How many of a session's messages precede message `before_id` (default: all)."""
+        await self.flush()
+        async with self._conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE session_id = ? AND id < ?", (session_id, before_id)
+        ) as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def get_summaries(self, session_id: str, up_to_seq: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """The newest `limit` summaries covering messages before `up_to_seq`, oldest first."""
+        await self.flush()
+        async with self._conn.execute(
+            "SELECT * FROM summaries WHERE session_id = ? AND end_seq <= ? "
+            "ORDER BY end_seq DESC LIMIT ?",
+            (session_id, up_to_seq, limit)
+        ) as cursor:
+            rows = [dict(row) for row in await cursor.fetchall()]
+        rows.reverse()
+        return rows
+
+    async def get_messages_before(
+        self, session_id: str, before_id: Optional[int] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Up to `limit` messages older than `before_id` (default: the tail), oldest first."""
+        rows = []
+        async for row in self.iter_session_messages(
+            session_id, newest_first=True, start_after=before_id, page_size=limit
+        ):
+            rows.append(row)
+            if len(rows) == limit:
+                break
+        rows.reverse()
+        return rows
+
+    async def search_messages(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        highlight: Tuple[str, str] = ("**", "**"),
+        snippet_tokens: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search across sessions (or within one), best matches first.
+
+        `query` is free text (see fts_query). Each hit has id, session_id,
+        speaker, timestamp, rank (bm25, lower is better) and a `snippet` of
+        about `snippet_tokens` words with matches wrapped in `highlight`.
+        Page with `limit` / `offset`.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        await self.flush()
+        sql = SEARCH_MESSAGES.format(session_filter="AND m.session_id = ?" if session_id else "")
+        params = [highlight[0], highlight[1], snippet_tokens, match]
+        if session_id:
+            params.append(session_id)
+        params += [limit, offset]
+        async with self._conn.execute(sql, params) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def get_cached_health(self, max_age_s: float) -> Dict[str, str]:
+        """ai_id -> model for health checks that PASSED within the last `max_age_s`."""
+        async with self._conn.execute(
+            "SELECT ai_id, model FROM health_checks WHERE healthy = 1 AND checked_at >= ?",
+            (time.time() - max_age_s,)
+        ) as cursor:
+            return {row["ai_id"]: row["model"] for row in await cursor.fetchall()}
+
+
+# Shared service for the app; the module-level helpers below delegate to it.
+db = Database(DB_PATH)
+
 async def init_db():
     """Initialize the database with schema and WAL mode."""
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.executescript(INIT_SCRIPT)
-        await db.commit()
+    await db.open()
+
+async def close_db():
+    """Flush pending writes and close the shared connection."""
+    await db.close()
 
 async def create_session() -> str:
     """Create a new session and return its ID."""
-    session_id = str(uuid.uuid4())
-    now = datetime.now().isoformat()
-    
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute(
-            "INSERT INTO sessions (id, created_at, last_updated, status, rotation_state) VALUES (?, ?, ?, ?, ?)",
-            (session_id, now, now, "active", "{}")
-        )
-        await db.commit()
-    return session_id
+    return await db.create_session()
 
 async def save_message(session_id: str, speaker: str, content: str, metadata: Dict[str, Any] = None):
     """Save a message to the database."""
-    now = datetime.now().isoformat()
-    meta_json = json.dumps(metadata or {})
-    
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute(
-            "INSERT INTO messages (session_id, speaker, content, timestamp, metadata) VALUES (?, ?, ?, ?, ?)",
-            (session_id, speaker, content, now, meta_json)
-        )
-        # Update session timestamp
-        await db.execute(
-            "UPDATE sessions SET last_updated = ? WHERE id = ?",
-            (now, session_id)
-        )
-        await db.commit()
+    await db.save_message(session_id, speaker, content, metadata)
 
 async def get_session_messages(session_id: str) -> List[Dict[str, Any]]:
     """Retrieve all messages for a session."""
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute(
-            "SELECT * FROM messages WHERE session_id = ? ORDER BY id ASC",
-            (session_id,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+    return await db.get_session_messages(session_id)
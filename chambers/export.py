@@ -0,0 +1,233 @@
+"""
+SKYFORGE Chambers - Session Export
+
+Streams sessions from the database straight into Markdown or NDJSON files:
+messages are read one keyset page at a time and each page is written as
+soon as it is formatted, so memory stays flat however large the archive is.
+
+- Selectors: `all`, `last`, `N` or `N-M` (by recency, 1 = most recent), or
+  a session id
+- Several sessions are exported concurrently (`export.concurrency`)
+- A manifest in the output directory remembers each session's
+  `last_updated`; unchanged sessions are skipped on the next run
+- Files are written under a temporary name and renamed when complete, so an
+  interrupted export never leaves a truncated file that looks finished
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, TextIO
+
+from .config import config
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"md": ".md", "ndjson": ".ndjson"}
+MANIFEST_NAME = ".export_manifest.json"
+RANGE = re.compile(r"^(\d+)(?:-(\d+))?$")
+
+
+@dataclass
+class ExportResult:
+    exported: List[Path] = field(default_factory=list)
+    skipped: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)  # session id -> error
+
+    def summary(self) -> str:
+        text = f"{len(self.exported)} exported, {self.skipped} unchanged"
+        if self.failed:
+            text += f", {len(self.failed)} failed"
+        return text
+
+
+async def select_sessions(db: Database, selector: str) -> AsyncIterator[Dict[str, Any]]:
+    """Sessions matching `all`, `last`, `N`, `N-M` (1 = most recent) or a session id."""
+    selector = selector.strip() or "last"
+    if selector == "all":
+        async for session in db.iter_sessions():
+            yield session
+        return
+
+    if selector == "last":
+        selector = "1"
+    match = RANGE.match(selector)
+    if match:
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        if first < 1 or last < first:
+            raise ValueError(f"Bad session range: {selector}")
+        for session in await db.list_sessions(limit=last - first + 1, offset=first - 1):
+            yield session
+        return
+
+    session = await db.get_session(selector)
+    if session is None:
+        raise ValueError(f"No session {selector}")
+    yield session
+
+
+def _markdown_header(session: Dict[str, Any], count: int) -> str:
+    return "\n".join([
+        f"# Skyforge Chambers Session: {session['id']}",
+        f"**Date:** {session['created_at']}",
+        f"**Messages:** {count}",
+        "",
+        "---",
+        "",
+        "",
+    ])
+
+
+def _markdown_message(row: Dict[str, Any]) -> str:
+    timestamp = datetime.fromisoformat(row["timestamp"]).strftime("%H:%M:%S")
+    return f"### 🕒 {timestamp} - **{row['speaker'].upper()}**\n\n{row['content']}\n\n---\n\n"
+
+
+def _ndjson_message(row: Dict[str, Any]) -> str:
+    record = {
+        "type": "message",
+        "id": row["id"],
+        "session_id": row["session_id"],
+        "speaker": row["speaker"],
+        "timestamp": row["timestamp"],
+        "content": row["content"],
+        "metadata": json.loads(row["metadata"] or "{}"),
+    }
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class Exporter:
+    """Exports sessions from `db` into `out_dir`, `concurrency` sessions at a time."""
+
+    def __init__(
+        self,
+        db: Database,
+        out_dir: Path,
+        fmt: str = "md",
+        concurrency: int = 4,
+        force: bool = False
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r} (use {', '.join(FORMATS)})")
+        self.db = db
+        self.out_dir = Path(out_dir).expanduser()
+        self.fmt = fmt
+        self.concurrency = max(1, concurrency)
+        self.force = force
+        self.manifest_path = self.out_dir / MANIFEST_NAME
+
+    def path_for(self, session_id: str) -> Path:
+        return self.out_dir / f"{session_id}{FORMATS[self.fmt]}"
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export manifest ({e})")
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+        os.replace(tmp, self.manifest_path)
+
+    def _unchanged(self, session: Dict[str, Any], manifest: Dict[str, Dict[str, str]]) -> bool:
+        entry = manifest.get(f"{session['id']}{FORMATS[self.fmt]}")
+        return (
+            not self.force
+            and entry is not None
+            and entry.get("last_updated") == session["last_updated"]
+            and self.path_for(session["id"]).exists()
+        )
+
+    async def export(self, selector: str = "last") -> ExportResult:
+        """Export the selected sessions; unchanged ones are skipped."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        result = ExportResult()
+        # Bounded hand-off: the session listing never runs far ahead of the workers
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker() -> None:
+            while (session := await pending.get()) is not None:
+                try:
+                    path = await self._export_session(session)
+                except Exception as e:
+                    logger.error(f"Export of {session['id']} failed: {e}")
+                    result.failed[session["id"]] = str(e)
+                else:
+                    result.exported.append(path)
+                    manifest[path.name] = {"last_updated": session["last_updated"]}
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for session in select_sessions(self.db, selector):
+                if self._unchanged(session, manifest):
+                    result.skipped += 1
+                    continue
+                await pending.put(session)
+        finally:
+            for _ in workers:
+                await pending.put(None)
+            await asyncio.gather(*workers)
+            self._save_manifest(manifest)
+        return result
+
+    async def _export_session(self, session: Dict[str, Any]) -> Path:
+        path = self.path_for(session["id"])
+        tmp = path.with_name(path.name + ".part")
+        handle: TextIO = await asyncio.to_thread(open, tmp, "w", encoding="utf-8")
+        try:
+            if self.fmt == "md":
+                count = await self.db.count_messages_before(session["id"])
+                await asyncio.to_thread(handle.write, _markdown_header(session, count))
+                format_row = _markdown_message
+            else:
+                record = {"type": "session", **session}
+                await asyncio.to_thread(handle.write, json.dumps(record, ensure_ascii=False) + "\n")
+                format_row = _ndjson_message
+
+            page: List[str] = []
+            async for row in self.db.iter_session_messages(session["id"]):
+                page.append(format_row(row))
+                if len(page) >= 100:
+                    # File I/O off the event loop, overlapping the next page's read
+                    await asyncio.to_thread(handle.write, "".join(page))
+                    page = []
+            if page:
+                await asyncio.to_thread(handle.write, "".join(page))
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            tmp.unlink(missing_ok=True)
+            raise
+        await asyncio.to_thread(handle.close)
+        os.replace(tmp, path)
+        return path
+
+
+async def export_sessions(
+    db: Database,
+    selector: str = "last",
+    out_dir: Optional[Path] = None,
+    fmt: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    force: bool = False
+) -> ExportResult:
+    """Export with `config.export` defaults for anything not given."""
+    exporter = Exporter(
+        db,
+        Path(out_dir or config.export.out_dir),
+        fmt or config.export.format,
+        concurrency or config.export.concurrency,
+        force,
+    )
+    return await exporter.export(selector)
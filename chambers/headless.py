@@ -0,0 +1,235 @@
+"""
+SKYFORGE Chambers - Headless Batch Runner
+
+Drives the Council from scripts and pipelines without the TUI. Reads jobs
+from JSONL, runs each as its own session through TurnCoordinator.run_round
+and writes NDJSON events as they happen.
+
+Input, one job per line:
+    {"id": "q1", "prompt": "@Claude what is WAL mode?"}
+    {"id": "q2", "prompt": ["First question", "Follow-up"], "system": "Be brief."}
+
+Output events: start, chunk (with --chunks), response, done, error and a
+final summary. Jobs run concurrently (--concurrency) over ONE shared set of
+vendor clients (TurnCoordinator.fork), with at most
+`latency.vendor_concurrency` streams in flight per vendor. Every session is
+persisted through the database like an interactive one.
+
+Usage:
+    python -m chambers.headless prompts.jsonl > results.ndjson
+    cat prompts.jsonl | python -m chambers.headless - --concurrency 16 --chunks
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, TextIO
+
+from .config import config
+from .coordinator import USER_SPEAKER, TurnCoordinator
+from .database import DB_PATH, Database
+from .metrics import metrics
+from .response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+
+class EventWriter:
+    """Writes one JSON object per line and flushes, so consumers see events live."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self.stream.write(json.dumps({"event": event, **fields}, ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+
+async def read_jobs(stream: TextIO) -> AsyncIterator[Dict[str, Any]]:
+    """Parse JSONL jobs lazily (reads happen off the event loop)."""
+    line_number = 0
+    while True:
+        line = await asyncio.to_thread(stream.readline)
+        if not line:
+            return
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            yield {"id": str(line_number), "error": f"invalid JSON: {e}"}
+            continue
+        if isinstance(job, str):
+            job = {"prompt": job}
+        if not isinstance(job, dict):
+            kind = type(job).__name__
+            yield {"id": str(line_number), "error": f"invalid job: expected an object or a string, got {kind}"}
+            continue
+        job.setdefault("id", str(line_number))
+        yield job
+
+
+class HeadlessRunner:
+    """Runs jobs concurrently over one shared, health-checked Council."""
+
+    def __init__(
+        self,
+        db: Database,
+        writer: EventWriter,
+        concurrency: int = 4,
+        stream_chunks: bool = False,
+        vendor_limit: Optional[int] = None,
+        cache: bool = False
+    ):
+        self.db = db
+        self.writer = writer
+        self.concurrency = max(1, concurrency)
+        self.stream_chunks = stream_chunks
+        self.vendor_limit = vendor_limit or config.latency.vendor_concurrency
+        self.cache = cache or config.response_cache.enabled
+        self.council: Optional[TurnCoordinator] = None
+        self.completed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Build the shared clients and run the startup health checks once."""
+        self.council = TurnCoordinator(
+            "headless", db=self.db, metrics=metrics,
+            response_cache=response_cache if self.cache else None,
+        )
+        await self.council.initialize()
+        self.council.limit_vendor_concurrency(self.vendor_limit)
+
+    async def run(self, jobs: AsyncIterator[Dict[str, Any]]) -> None:
+        if self.council is None:
+            await self.start()
+        started = time.monotonic()
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker() -> None:
+            while (job := await pending.get()) is not None:
+                await self.run_job(job)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for job in jobs:
+                await pending.put(job)
+        finally:
+            for _ in workers:
+                await pending.put(None)
+            await asyncio.gather(*workers)
+
+        self.writer.emit(
+            "summary",
+            jobs=self.completed + self.failed,
+            failed=self.failed,
+            elapsed_s=round(time.monotonic() - started, 3),
+        )
+
+    async def run_job(self, job: Dict[str, Any]) -> None:
+        """One job = one session: every prompt is a round, in order."""
+        job_id = job["id"]
+        prompts = job.get("prompt")
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        if job.get("error") or not prompts:
+            self.failed += 1
+            self.writer.emit("error", job=job_id, error=job.get("error", "no prompt"))
+            return
+
+        started = time.monotonic()
+        coordinator = None
+        try:
+            session_id = await self.db.create_session()
+            coordinator = self.council.fork(session_id)
+            self.writer.emit("start", job=job_id, session_id=session_id)
+            history: List[Dict[str, str]] = []
+
+            async def on_chunk(speaker: str, chunk) -> None:
+                if isinstance(chunk, str):
+                    self.writer.emit("chunk", job=job_id, speaker=speaker, text=chunk)
+                else:
+                    self.writer.emit("chunk", job=job_id, speaker=speaker, control=chunk.value)
+
+            for turn, prompt in enumerate(prompts):
+                history.append({"role": "user", "content": prompt})
+                self.db.queue_messages(session_id, [(USER_SPEAKER, prompt, None)])
+                responses = await coordinator.run_round(
+                    history,
+                    system_prompt=job.get("system", DEFAULT_SYSTEM_PROMPT),
+                    stream_callback=on_chunk if self.stream_chunks else None,
+                )
+                self.db.queue_messages(session_id, [
+                    (r["speaker"], r["content"], r.get("metadata")) for r in responses if r["success"] and r["content"]
+                ])
+                for response in responses:
+                    self.writer.emit("response", job=job_id, session_id=session_id, turn=turn, **response)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            self.failed += 1
+            self.writer.emit("error", job=job_id, error=f"{type(e).__name__}: {e}")
+            return
+        finally:
+            if coordinator is not None:
+                await coordinator.close()
+
+        self.completed += 1
+        self.writer.emit(
+            "done", job=job_id, session_id=session_id, elapsed_s=round(time.monotonic() - started, 3)
+        )
+
+    async def close(self) -> None:
+        if self.council is not None:
+            await self.council.close()
+        await response_cache.close()
+
+
+async def run_batch(args: argparse.Namespace) -> int:
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8")
+    db = Database(args.db, metrics=metrics)
+    await db.open()
+    runner = HeadlessRunner(
+        db, EventWriter(output), args.concurrency, args.chunks, args.vendor_limit, args.cache
+    )
+    try:
+        await runner.run(read_jobs(source))
+    except RuntimeError as e:
+        # No healthy Council members
+        EventWriter(output).emit("error", job=None, error=str(e))
+        return 2
+    finally:
+        await runner.close()
+        await db.close()
+        metrics.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if runner.failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL jobs file, or - for stdin")
+    parser.add_argument("--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Sessions run at once")
+    parser.add_argument("--vendor-limit", type=int, help="Concurrent streams per vendor (default: config)")
+    parser.add_argument("--chunks", action="store_true", help="Also emit every streamed chunk")
+    parser.add_argument("--cache", action="store_true", help="Replay identical turns from the response cache")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Database file")
+    args = parser.parse_args()
+    # Logs go to stderr; stdout carries only NDJSON events
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    return asyncio.run(run_batch(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+SKYFORGE Chambers - Performance Metrics
+
+Per-turn timings, token counts and DB write latency, so we can see which
+vendor makes a round slow.
+
+- Every event is kept in a small rolling window per speaker (for `/debug`:
+  p50/p95 of queue wait, TTFT, total time, tokens/s, DB writes).
+- With `observability.enable_metrics` on, events are also appended to
+  `observability.log_path` as newline-delimited JSON. File I/O happens on a
+  logging QueueListener thread; the event loop only serializes and enqueues.
+"""
+
+import json
+import logging
+import logging.handlers
+import math
+import queue
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from .config import ObservabilityConfig, config
+
+logger = logging.getLogger(__name__)
+
+# Numeric fields summarized as rolling percentiles (field -> label)
+ROLLING_FIELDS = {
+    "queue_wait_s": "wait",
+    "ttft_s": "ttft",
+    "total_s": "total",
+    "tokens_per_s": "tok/s",
+    "write_s": "write",
+}
+# Counters summed since startup
+COUNTED_FIELDS = ("retries", "hedged", "failed")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (which must not be empty)."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class MetricsRecorder:
+    """
+    Collects metric events; optionally streams them to an NDJSON log.
+
+    The log file is opened on the first event, so importing this module
+    (or running with metrics disabled) never touches the filesystem.
+    """
+
+    def __init__(self, settings: ObservabilityConfig, window: int = 200):
+        self.settings = settings
+        self.window = window
+        # speaker -> field -> recent values
+        self._rolling: Dict[str, Dict[str, Deque[float]]] = defaultdict(dict)
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._log: Optional[logging.Logger] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._log_failed = False
+
+    def record(self, event: str, speaker: str, **fields: Any) -> None:
+        """Record one event (e.g. `turn` for a speaker, `db_write` for `db`)."""
+        rolling = self._rolling[speaker]
+        counts = self._counts[speaker]
+        counts["events"] += 1
+        for field, value in fields.items():
+            if field in ROLLING_FIELDS and value is not None:
+                samples = rolling.get(field)
+                if samples is None:
+                    samples = rolling[field] = deque(maxlen=self.window)
+                samples.append(value)
+            elif field in COUNTED_FIELDS and value:
+                counts[field] += int(value)
+
+        if self.settings.enable_metrics and not self._log_failed:
+            log = self._log or self._start()
+            if log is not None:
+                line = {"ts": round(time.time(), 3), "event": event, "speaker": speaker}
+                line.update(fields)
+                log.info(json.dumps(line, default=str))
+
+    def _start(self) -> Optional[logging.Logger]:
+        """Open the NDJSON log behind a queue so writes stay off the event loop."""
+        path = Path(self.settings.log_path).expanduser()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(path, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Metrics log unavailable ({e}); metrics kept in memory only")
+            self._log_failed = True
+            return None
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(records, file_handler)
+        self._listener.start()
+
+        log = logging.getLogger(f"{__name__}.ndjson")
+        log.handlers = [logging.handlers.QueueHandler(records)]
+        log.setLevel(logging.INFO)
+        log.propagate = False  # Never mix metrics into the app log
+        self._log = log
+        return log
+
+    def summary(self) -> str:
+        """Rolling p50/p95 per speaker, one line each (the `/debug` view)."""
+        if not self._rolling:
+            return "No metrics recorded yet."
+
+        lines = []
+        for speaker in sorted(self._rolling):
+            rolling, counts = self._rolling[speaker], self._counts[speaker]
+            parts = [f"{speaker:<8} n={counts['events']}"]
+            for field, label in ROLLING_FIELDS.items():
+                samples = rolling.get(field)
+                if samples:
+                    values = list(samples)
+                    unit = "" if field == "tokens_per_s" else "s"
+                    parts.append(
+                        f"{label} p50 {percentile(values, 50):.2f}{unit} "
+                        f"p95 {percentile(values, 95):.2f}{unit}"
+                    )
+            extras = [f"{field} {counts[field]}" for field in COUNTED_FIELDS if counts.get(field)]
+            lines.append(" | ".join(parts + extras))
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Drain queued lines to disk and close the log."""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+            self._log = None
+
+
+# Shared recorder for the app (coordinator, database)
+metrics = MetricsRecorder(config.observability)
@@ -4,14 +4,31 @@ from typing import List, Dict, AsyncIterator, Optional
 class AIClient(ABC):
     """Abstract Base Class for AI Models."""
 
+    # True if the vendor continues a trailing assistant message (prefill),
+    # which lets the coordinator resume an interrupted stream mid-reply.
+    supports_prefill: bool = False
+
     @abstractmethod
-    async def stream_response(self, messages: List[Dict[str, str]], system_prompt: str) -> AsyncIterator[str]:
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
         """
         Stream the response token by token.
         
         Args:
             messages: List of message dicts [{'role': 'user', 'content': '...'}, ...]
             system_prompt: The system instruction.
+            stop_sequences: Strings that end generation server-side, most
+                important first (clients keep as many as their vendor allows).
+            usage: Filled in with this call's token usage (input_tokens,
+                output_tokens and, where the vendor reports them,
+                cache_read_input_tokens / cache_creation_input_tokens) once
+                the stream completes. Per call, because clients are shared
+                by concurrent sessions; left empty if the stream is cut short.
             
         Yields:
             Tokens (chunks) of the response.
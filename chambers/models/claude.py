@@ -1,47 +1,129 @@
 import os
 import logging
-from typing import List, Dict, AsyncIterator
+from typing import List, Dict, AsyncIterator, Any, Optional
 from anthropic import AsyncAnthropic
 from .base import AIClient
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+CACHE_CONTROL = {"type": "ephemeral"}
+MAX_CACHE_BREAKPOINTS = 4  # Anthropic API limit per request
+# History breakpoint moves in steps of this many messages, so it stays put
+# (and keeps hitting) for several turns before advancing.
+HISTORY_BREAKPOINT_STEP = 8
+
+
 class ClaudeClient(AIClient):
-    def __init__(self):
+    supports_prefill = True  # A trailing assistant message is continued
+
+    def __init__(self, ai_id: str = "claude"):
+        self.ai_id = ai_id
         self.api_key = config.anthropic_api_key
         if not self.api_key:
             logger.warning("ANTHROPIC_API_KEY not found in config")
-        
+
         self.client = AsyncAnthropic(api_key=self.api_key)
-        self.model = config.ai_models["claude"].model
+        self.model = config.ai_models[ai_id].model
+        self.temperature = config.ai_models[ai_id].temperature
 
     async def health_check(self) -> bool:
         if not self.api_key:
             return False
         try:
-            # Cheap call to verify connectivity
-            await self.client.messages.create(
-                model=self.model,
-                max_tokens=1,
-                messages=[{"role": "user", "content": "ping"}]
-            )
+            # Liveness probe: model metadata lookup (auth + model access, no generation)
+            await self.client.models.retrieve(self.model)
             return True
         except Exception as e:
             logger.error(f"Claude health check failed: {e}")
             return False
 
-    async def stream_response(self, messages: List[Dict[str, str]], system_prompt: str) -> AsyncIterator[str]:
+    @staticmethod
+    def _cached_system(system_prompt: str) -> Any:
+        """
+        System prompt as text blocks with cache breakpoints.
+
+        A structured prompt (context.SystemPrompt) gets breakpoints on its
+        last two stable blocks (identity/pinned and summarized history), so
+        a new summary only invalidates the history part. A plain string is
+        cached as a whole.
+        """
+        blocks = getattr(system_prompt, "blocks", None) or (system_prompt,)
+        stable = getattr(system_prompt, "stable_blocks", len(blocks))
+        cached = {max(stable - 2, 0), stable - 1} if stable else set()
+
+        system = []
+        for i, text in enumerate(blocks):
+            block = {"type": "text", "text": text}
+            if i in cached:
+                block["cache_control"] = CACHE_CONTROL
+            system.append(block)
+        return system
+
+    @staticmethod
+    def _cached_messages(messages: List[Dict[str, str]], budget: int) -> List[Dict[str, Any]]:
+        """
+        Messages with up to `budget` advancing cache breakpoints.
+
+        One breakpoint always sits on the newest message (written this turn,
+        read back next turn). A second one marks older history at a position
+        that only advances every HISTORY_BREAKPOINT_STEP messages, so long
+        sessions keep a stable cached prefix even when a turn adds many
+        messages. Only the marked messages are copied.
+        """
+        if not messages or budget <= 0:
+            return messages
+
+        positions = [len(messages) - 1]
+        older = (len(messages) - 1) // HISTORY_BREAKPOINT_STEP * HISTORY_BREAKPOINT_STEP - 1
+        if budget > 1 and older >= 0 and older not in positions:
+            positions.append(older)
+
+        cached = list(messages)
+        for i in positions:
+            msg = messages[i]
+            cached[i] = {
+                "role": msg["role"],
+                "content": [{"type": "text", "text": msg["content"], "cache_control": CACHE_CONTROL}],
+            }
+        return cached
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        system = self._cached_system(system_prompt)
+        breakpoints = sum(1 for block in system if "cache_control" in block)
+        cached_messages = self._cached_messages(messages, MAX_CACHE_BREAKPOINTS - breakpoints)
+        options = {"stop_sequences": stop_sequences} if stop_sequences else {}
+
         try:
             async with self.client.messages.stream(
                 model=self.model,
                 max_tokens=4096,
-                temperature=0.7,
-                system=system_prompt,
-                messages=messages,
+                temperature=self.temperature,
+                system=system,
+                messages=cached_messages,
+                **options,
             ) as stream:
                 async for text in stream.text_stream:
                     yield text
+                final = await stream.get_final_message()
         except Exception as e:
             logger.error(f"Claude stream error: {e}")
-            raise
\ No newline at end of file
+            raise
+
+        reported = final.usage
+        cache_read = reported.cache_read_input_tokens or 0
+        cache_write = reported.cache_creation_input_tokens or 0
+        if usage is not None:
+            usage.update({
+                "input_tokens": reported.input_tokens,
+                "output_tokens": reported.output_tokens,
+                "cache_read_input_tokens": cache_read,
+                "cache_creation_input_tokens": cache_write,
+            })
+        logger.debug(f"Claude cache: read={cache_read} write={cache_write} uncached={reported.input_tokens}")
@@ -1,63 +1,223 @@
 import os
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, AsyncIterator
+import time
+from collections import OrderedDict, deque
+from typing import List, Dict, AsyncIterator, Deque, Optional, Tuple
 import google.generativeai as genai
+from google.generativeai import caching
 from .base import AIClient
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+MAX_CACHED_MODELS = 8  # (model name, system prompt) variants kept alive
+# Gemini context caching only pays off (and is only accepted) above a
+# minimum prompt size; estimated here as chars / 4.
+CONTEXT_CACHE_MIN_TOKENS = 4096
+CONTEXT_CACHE_TTL_SECONDS = 600
+MAX_STOP_SEQUENCES = 5  # Gemini API limit
+MAX_HISTORIES = 16  # Conversations (session x speaker view) sharing this client
+
+
 class GeminiClient(AIClient):
-    def __init__(self):
+    def __init__(self, ai_id: str = "gemini"):
+        self.ai_id = ai_id
         self.api_key = config.google_api_key
         if self.api_key:
             genai.configure(api_key=self.api_key)
         else:
             logger.warning("GOOGLE_API_KEY not found in config")
-            
-        self.model_name = config.ai_models["gemini"].model
+
+        self.model_name = config.ai_models[ai_id].model
+        self.temperature = config.ai_models[ai_id].temperature
         self.model = genai.GenerativeModel(self.model_name)
 
+        # Reused across turns instead of being rebuilt every call
+        self._models: "OrderedDict[Tuple[str, str], genai.GenerativeModel]" = OrderedDict()
+        # instruction hash -> (context cache or None if unavailable, renew-after).
+        # Keyed by content, so sessions with the same stable prefix share one;
+        # bounded like the histories, as every session brings its own summaries.
+        self._context_caches: "OrderedDict[str, Tuple[Optional[caching.CachedContent], float]]" = OrderedDict()
+        # Running converted histories, one per conversation, most recent last:
+        # (source message, Gemini Content). Forked sessions share this client.
+        self._histories: Deque[Deque[Tuple[Dict[str, str], genai.protos.Content]]] = deque(maxlen=MAX_HISTORIES)
+
     async def health_check(self) -> bool:
         if not self.api_key:
             return False
         try:
-            # Simple generation check
-            await self.model.generate_content_async("ping")
+            # Liveness probe: model metadata lookup (auth + model access, no generation)
+            await asyncio.to_thread(genai.get_model, f"models/{self.model_name}")
             return True
         except Exception as e:
             logger.error(f"Gemini health check failed: {e}")
             return False
 
-    async def stream_response(self, messages: List[Dict[str, str]], system_prompt: str) -> AsyncIterator[str]:
+    @staticmethod
+    def _to_content(msg: Dict[str, str]) -> genai.protos.Content:
         # Map OpenAI/Anthropic format to Gemini format
-        gemini_history = []
-        for msg in messages:
-            role = "user" if msg["role"] == "user" else "model"
-            gemini_history.append({"role": role, "parts": [msg["content"]]})
+        role = "user" if msg["role"] == "user" else "model"
+        return genai.protos.Content(role=role, parts=[genai.protos.Part(text=msg["content"])])
+
+    def _history_for(self, messages: List[Dict[str, str]]) -> Deque[Tuple[Dict[str, str], genai.protos.Content]]:
+        """
+        The running history `messages` continues, or a new one.
+
+        Each session's views hold their own message dicts, so the history
+        whose newest source message appears in `messages` is that
+        conversation's, whichever session it belongs to.
+        """
+        present = {id(msg) for msg in messages}
+        for history in reversed(self._histories):
+            if history and id(history[-1][0]) in present:
+                self._histories.remove(history)
+                self._histories.append(history)
+                return history
+        history = deque()
+        self._histories.append(history)  # The least recently used one drops out
+        return history
+
+    def _sync_history(self, messages: List[Dict[str, str]]) -> List[genai.protos.Content]:
+        """
+        Convert only the messages that are new since this conversation's last turn.
+
+        Messages are matched by identity (the coordinator's subjective views
+        reuse the same dicts every turn). Messages evicted from the front of
+        the window are dropped; anything else unexpected triggers a rebuild.
+        """
+        if not messages:
+            return []
+        history = self._history_for(messages)
+        while history and history[0][0] is not messages[0]:
+            history.popleft()
+
+        known = len(history)
+        if known > len(messages) or (known and messages[known - 1] is not history[-1][0]):
+            history.clear()
+            known = 0
+
+        for msg in messages[known:]:
+            history.append((msg, self._to_content(msg)))
+        return [content for _, content in history]
+
+    async def _context_cache(self, system_instruction: str) -> Optional[caching.CachedContent]:
+        """
+        Gemini context cache for a long, stable system instruction.
+
+        Created once per distinct instruction and renewed when its TTL runs
+        out; failures (unsupported model, prompt below the minimum) are
+        remembered so we don't retry every turn.
+        """
+        if len(system_instruction) // 4 < CONTEXT_CACHE_MIN_TOKENS:
+            return None
+
+        key = hashlib.sha256(f"{self.model_name}\0{system_instruction}".encode()).hexdigest()
+        now = time.monotonic()
+        entry = self._context_caches.get(key)
+        if entry is not None and (entry[0] is None or entry[1] > now):
+            self._context_caches.move_to_end(key)
+            return entry[0]
 
         try:
-            # Re-initializing model with system instruction for this turn
-            model_with_sys = genai.GenerativeModel(
-                self.model_name,
-                system_instruction=system_prompt
+            cached = await asyncio.to_thread(
+                caching.CachedContent.create,
+                model=self.model_name,
+                display_name=f"chambers-{key[:12]}",
+                system_instruction=system_instruction,
+                ttl=CONTEXT_CACHE_TTL_SECONDS,
             )
-            
+            # Renew a little early so a turn never races the expiry
+            self._context_caches[key] = (cached, now + CONTEXT_CACHE_TTL_SECONDS * 0.9)
+        except Exception as e:
+            logger.info(f"Gemini context caching unavailable: {e}")
+            cached = None
+            self._context_caches[key] = (None, 0.0)
+        self._context_caches.move_to_end(key)
+        while len(self._context_caches) > MAX_HISTORIES:
+            self._context_caches.popitem(last=False)
+        return cached
+
+    async def _model_for(self, system_prompt: str) -> Tuple[genai.GenerativeModel, str]:
+        """
+        Model for this system prompt, plus any per-turn text to send inline.
+
+        The stable part of a structured prompt (context.SystemPrompt) goes
+        into a context cache when it is long enough; the volatile remainder
+        (On-Demand context) is then returned for inlining in the last message.
+        """
+        blocks = getattr(system_prompt, "blocks", None)
+        stable = getattr(system_prompt, "stable_blocks", None)
+        if blocks and stable is not None:
+            stable_text = "\n\n".join(blocks[:stable])
+            volatile_text = "\n\n".join(blocks[stable:])
+        else:
+            stable_text, volatile_text = system_prompt, ""
+
+        cached_content = await self._context_cache(stable_text)
+        cache_key = (
+            self.model_name,
+            cached_content.name if cached_content is not None else system_prompt,
+        )
+        model = self._models.get(cache_key)
+        if model is None:
+            if cached_content is not None:
+                model = genai.GenerativeModel.from_cached_content(cached_content)
+            else:
+                model = genai.GenerativeModel(self.model_name, system_instruction=system_prompt)
+            self._models[cache_key] = model
+            if len(self._models) > MAX_CACHED_MODELS:
+                self._models.popitem(last=False)
+        else:
+            self._models.move_to_end(cache_key)
+
+        return model, volatile_text if cached_content is not None else ""
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        generation_config = {"temperature": self.temperature}
+        if stop_sequences:
+            generation_config["stop_sequences"] = stop_sequences[:MAX_STOP_SEQUENCES]
+        try:
+            model, inline_context = await self._model_for(system_prompt)
+            gemini_history = self._sync_history(messages)
+
             # Start chat with history
             if gemini_history:
-                last_message = gemini_history[-1]["parts"][0]
-                history = gemini_history[:-1]
-                chat = model_with_sys.start_chat(history=history)
-                response = await chat.send_message_async(last_message, stream=True)
+                last_message = gemini_history[-1]
+                if inline_context:
+                    last_message = genai.protos.Content(
+                        role=last_message.role,
+                        parts=[genai.protos.Part(text=inline_context), *last_message.parts],
+                    )
+                chat = model.start_chat(history=gemini_history[:-1])
+                response = await chat.send_message_async(
+                    last_message, stream=True, generation_config=generation_config
+                )
             else:
                 # No history, just send prompt
-                response = await model_with_sys.generate_content_async(
-                    "Start conversation.", stream=True
+                response = await model.generate_content_async(
+                    "Start conversation.", stream=True,
+                    generation_config=generation_config
                 )
 
             async for chunk in response:
                 if chunk.text:
                     yield chunk.text
+
+            if usage is not None:
+                reported = response.usage_metadata
+                usage.update({
+                    "input_tokens": reported.prompt_token_count,
+                    "output_tokens": reported.candidates_token_count,
+                    "cache_read_input_tokens": reported.cached_content_token_count,
+                })
         except Exception as e:
             logger.error(f"Gemini stream error: {e}")
-            raise
\ No newline at end of file
+            raise
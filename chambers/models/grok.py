@@ -1,14 +1,23 @@
 import os
 import logging
-from typing import List, Dict, AsyncIterator
+from typing import List, Dict, AsyncIterator, Optional
 from openai import AsyncOpenAI
 from .base import AIClient
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+MAX_STOP_SEQUENCES = 4  # OpenAI-compatible API limit
+# Reasoning models reject `stop` (400); SpeakerGuard alone cuts bleed there
+REASONING_MODEL_PREFIXES = ("grok-4", "grok-3-mini")
+
+
+def supports_stop(model: str) -> bool:
+    return not model.startswith(REASONING_MODEL_PREFIXES)
+
 class GrokClient(AIClient):
-    def __init__(self):
+    def __init__(self, ai_id: str = "grok"):
+        self.ai_id = ai_id
         self.api_key = config.xai_api_key
         if not self.api_key:
             logger.warning("XAI_API_KEY not found in config")
@@ -17,23 +26,30 @@ class GrokClient(AIClient):
             api_key=self.api_key or "dummy-key-for-init", # Prevent crash on init, fail on health check
             base_url="https://api.x.ai/v1"
         )
-        self.model = config.ai_models["grok"].model
+        self.model = config.ai_models[ai_id].model
+        self.temperature = config.ai_models[ai_id].temperature
 
     async def health_check(self) -> bool:
         if not self.api_key:
             return False
         try:
-            await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "ping"}],
-                max_tokens=1
-            )
+            # Liveness probe: model metadata lookup (auth + model access, no generation)
+            await self.client.models.retrieve(self.model)
             return True
         except Exception as e:
             logger.error(f"Grok health check failed: {e}")
             return False
 
-    async def stream_response(self, messages: List[Dict[str, str]], system_prompt: str) -> AsyncIterator[str]:
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        options = {}
+        if stop_sequences and supports_stop(self.model):
+            options["stop"] = stop_sequences[:MAX_STOP_SEQUENCES]
         try:
             # Prepend system prompt to messages for OpenAI format
             full_messages = [{"role": "system", "content": system_prompt}] + messages
@@ -42,9 +58,20 @@ class GrokClient(AIClient):
                 model=self.model,
                 messages=full_messages,
                 stream=True,
-                temperature=0.7
+                stream_options={"include_usage": True},  # Usage arrives in a last, choice-less chunk
+                temperature=self.temperature,
+                **options,
             )
             async for chunk in stream:
+                if chunk.usage is not None and usage is not None:
+                    details = chunk.usage.prompt_tokens_details
+                    usage.update({
+                        "input_tokens": chunk.usage.prompt_tokens,
+                        "output_tokens": chunk.usage.completion_tokens,
+                        "cache_read_input_tokens": (details.cached_tokens or 0) if details else 0,
+                    })
+                if not chunk.choices:
+                    continue
                 content = chunk.choices[0].delta.content
                 if content:
                     yield content
@@ -0,0 +1,37 @@
+"""
+Client registry: vendor -> AIClient implementation.
+
+The vendor SDKs (anthropic, google.generativeai + gRPC/protobuf, openai) are
+heavy to import, so a client module is only imported the first time an
+enabled model actually needs it. Nothing here imports a vendor SDK.
+"""
+
+import importlib
+import logging
+from typing import Dict, Optional, Tuple, Type
+
+from .base import AIClient
+
+logger = logging.getLogger(__name__)
+
+# vendor -> (module relative to chambers.models, class name)
+CLIENT_CLASSES: Dict[str, Tuple[str, str]] = {
+    "anthropic": (".claude", "ClaudeClient"),
+    "google": (".gemini", "GeminiClient"),
+    "xai": (".grok", "GrokClient"),
+}
+
+
+def get_client_class(vendor: str) -> Optional[Type[AIClient]]:
+    """
+    Import (on first use) and return the client class for `vendor`.
+
+    Returns:
+        The AIClient subclass, or None if the vendor is unknown.
+    """
+    entry = CLIENT_CLASSES.get(vendor)
+    if entry is None:
+        return None
+    module_name, class_name = entry
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)
@@ -0,0 +1,231 @@
+"""
+SKYFORGE Chambers - Pinned Context Store
+
+Loads the foundation docs of `context.auto_load` (plan.md,
+PLANNING_FRAMEWORK.md, ...) for the Pinned slot, and keeps them cheap:
+
+- Each file is read once and keyed by the SHA-256 of its content
+- Token counts and budget-truncated renditions are cached on disk per
+  content hash (`context.pinned_cache_dir`), so a new session or process
+  does not tokenize an unchanged doc again
+- Changes are found with an os.stat() (mtime + size) per round. If
+  watchdog is installed and `context.watch_pinned` is on, file events
+  replace even that. A changed stat is only re-read; the version moves
+  only when the content hash changes (a `touch` or a checkout of the same
+  content changes nothing)
+
+Unchanged docs therefore cost nothing per turn, and the pinned text (the
+second block of every system prompt) stays byte-for-byte identical, so
+vendor prompt caches keep hitting.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .config import config
+from .context import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+
+class _Doc(NamedTuple):
+    path: Path
+    stat: Tuple[int, int]  # (mtime_ns, size) when last read
+    digest: str
+    text: str
+    tokens: int
+
+
+class PinnedStore:
+    """The auto-loaded docs, their token counts and truncated renditions."""
+
+    def __init__(
+        self,
+        paths: List[str],
+        cache_dir: Optional[Path] = None,
+        counter: Optional[TokenCounter] = None,
+        watch: bool = False
+    ):
+        self.paths = [Path(p).expanduser() for p in paths]
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir is not None else None
+        self.counter = counter or TokenCounter()
+        self.watch = watch
+
+        self.docs: Dict[Path, _Doc] = {}
+        self.version = 0  # Bumped whenever a doc's content changes
+        self._by_text: Dict[str, _Doc] = {}
+        self._renditions: Dict[Tuple[str, int], Tuple[str, int]] = {}  # (digest, max_tokens) -> (text, tokens)
+        self._loaded = False
+        self._dirty = threading.Event()  # Set by the watchdog thread
+        self._observer = None
+        self._missing_logged: set = set()
+
+    # --- Change detection ---
+
+    def refresh(self) -> int:
+        """
+        Pick up changed docs; returns the current `version`.
+
+        Unchanged docs cost one os.stat() each, or nothing while a watcher
+        is running and has seen no events.
+        """
+        if self.watch and self._observer is None:
+            self._start_watching()  # Before reading, so no change slips between the two
+        if self._loaded and self._observer is not None and not self._dirty.is_set():
+            return self.version
+        self._dirty.clear()
+
+        changed = False
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                if path not in self._missing_logged:
+                    self._missing_logged.add(path)
+                    logger.info(f"Pinned doc not found: {path}")
+                changed |= self.docs.pop(path, None) is not None
+                continue
+            self._missing_logged.discard(path)
+            stat = (st.st_mtime_ns, st.st_size)
+            doc = self.docs.get(path)
+            if doc is not None and doc.stat == stat:
+                continue
+            changed |= self._read(path, stat, doc)
+
+        if changed or not self._loaded:
+            self._loaded = True
+            self.version += 1
+            self._by_text = {doc.text: doc for doc in self.docs.values()}
+        return self.version
+
+    def _read(self, path: Path, stat: Tuple[int, int], previous: Optional[_Doc]) -> bool:
+        """(Re-)read one doc; True if its content changed."""
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            logger.warning(f"Could not read pinned doc {path}: {e}")
+            return self.docs.pop(path, None) is not None
+        digest = hashlib.sha256(data).hexdigest()
+        if previous is not None and previous.digest == digest:
+            self.docs[path] = previous._replace(stat=stat)
+            return False
+        if previous is not None:
+            self._renditions = {k: v for k, v in self._renditions.items() if k[0] != previous.digest}
+        text = data.decode("utf-8", errors="replace")
+        self.docs[path] = _Doc(path, stat, digest, text, self._token_count(digest, text))
+        return True
+
+    def _start_watching(self) -> None:
+        """Replace the per-round stat with file events (needs watchdog)."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.debug("watchdog not installed; pinned docs are checked with os.stat()")
+            self.watch = False
+            return
+
+        folders = {path.parent.resolve() for path in self.paths}
+        if not all(folder.is_dir() for folder in folders):
+            self.watch = False  # Nothing to watch yet; keep polling
+            return
+        watched = {str(path.resolve()) for path in self.paths}
+        dirty = self._dirty
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if {event.src_path, getattr(event, "dest_path", "")} & watched:
+                    dirty.set()
+
+        observer = Observer()
+        observer.daemon = True
+        for folder in folders:
+            observer.schedule(Handler(), str(folder), recursive=False)
+        observer.start()
+        self._observer = observer
+
+    def close(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    # --- Token cache ---
+
+    def _cache_file(self, digest: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{digest}.{self.counter.encoding_name}.json"
+
+    def _load_entry(self, digest: str) -> Dict:
+        path = self._cache_file(digest)
+        if path is None:
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_entry(self, digest: str, entry: Dict) -> None:
+        path = self._cache_file(digest)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)  # Atomic: a concurrent reader never sees half a file
+        except OSError as e:
+            logger.warning(f"Could not cache pinned tokens: {e}")
+
+    def _token_count(self, digest: str, text: str) -> int:
+        entry = self._load_entry(digest)
+        tokens = entry.get("tokens")
+        if tokens is None:
+            tokens = self.counter.count(text)
+            entry["tokens"] = tokens
+            self._save_entry(digest, entry)
+        for budget, (rendition, rendition_tokens) in entry.get("renditions", {}).items():
+            self._renditions[(digest, int(budget))] = (rendition, rendition_tokens)
+        return tokens
+
+    # --- Pinned slot ---
+
+    def texts(self) -> List[str]:
+        """The docs in `auto_load` order (missing ones left out)."""
+        return [self.docs[path].text for path in self.paths if path in self.docs]
+
+    def fit(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """
+        `text` cut to `max_tokens`, with its token count (for
+        ContextAssembler.set_pinned). Served from the caches for known docs.
+        """
+        doc = self._by_text.get(text)
+        if doc is None:
+            fitted = self.counter.truncate(text, max_tokens)
+            return fitted, self.counter.count(fitted)
+        if doc.tokens <= max_tokens:
+            return doc.text, doc.tokens
+
+        key = (doc.digest, max_tokens)
+        cached = self._renditions.get(key)
+        if cached is None:
+            fitted = self.counter.truncate(doc.text, max_tokens)
+            cached = self._renditions[key] = (fitted, self.counter.count(fitted))
+            entry = self._load_entry(doc.digest)
+            entry.setdefault("renditions", {})[str(max_tokens)] = list(cached)
+            self._save_entry(doc.digest, entry)
+        return cached
+
+
+# Singleton (read on first refresh; shared by every session of the process)
+pinned_store = PinnedStore(
+    config.context.auto_load,
+    cache_dir=Path(config.context.pinned_cache_dir),
+    watch=config.context.watch_pinned,
+)
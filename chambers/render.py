@@ -0,0 +1,177 @@
+"""
+SKYFORGE Chambers - Stream Rendering
+
+Decouples token arrival from drawing. The coordinator's stream callback only
+appends chunks to a buffer (O(1), never touches the widget); a timer flushes
+the buffer to the RichLog at most `ui.render_fps` times per second.
+
+Output is rendered as Markdown, one complete block at a time: a block ends
+at a blank line outside a code fence, so every character is parsed once and
+rendering cost stays flat however fast tokens arrive. A paragraph that
+runs on without a blank line is flushed every MAX_BLOCK_LINES lines; tables
+and lists are kept whole (a split table would lose its header row). Very
+long blocks are parsed off the event loop.
+"""
+
+import asyncio
+import re
+from typing import List, Optional, Tuple, Union
+
+from rich.markdown import Markdown
+from rich.markup import escape
+
+from .config import UIConfig
+from .coordinator import USER_SPEAKER, StreamEvent
+
+FENCE_MARKERS = ("```", "~~~")
+# Flush a block that keeps growing without a blank line after this many lines
+MAX_BLOCK_LINES = 12
+# Blocks that only render correctly whole: tables and lists
+TABLE_ROW = re.compile(r"\s*\|")
+TABLE_SEPARATOR = re.compile(r"\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+LIST_ITEM = re.compile(r"\s*(?:[-*+]|\d+[.)])\s")
+
+
+def _splittable(block: List[str]) -> bool:
+    """Whether a block may be flushed mid-way (not a table or a list)."""
+    if TABLE_ROW.match(block[0]) or LIST_ITEM.match(block[0]):
+        return False
+    return not (len(block) > 1 and "|" in block[0] and TABLE_SEPARATOR.match(block[1]))
+
+
+class MarkdownBlockSplitter:
+    """Incrementally splits a Markdown stream into complete, renderable blocks."""
+
+    def __init__(self):
+        self._pending: List[str] = []
+        self._partial = ""  # Incomplete last line
+        self._block: List[str] = []
+        self._in_fence = False
+
+    def feed(self, chunk: str) -> None:
+        self._pending.append(chunk)
+
+    def take_blocks(self) -> List[str]:
+        """Blocks completed by the text fed since the last call."""
+        if not self._pending:
+            return []
+        lines = (self._partial + "".join(self._pending)).split("\n")
+        self._pending.clear()
+        self._partial = lines.pop()
+
+        blocks = []
+        for line in lines:
+            if line.lstrip().startswith(FENCE_MARKERS):
+                self._in_fence = not self._in_fence
+                self._block.append(line)
+                if not self._in_fence:
+                    blocks.append(self._take())  # A closed code block is complete
+                continue
+
+            if not self._in_fence and not line.strip():
+                if self._block:
+                    blocks.append(self._take())
+                continue
+
+            self._block.append(line)
+            if not self._in_fence and len(self._block) >= MAX_BLOCK_LINES and _splittable(self._block):
+                blocks.append(self._take())
+        return blocks
+
+    def finish(self) -> List[str]:
+        """All remaining blocks, including the unterminated last one."""
+        blocks = self.take_blocks()
+        if self._partial:
+            self._block.append(self._partial)
+            self._partial = ""
+        self._in_fence = False
+        blocks.append(self._take())
+        return [b for b in blocks if b.strip()]
+
+    def reset(self) -> None:
+        """Drop everything not yet taken (the stream was rewound)."""
+        self._pending.clear()
+        self._partial = ""
+        self._block = []
+        self._in_fence = False
+
+    def _take(self) -> str:
+        block = "\n".join(self._block)
+        self._block = []
+        return block
+
+
+def render_message(log, speaker: str, content: str) -> None:
+    """Write one complete stored message the way it looked when streamed."""
+    if speaker == USER_SPEAKER:
+        log.write(f"[bold blue]{USER_SPEAKER}:[/bold blue] {escape(content)}")
+        return
+    log.write(f"\n[bold yellow]🤖 {speaker.upper()}:[/bold yellow]")
+    log.write(Markdown(content))
+
+
+class StreamRenderer:
+    """
+    Frame-rate-limited Markdown renderer for Council output in a RichLog.
+
+    `push()` is what the coordinator callback calls; `start()` installs the
+    flush timer and `finish()` drains everything at the end of a round.
+    """
+
+    def __init__(self, log, settings: UIConfig):
+        self.log = log
+        self.settings = settings
+        self._events: List[Tuple[str, Union[str, StreamEvent]]] = []  # Since last flush
+        self._speaker: Optional[str] = None
+        self._splitter = MarkdownBlockSplitter()
+        self._timer = None
+        self._lock = asyncio.Lock()
+
+    def start(self, owner) -> None:
+        """Start flushing on a timer owned by `owner` (the App)."""
+        if self._timer is None:
+            self._timer = owner.set_interval(1 / max(1, self.settings.render_fps), self.flush)
+
+    def push(self, speaker: str, chunk: Union[str, StreamEvent]) -> None:
+        """Buffer a chunk (or stream event). Never renders; safe at any token rate."""
+        self._events.append((speaker, chunk))
+
+    async def flush(self) -> None:
+        """Render whatever arrived since the last frame."""
+        async with self._lock:
+            events, self._events = self._events, []
+            for speaker, chunk in events:
+                if speaker != self._speaker:
+                    await self._end_message()
+                    self.log.write(f"\n[bold yellow]🤖 {speaker.upper()}:[/bold yellow]")
+                    self._speaker = speaker
+                if chunk is StreamEvent.REWIND:
+                    # Unrendered text is dropped; rendered blocks can't be unwritten
+                    self._splitter.reset()
+                    self.log.write("[dim]↺ Stream interrupted, restarting this reply...[/dim]")
+                    continue
+                self._splitter.feed(chunk)
+            for block in self._splitter.take_blocks():
+                await self._write_block(block)
+
+    async def finish(self) -> None:
+        """Flush everything, end the current message and stop the timer."""
+        await self.flush()
+        async with self._lock:
+            await self._end_message()
+            self._speaker = None
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    async def _end_message(self) -> None:
+        for block in self._splitter.finish():
+            await self._write_block(block)
+
+    async def _write_block(self, block: str) -> None:
+        if len(block) >= self.settings.markdown_offload_chars:
+            # Markdown parses in its constructor; keep huge blocks off the UI loop
+            renderable = await asyncio.to_thread(Markdown, block)
+        else:
+            renderable = Markdown(block)
+        self.log.write(renderable)
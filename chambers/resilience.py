@@ -0,0 +1,221 @@
+"""
+SKYFORGE Chambers - Resilience Primitives (Level 1, per vendor)
+
+- classify_error(): retryable (network, 429, 5xx) vs. fatal (auth, bad request)
+- retry_after():    server-provided retry hints (Retry-After headers, RetryInfo)
+- backoff_delay():  jittered exponential backoff that honors those hints
+- CircuitBreaker:   stops calling a vendor that is clearly down
+- TokenBucket:      keeps a vendor under its requests-per-minute budget
+
+Vendor SDK exceptions are inspected by duck typing (status codes, headers,
+class names) so this module never imports a vendor SDK.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Callable, Optional
+
+from .config import ResilienceConfig
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 529}  # + every 5xx (529 = Anthropic overloaded)
+RETRYABLE_NAMES = ("Timeout", "Connection", "RateLimit", "Overloaded", "Unavailable",
+                   "ResourceExhausted", "InternalServer", "DeadlineExceeded")
+FATAL_NAMES = ("Authentication", "PermissionDenied", "Unauthenticated", "BadRequest",
+               "NotFound", "InvalidArgument", "UnprocessableEntity")
+# Local programming/content errors: retrying gives the same result
+FATAL_TYPES = (ValueError, TypeError, KeyError, AttributeError, NotImplementedError)
+
+
+class ErrorKind(Enum):
+    """How the retry loop should treat an error."""
+    RETRYABLE = "retryable"
+    FATAL = "fatal"
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status from anthropic/openai (status_code) or google api_core (code)."""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(exc: BaseException) -> ErrorKind:
+    """Retryable (transient) or fatal (retrying can't help)."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return ErrorKind.RETRYABLE
+
+    status = _status_code(exc)
+    if status is not None:
+        if status in RETRYABLE_STATUS or status >= 500:
+            return ErrorKind.RETRYABLE
+        if 400 <= status < 500:
+            return ErrorKind.FATAL
+
+    name = type(exc).__name__
+    if any(marker in name for marker in RETRYABLE_NAMES):
+        return ErrorKind.RETRYABLE
+    if any(marker in name for marker in FATAL_NAMES) or isinstance(exc, FATAL_TYPES):
+        return ErrorKind.FATAL
+
+    # Unknown SDK errors: keep the old retry-everything behaviour
+    return ErrorKind.RETRYABLE
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait, if it said so."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                try:
+                    # HTTP-date form
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+    # google.rpc.RetryInfo in api_core error details
+    for detail in getattr(exc, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+def backoff_delay(
+    attempt: int, settings: ResilienceConfig, hint: Optional[float] = None
+) -> Optional[float]:
+    """
+    Delay before retry number `attempt` (0-based), or None to give up.
+
+    Full-jitter exponential backoff, so concurrent sessions don't retry in
+    lockstep. A server hint is honored as a minimum; a hint longer than
+    `max_retry_after_s` means waiting isn't worth it and we give up.
+    """
+    ceiling = min(settings.backoff_cap_s, settings.backoff_base_s * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if hint is not None:
+        if hint > settings.max_retry_after_s:
+            return None
+        delay = max(delay, hint)
+    return delay
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Vendor considered down; calls are skipped
+    HALF_OPEN = "half_open"  # Cooldown elapsed; the next call is a trial
+
+
+class CircuitBreaker:
+    """
+    Per-vendor circuit breaker.
+
+    Opens after `breaker_failure_threshold` consecutive failed turns. While
+    open, turns for the vendor are skipped instantly; after
+    `breaker_cooldown_s` it goes half-open and a single success (a turn or
+    a background probe) closes it again. A failure while half-open re-opens.
+    """
+
+    def __init__(
+        self,
+        vendor: str,
+        settings: ResilienceConfig,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.vendor = vendor
+        self.settings = settings
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> BreakerState:
+        if self.opened_at is None:
+            return BreakerState.CLOSED
+        if self.clock() - self.opened_at >= self.settings.breaker_cooldown_s:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go through right now."""
+        return self.state is not BreakerState.OPEN
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"Circuit for {self.vendor} closed")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> bool:
+        """Count a failed turn. Returns True if this (re-)opened the breaker."""
+        self.failures += 1
+        if self.state is BreakerState.HALF_OPEN or (
+            self.opened_at is None and self.failures >= self.settings.breaker_failure_threshold
+        ):
+            self.opened_at = self.clock()
+            logger.warning(
+                f"Circuit for {self.vendor} OPEN after {self.failures} failures "
+                f"(skipping for {self.settings.breaker_cooldown_s}s)"
+            )
+            return True
+        return False
+
+
+class TokenBucket:
+    """
+    Per-vendor request budget shared by every session in the process.
+
+    Refills at `per_minute / 60` tokens a second up to `burst`; `acquire()`
+    waits for a token instead of letting the vendor answer 429. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = per_minute / 60
+        self.capacity = float(burst or max(1, int(per_minute // 60)))
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if the budget is spent. Returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= 1
+        return waited
@@ -0,0 +1,234 @@
+"""
+SKYFORGE Chambers - Local Response Cache (opt-in)
+
+Identical turns (same model, temperature, system prompt and subjective
+history) are answered from a local cache instead of the vendor: replayed
+sessions, regenerated rounds and repeated headless evaluations stop being
+re-billed and re-waited.
+
+- Key: SHA-256 over model id, temperature, system prompt and messages
+- Memory: LRU of the most recent `memory_entries` responses
+- Disk: SQLite store, capped at `max_mb` (least recently used go first) and
+  `max_age_days` (older responses are never replayed)
+- CachingClient wraps an AIClient; a hit is replayed chunk by chunk at full
+  speed, so stream callbacks, rendering and persistence see a normal stream
+
+Only streams that finish are stored; an interrupted or failed stream
+leaves nothing behind.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+import aiosqlite
+
+from .config import ResponseCacheConfig, config
+from .models.base import AIClient
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    chunks TEXT NOT NULL,
+    usage TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_hit ON responses(last_hit);
+"""
+
+# Metrics/metadata marker on a replayed turn (no vendor tokens were billed)
+CACHE_HIT_USAGE = {"response_cache_hits": 1}
+
+
+class CachedResponse(NamedTuple):
+    chunks: List[str]
+    usage: Dict[str, int]
+    created_at: float
+
+
+def cache_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    messages: List[Dict[str, str]],
+    stop_sequences: Optional[List[str]] = None
+) -> str:
+    """Stable hash of everything that determines a vendor's reply."""
+    payload = json.dumps(
+        [model, temperature, str(system_prompt), messages, stop_sequences or []],
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU in front of a size- and age-bounded SQLite store."""
+
+    def __init__(self, path: Path, settings: ResponseCacheConfig):
+        self.path = Path(path).expanduser()
+        self.settings = settings
+        self.memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._disk_bytes = 0
+
+    @property
+    def max_age_s(self) -> float:
+        return self.settings.max_age_days * 86400
+
+    async def open(self) -> None:
+        if self._conn is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = await aiosqlite.connect(self.path)
+        await self._conn.executescript("PRAGMA journal_mode=WAL;" + SCHEMA)
+        await self._conn.commit()
+        await self._evict()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.settings.memory_entries:
+            self.memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is not None and now - entry.created_at <= self.max_age_s:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        entry = None
+        if self._conn is not None:
+            async with self._conn.execute(
+                "SELECT chunks, usage, created_at FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.max_age_s)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is not None:
+                entry = CachedResponse(json.loads(row[0]), json.loads(row[1]), row[2])
+                await self._conn.execute("UPDATE responses SET last_hit = ? WHERE key = ?", (now, key))
+                await self._conn.commit()
+                self._remember(key, entry)
+
+        if entry is None:
+            self.memory.pop(key, None)  # Expired
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    async def put(self, key: str, model: str, chunks: List[str], usage: Dict[str, int]) -> None:
+        entry = CachedResponse(chunks, usage, time.time())
+        self._remember(key, entry)
+        if self._conn is None:
+            return
+        encoded = json.dumps(chunks, ensure_ascii=False)
+        size = len(encoded.encode())
+        async with self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)) as cursor:
+            previous = await cursor.fetchone()
+        await self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, chunks, usage, size, created_at, last_hit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, model, encoded, json.dumps(usage), size, entry.created_at, entry.created_at)
+        )
+        await self._conn.commit()
+        self._disk_bytes += size - (previous[0] if previous else 0)
+        if self._disk_bytes > self.settings.max_mb * 1024 * 1024:
+            await self._evict()
+
+    async def _evict(self) -> None:
+        """Drop expired responses, then least recently used ones down to 90% of the cap."""
+        await self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age_s,))
+        async with self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses") as cursor:
+            self._disk_bytes = (await cursor.fetchone())[0]
+
+        target = self.settings.max_mb * 1024 * 1024 * 0.9
+        if self._disk_bytes > target:
+            excess = self._disk_bytes - target
+            # Oldest hits first until enough bytes are freed (running total per row)
+            await self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_hit, key) - size AS freed_before
+                        FROM responses
+                    ) WHERE freed_before < ?
+                )
+                """,
+                (excess,)
+            )
+            async with self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses") as cursor:
+                self._disk_bytes = (await cursor.fetchone())[0]
+            logger.info(f"Response cache trimmed to {self._disk_bytes / 1024 / 1024:.1f} MB")
+        await self._conn.commit()
+
+
+class CachingClient(AIClient):
+    """AIClient wrapper that answers identical requests from a ResponseCache."""
+
+    def __init__(self, client: AIClient, cache: ResponseCache, model: str, temperature: float):
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.supports_prefill = client.supports_prefill
+
+    async def health_check(self) -> bool:
+        return await self.client.health_check()
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        stop_sequences: Optional[List[str]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        key = cache_key(self.model, self.temperature, system_prompt, messages, stop_sequences)
+        try:
+            cached = await self.cache.get(key)
+        except Exception as e:
+            # A broken cache must never fail a turn
+            logger.warning(f"Response cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            for chunk in cached.chunks:
+                yield chunk
+            if usage is not None:
+                usage.update(CACHE_HIT_USAGE)
+            return
+
+        chunks = []
+        reported: Dict[str, int] = {}
+        async for chunk in self.client.stream_response(
+            messages, system_prompt, stop_sequences=stop_sequences, usage=reported
+        ):
+            chunks.append(chunk)
+            yield chunk
+        if usage is not None:
+            usage.update(reported)
+        if chunks:
+            try:
+                await self.cache.put(key, self.model, chunks, reported)
+            except Exception as e:
+                logger.warning(f"Could not cache {self.model} response: {e}")
+
+
+# Singleton (opened by whoever enables it: app, headless runner, server)
+response_cache = ResponseCache(Path(config.response_cache.path), config.response_cache)
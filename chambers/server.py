@@ -0,0 +1,367 @@
+"""
+SKYFORGE Chambers - Council Server (many sessions, one client pool)
+
+A long-running asyncio service hosting many concurrent sessions. A single
+template TurnCoordinator owns the vendor clients, health checks and
+circuit breakers; every session is a fork of it, so a hundred sessions
+still cost one set of connections and one round of startup probes.
+
+Scheduling:
+- Rounds are queued per session and started round-robin across sessions
+  with pending work, at most `server.max_active_rounds` at once, so one
+  busy session cannot starve the others
+- Per vendor, at most `latency.vendor_concurrency` streams run at once and
+  `server.vendor_rpm` caps requests per minute (token bucket)
+
+Protocol: NDJSON over a Unix socket (`server.socket_path`) or stdio. Every
+request may carry an "id", echoed back as "ref" in its replies.
+
+    {"op": "open"}                              -> opened {session_id}
+    {"op": "attach", "session_id": ...}         -> attached {session_id, messages}
+    {"op": "say", "session_id": ..., "text": ..., "system"?: ...}
+                                                -> queued {position}; then, to every
+                                                   attached client: round_start, chunk,
+                                                   response, round_done
+    {"op": "detach", "session_id": ...}         -> detached
+    {"op": "status"}                            -> status {sessions, active_rounds, ...}
+
+Usage:
+    python -m chambers.server                  # Unix socket
+    python -m chambers.server --stdio          # one frontend over stdin/stdout
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from .config import ServerConfig, config
+from .coordinator import USER_SPEAKER, StreamEvent, TurnCoordinator
+from .database import DB_PATH, Database
+from .metrics import metrics
+from .pinned import pinned_store
+from .response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+
+class ProtocolError(Exception):
+    """A request the server cannot act on (reported back to the client)."""
+    pass
+
+
+class Connection:
+    """One attached frontend: NDJSON lines in, NDJSON events out."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.sessions: Set[str] = set()
+
+    def send(self, event: str, **fields: Any) -> None:
+        """Queue an event; never blocks a round on a slow frontend."""
+        if self.writer.is_closing():
+            return
+        line = json.dumps({"event": event, **fields}, ensure_ascii=False, default=str)
+        self.writer.write(line.encode() + b"\n")
+
+
+@dataclass
+class _Round:
+    text: str
+    system_prompt: str
+    ref: Any = None
+
+
+@dataclass
+class _Session:
+    coordinator: TurnCoordinator
+    messages: List[Dict[str, str]]
+    pending: Deque[_Round] = field(default_factory=deque)
+    subscribers: Set[Connection] = field(default_factory=set)
+    running: bool = False  # A round of this session is scheduled or streaming
+
+
+class CouncilServer:
+    """Hosts sessions over one shared Council and schedules their rounds fairly."""
+
+    def __init__(self, db: Database, settings: Optional[ServerConfig] = None):
+        self.db = db
+        self.settings = settings or config.server
+        self.council: Optional[TurnCoordinator] = None
+        self.sessions: Dict[str, _Session] = {}
+
+        self._ready: Deque[str] = deque()  # Sessions with a round waiting, in turn order
+        self._wakeup = asyncio.Event()
+        self._round_slots = asyncio.Semaphore(max(1, self.settings.max_active_rounds))
+        self._scheduler: Optional[asyncio.Task] = None
+        self._rounds: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Build the shared client pool, run health checks once, start scheduling."""
+        self.council = TurnCoordinator(
+            "server", db=self.db, metrics=metrics,
+            response_cache=response_cache if config.response_cache.enabled else None,
+            pinned=pinned_store,
+        )
+        await self.council.initialize()
+        self.council.limit_vendor_concurrency(config.latency.vendor_concurrency)
+        for vendor, per_minute in self.settings.vendor_rpm.items():
+            self.council.limit_vendor_rate(vendor, per_minute)
+        self._scheduler = asyncio.create_task(self._schedule())
+
+    async def close(self) -> None:
+        tasks = [t for t in (self._scheduler, *self._rounds) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for session in self.sessions.values():
+            await session.coordinator.close()
+        self.sessions.clear()
+        if self.council is not None:
+            await self.council.close()
+        await response_cache.close()
+        pinned_store.close()
+
+    # --- Requests ---
+
+    async def handle(self, conn: Connection, request: Dict[str, Any]) -> None:
+        """Dispatch one protocol request; failures are reported, never raised."""
+        ref = request.get("id")
+        op = request.get("op")
+        try:
+            handler = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+            if handler is None:
+                raise ProtocolError(f"unknown op {op!r}")
+            await handler(conn, request, ref)
+        except (ProtocolError, KeyError) as e:
+            # KeyError: TurnCoordinator.resume() of an unknown session
+            conn.send("error", ref=ref, error=str(e.args[0]))
+
+    async def _op_open(self, conn: Connection, request: Dict[str, Any], ref: Any) -> None:
+        session_id = await self.db.create_session()
+        self.sessions[session_id] = _Session(self.council.fork(session_id), [])
+        self._subscribe(conn, session_id)
+        conn.send("opened", ref=ref, session_id=session_id)
+
+    async def _op_attach(self, conn: Connection, request: Dict[str, Any], ref: Any) -> None:
+        session_id = self._session_id(request)
+        if session_id not in self.sessions:
+            coordinator = self.council.fork(session_id)
+            messages = await coordinator.resume(session_id)  # KeyError if unknown
+            # Another frontend may have attached while we were loading
+            if self.sessions.setdefault(session_id, _Session(coordinator, messages)).coordinator is not coordinator:
+                await coordinator.close()
+        self._subscribe(conn, session_id)
+        conn.send(
+            "attached", ref=ref, session_id=session_id,
+            messages=len(self.sessions[session_id].messages),
+        )
+
+    async def _op_say(self, conn: Connection, request: Dict[str, Any], ref: Any) -> None:
+        session_id = self._session_id(request)
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ProtocolError(f"session {session_id} is not open (attach it first)")
+        text = request.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ProtocolError("say needs non-empty text")
+        session.pending.append(_Round(text, request.get("system", DEFAULT_SYSTEM_PROMPT), ref))
+        if not session.running and session_id not in self._ready:
+            self._ready.append(session_id)
+            self._wakeup.set()
+        conn.send("queued", ref=ref, session_id=session_id, position=len(session.pending))
+
+    async def _op_detach(self, conn: Connection, request: Dict[str, Any], ref: Any) -> None:
+        session_id = self._session_id(request)
+        await self._unsubscribe(conn, session_id)
+        conn.send("detached", ref=ref, session_id=session_id)
+
+    async def _op_status(self, conn: Connection, request: Dict[str, Any], ref: Any) -> None:
+        conn.send(
+            "status",
+            ref=ref,
+            sessions=len(self.sessions),
+            active_rounds=len(self._rounds),
+            queued_rounds=sum(len(s.pending) for s in self.sessions.values()),
+            speakers=list(self.council.speaker_queue),
+            unhealthy=sorted(self.council.unhealthy_speakers),
+            breakers={vendor: b.state.value for vendor, b in self.council.breakers.items()},
+        )
+
+    @staticmethod
+    def _session_id(request: Dict[str, Any]) -> str:
+        session_id = request.get("session_id")
+        if not isinstance(session_id, str):
+            raise ProtocolError("missing session_id")
+        return session_id
+
+    def _subscribe(self, conn: Connection, session_id: str) -> None:
+        self.sessions[session_id].subscribers.add(conn)
+        conn.sessions.add(session_id)
+
+    async def _unsubscribe(self, conn: Connection, session_id: str) -> None:
+        conn.sessions.discard(session_id)
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+        session.subscribers.discard(conn)
+        await self._maybe_unload(session_id)
+
+    async def disconnect(self, conn: Connection) -> None:
+        for session_id in list(conn.sessions):
+            await self._unsubscribe(conn, session_id)
+
+    async def _maybe_unload(self, session_id: str) -> None:
+        """Nobody attached and nothing queued: free the session (it is all in the DB)."""
+        session = self.sessions.get(session_id)
+        if session is None or session.subscribers or session.pending or session.running:
+            return
+        del self.sessions[session_id]
+        await session.coordinator.close()
+
+    # --- Scheduling ---
+
+    async def _schedule(self) -> None:
+        """Start the next session's round whenever a round slot is free (round-robin)."""
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._round_slots.acquire()
+            session_id = self._ready.popleft()
+            session = self.sessions.get(session_id)
+            if session is None or not session.pending:
+                self._round_slots.release()
+                continue
+            session.running = True
+            task = asyncio.create_task(self._run_round(session_id, session, session.pending.popleft()))
+            self._rounds.add(task)
+            task.add_done_callback(self._rounds.discard)
+
+    async def _run_round(self, session_id: str, session: _Session, request: _Round) -> None:
+        def broadcast(event: str, **fields: Any) -> None:
+            for conn in list(session.subscribers):
+                conn.send(event, session_id=session_id, **fields)
+
+        async def on_chunk(speaker: str, chunk) -> None:
+            if isinstance(chunk, StreamEvent):
+                broadcast("chunk", ref=request.ref, speaker=speaker, control=chunk.value)
+            else:
+                broadcast("chunk", ref=request.ref, speaker=speaker, text=chunk)
+
+        try:
+            broadcast("round_start", ref=request.ref)
+            session.messages.append({"role": "user", "content": request.text})
+            self.db.queue_messages(session_id, [(USER_SPEAKER, request.text, None)])
+            responses = await session.coordinator.run_round(
+                session.messages, system_prompt=request.system_prompt, stream_callback=on_chunk
+            )
+            self.db.queue_messages(session_id, [
+                (r["speaker"], r["content"], r.get("metadata")) for r in responses if r["success"] and r["content"]
+            ])
+            for response in responses:
+                broadcast("response", ref=request.ref, **response)
+            broadcast("round_done", ref=request.ref)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Round for {session_id} failed")
+            broadcast("error", ref=request.ref, error=f"{type(e).__name__}: {e}")
+        finally:
+            self._round_slots.release()
+            session.running = False
+            if session.pending:
+                # Back of the line: every other waiting session goes first
+                self._ready.append(session_id)
+                self._wakeup.set()
+            else:
+                await self._maybe_unload(session_id)
+
+    # --- Transports ---
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = Connection(reader, writer)
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    conn.send("error", ref=None, error=f"invalid request: {e}")
+                else:
+                    await self.handle(conn, request)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            await self.disconnect(conn)
+            writer.close()
+
+    async def serve_unix(self, path: str) -> None:
+        socket_path = Path(path).expanduser()
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            socket_path.unlink()  # Stale socket from a previous run
+        server = await asyncio.start_unix_server(self.serve_connection, path=str(socket_path))
+        os.chmod(socket_path, 0o600)
+        logger.info(f"Council server listening on {socket_path}")
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self.serve_connection(reader, writer)
+
+
+async def serve(args: argparse.Namespace) -> int:
+    db = Database(args.db, metrics=metrics)
+    await db.open()
+    server = CouncilServer(db)
+    try:
+        await server.start()
+        if args.stdio:
+            await server.serve_stdio()
+        else:
+            await server.serve_unix(args.socket or config.server.socket_path)
+    except RuntimeError as e:
+        # No healthy Council members
+        logger.error(str(e))
+        return 2
+    finally:
+        await server.close()
+        await db.close()
+        metrics.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", help="Unix socket path (default: server.socket_path)")
+    parser.add_argument("--stdio", action="store_true", help="Serve one frontend over stdin/stdout")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Database file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    try:
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
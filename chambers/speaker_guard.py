@@ -0,0 +1,93 @@
+"""
+SKYFORGE Chambers - Speaker-Bleed Guard
+
+A member that starts writing another speaker's lines ("[Gemini]: ...",
+"Grok: ...", "Vinga: ...") is impersonating them. Left alone, that text is
+streamed, shown, stored and fed back into everyone's history.
+
+Two layers stop it:
+- Vendor stop sequences (`stop_sequences()`), passed through
+  AIClient.stream_response, end the generation server-side at the most
+  common tag forms, so the tokens are never generated or billed
+- SpeakerGuard watches the stream itself for every tag form, at the start
+  of each line, and reports where to cut
+
+Only the start of a line is held back, and only while it could still
+become a tag, so ordinary text streams through unchanged.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+# Tag forms, most common first (the history itself uses "[Name]: ")
+TAG_FORMS = ("[{name}]:", "{name}:", "**{name}**:", "**{name}:**", "**[{name}]**:")
+
+
+def _display(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def stop_sequences(speakers: Iterable[str]) -> List[str]:
+    """Newline-anchored stop sequences for `speakers`, most important first."""
+    names = [_display(name) for name in speakers]
+    return [f"\n{form.format(name=name)}" for form in TAG_FORMS[:2] for name in names]
+
+
+class SpeakerGuard:
+    """Finds the first line of a stream that opens with another speaker's tag."""
+
+    def __init__(self, others: Iterable[str]):
+        self.tags = [form.format(name=name.lower()) for name in others for form in TAG_FORMS]
+        self._line = ""  # Start of the current line, held back while it may be a tag
+        self._at_line_start = True
+        self.speaker: Optional[str] = None  # Who was impersonated, once stopped
+
+    def _match(self, fragment: str) -> Tuple[Optional[str], bool]:
+        """(tag the fragment opens with, whether it could still become one)."""
+        text = fragment.lstrip(" \t").lower()
+        for tag in self.tags:
+            if text.startswith(tag):
+                return tag, False
+        return None, any(tag.startswith(text) for tag in self.tags)
+
+    def feed(self, chunk: str) -> Tuple[str, bool]:
+        """
+        Text that is safe to emit, and whether the stream must stop.
+
+        On a stop, the returned text ends where the impersonating line
+        begins (trailing whitespace trimmed); everything after is dropped.
+        """
+        if self.speaker is not None:
+            return "", True
+        safe: List[str] = []
+        pos = 0
+        while pos < len(chunk):
+            if not self._at_line_start:
+                newline = chunk.find("\n", pos)
+                if newline < 0:
+                    safe.append(chunk[pos:])
+                    break
+                safe.append(chunk[pos:newline + 1])
+                pos = newline + 1
+                self._at_line_start = True
+                continue
+
+            # At a line start: grow the held fragment until it decides
+            newline = chunk.find("\n", pos)
+            end = len(chunk) if newline < 0 else newline
+            self._line += chunk[pos:end]
+            pos = end
+            tag, possible = self._match(self._line)
+            if tag is not None:
+                self.speaker = tag.strip("[]*:")
+                return "".join(safe).rstrip(), True
+            if possible and newline < 0:
+                break  # Undecided: wait for the next chunk
+            safe.append(self._line)
+            self._line = ""
+            self._at_line_start = False
+        return "".join(safe), False
+
+    def finish(self) -> str:
+        """End of stream: a held fragment was not a tag after all."""
+        held, self._line = self._line, ""
+        return "" if self.speaker is not None else held
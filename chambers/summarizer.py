@@ -0,0 +1,205 @@
+"""
+SKYFORGE Chambers - Second-Order Summarizer (Hot -> History rollover)
+
+Messages evicted from the hot window are gathered into chunks of about
+`context.summary_chunk_tokens`. Each chunk is shown in the History slot at
+once as a truncated placeholder (a short excerpt per message), so nothing
+vanishes from context. A background worker then summarizes the chunk with a
+cheap model (`context.summary_model`), swaps the summary in place of the
+placeholder and stores it, keyed by message range, for future resumes.
+
+Turns never wait for a summary (unless `latency.summarize_async` is off);
+if summarizing fails or times out, the placeholder simply stays.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional
+
+from .config import ContextConfig, LatencyConfig
+from .context import ContextAssembler, message_speaker
+from .models.base import AIClient
+
+if TYPE_CHECKING:
+    from .database import Database
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "You maintain the long-term memory of the Skyforge Council, a conversation "
+    "between Vinga (the user) and several AI members. Summarize the transcript "
+    "excerpt you are given into dense notes: decisions, open questions, facts, "
+    "and who proposed what. Keep names. Do not add anything that isn't there. "
+    "Reply with the notes only."
+)
+
+
+class _Job(NamedTuple):
+    session_id: str
+    key: int                       # History slot handle (context.add_summary)
+    start_seq: int
+    end_seq: int
+    messages: List[Dict[str, str]]
+
+
+class Summarizer:
+    """
+    Background worker that turns evicted hot context into history summaries.
+
+    Wire `on_evict` into the ContextAssembler. `client_factory` builds the
+    summary model's client on first use (None: placeholders only).
+    """
+
+    def __init__(
+        self,
+        context: ContextAssembler,
+        settings: ContextConfig,
+        latency: LatencyConfig,
+        session_id: str,
+        client_factory: Callable[[], Optional[AIClient]],
+        model: str = "",
+        db: Optional["Database"] = None
+    ):
+        self.context = context
+        self.settings = settings
+        self.latency = latency
+        self.session_id = session_id
+        self.client_factory = client_factory
+        self.model = model
+        self.db = db
+
+        self._client: Optional[AIClient] = None
+        self._client_loaded = False
+        self._queue: "asyncio.Queue[_Job]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+        # The chunk still being filled: its placeholder key, range and messages
+        self._open_key: Optional[int] = None
+        self._open_start = 0
+        self._open_messages: List[Dict[str, str]] = []
+        self._open_tokens = 0
+
+    # --- Hot-window hook (synchronous, never blocks a turn) ---
+
+    def on_evict(self, messages: List[Dict[str, str]]) -> None:
+        """ContextAssembler hook: extend the open chunk; hand it off once full."""
+        if not self._open_messages:
+            self._open_start = self.context.evicted_seq - len(messages)
+        self._open_messages.extend(messages)
+        self._open_tokens += sum(self.context.message_tokens(m) for m in messages)
+
+        placeholder = self._placeholder(self._open_messages)
+        if self._open_key is None or not self.context.replace_summary(self._open_key, placeholder):
+            self._open_key = self.context.add_summary(placeholder)
+
+        if self._open_tokens >= self.settings.summary_chunk_tokens:
+            self._submit()
+
+    def _placeholder(self, messages: List[Dict[str, str]]) -> str:
+        """Truncation fallback: a short excerpt of every message in the chunk."""
+        counter = self.context.counter
+        lines = []
+        for message in messages:
+            content = message["content"]
+            excerpt = counter.truncate(content, self.settings.summary_excerpt_tokens)
+            ellipsis = "…" if len(excerpt) < len(content) else ""
+            lines.append(f"- {excerpt.strip()}{ellipsis}")
+        return "Earlier (excerpts):\n" + "\n".join(lines)
+
+    def _submit(self) -> None:
+        """Close the open chunk and queue it for summarization."""
+        job = _Job(
+            self.session_id,
+            self._open_key,
+            self._open_start,
+            self._open_start + len(self._open_messages),
+            self._open_messages,
+        )
+        self._open_key = None
+        self._open_messages = []
+        self._open_tokens = 0
+        self._queue.put_nowait(job)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._work())
+
+    # --- Worker ---
+
+    def _get_client(self) -> Optional[AIClient]:
+        if not self._client_loaded:
+            self._client_loaded = True
+            try:
+                self._client = self.client_factory()
+            except Exception as e:
+                logger.warning(f"Summary model unavailable ({e}); keeping excerpts")
+        return self._client
+
+    async def _work(self) -> None:
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            try:
+                await self._summarize(job)
+            except Exception as e:
+                logger.warning(f"Summary of messages {job.start_seq}-{job.end_seq} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _summarize(self, job: _Job) -> None:
+        client = self._get_client()
+        if client is None:
+            return
+
+        # Council messages already carry their [Name]: tag
+        transcript = "\n\n".join(
+            f"[Vinga]: {m['content']}" if message_speaker(m) == "user" else m["content"]
+            for m in job.messages
+        )
+        prompt = [{"role": "user", "content": transcript}]
+
+        async def collect() -> str:
+            return "".join([chunk async for chunk in client.stream_response(prompt, SUMMARY_PROMPT)])
+
+        summary = (await asyncio.wait_for(collect(), self.latency.summary_timeout_s)).strip()
+        if not summary:
+            return
+
+        text = f"Messages {job.start_seq + 1}-{job.end_seq}:\n{summary}"
+        # One synchronous swap: a turn sees either the excerpts or the summary
+        if job.session_id == self.session_id and not self.context.replace_summary(job.key, text):
+            logger.debug(f"Summary {job.start_seq}-{job.end_seq} aged out of the history slot")
+        if self.db is not None:
+            self.db.save_summary(job.session_id, job.start_seq, job.end_seq, text, self.model)
+
+    async def drain(self) -> None:
+        """Wait for every queued summary (used when summarize_async is off)."""
+        await self._queue.join()
+
+    # --- Resume ---
+
+    async def restore(self, session_id: str, up_to_seq: int) -> int:
+        """
+        Load stored summaries of a resumed session into the History slot.
+
+        Only summaries of messages before `up_to_seq` (the first message
+        back in the hot window) are used. Returns how many were loaded.
+        """
+        self.session_id = session_id
+        self.context.clear_history()
+        self._open_key = None
+        self._open_messages = []
+        self._open_tokens = 0
+        if self.db is None:
+            return 0
+        rows = await self.db.get_summaries(session_id, up_to_seq)
+        for row in rows:
+            self.context.add_summary(row["content"])
+        return len(rows)
+
+    async def close(self) -> None:
+        """Stop the worker (unfinished summaries keep their placeholders)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
@@ -11,14 +11,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 from chambers.config import config
-from chambers.models.claude import ClaudeClient
-from chambers.models.gemini import GeminiClient
-from chambers.models.grok import GrokClient
+from chambers.models.registry import get_client_class
 
-async def test_client(name, client_cls):
+async def test_client(ai_id, client_cls):
+    name = ai_id.capitalize()
     print(f"\n--- Testing {name} ---")
     try:
-        client = client_cls()
+        client = client_cls(ai_id)
         print(f"Client initialized. Model: {client.model}")
         
         if hasattr(client, 'api_key'):
@@ -42,9 +41,14 @@ async def main():
     print("🔍 DEBUG: AI Client Health Checks")
     print(f"Config loaded from: {Path('.env').absolute()}")
     
-    await test_client("Claude", ClaudeClient)
-    await test_client("Gemini", GeminiClient)
-    await test_client("Grok", GrokClient)
+    for ai_id, settings in config.ai_models.items():
+        if not settings.enabled:
+            continue
+        client_cls = get_client_class(settings.vendor)
+        if client_cls is None:
+            print(f"\n--- Skipping {ai_id}: unknown vendor '{settings.vendor}' ---")
+            continue
+        await test_client(ai_id, client_cls)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,68 +1,64 @@
+"""
+Export Chambers sessions to Markdown or NDJSON.
+
+Usage:
+    python scripts/export_session.py                  # latest session -> exports/
+    python scripts/export_session.py all --format ndjson --out archive/
+    python scripts/export_session.py 2-10 --concurrency 8
+    python scripts/export_session.py <session-id> --force
+
+Unchanged sessions (same last_updated as the previous export into the same
+directory) are skipped.
+"""
+
+import argparse
 import asyncio
-import aiosqlite
 import sys
 from pathlib import Path
-from datetime import datetime
 
 # Ensure path is correct for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from chambers.database import DB_PATH
-
-async def export_latest_session():
-    if not DB_PATH.exists():
-        print(f"❌ Database not found at {DB_PATH}")
-        return
+from chambers.config import config
+from chambers.database import DB_PATH, Database
+from chambers.export import FORMATS, Exporter
 
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        
-        # Get latest session
-        async with db.execute("SELECT * FROM sessions ORDER BY last_updated DESC LIMIT 1") as cursor:
-            session = await cursor.fetchone()
-            
-        if not session:
-            print("❌ No sessions found.")
-            return
 
-        session_id = session["id"]
-        print(f"📜 Exporting Session: {session_id}")
-        print(f"📅 Created: {session['created_at']}")
+async def run(args: argparse.Namespace) -> int:
+    if not args.db.exists():
+        print(f"❌ Database not found at {args.db}")
+        return 1
 
-        # Get messages
-        async with db.execute(
-            "SELECT * FROM messages WHERE session_id = ? ORDER BY id ASC", 
-            (session_id,)
-        ) as cursor:
-            messages = await cursor.fetchall()
+    db = Database(args.db)
+    await db.open()
+    try:
+        exporter = Exporter(db, args.out, args.format, args.concurrency, args.force)
+        try:
+            result = await exporter.export(args.selector)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    finally:
+        await db.close()
 
-    # Format Markdown
-    output_lines = [
-        f"# Skyforge Chambers Session: {session_id}",
-        f"**Date:** {session['created_at']}",
-        f"**Messages:** {len(messages)}",
-        "",
-        "---",
-        ""
-    ]
+    for path in result.exported:
+        print(f"📜 {path}")
+    for session_id, error in result.failed.items():
+        print(f"❌ {session_id}: {error}")
+    print(f"✅ Export complete ({result.summary()}) -> {exporter.out_dir.absolute()}")
+    return 1 if result.failed else 0
 
-    for msg in messages:
-        timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
-        speaker = msg["speaker"].upper()
-        content = msg["content"]
-        
-        output_lines.append(f"### 🕒 {timestamp} - **{speaker}**")
-        output_lines.append("")
-        output_lines.append(content)
-        output_lines.append("")
-        output_lines.append("---")
-        output_lines.append("")
 
-    filename = "latest_session.md"
-    with open(filename, "w") as f:
-        f.write("\n".join(output_lines))
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("selector", nargs="?", default="last", help="all | last | N | N-M (1 = most recent) | session id")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=config.export.format)
+    parser.add_argument("--out", type=Path, default=Path(config.export.out_dir), help="Output directory")
+    parser.add_argument("--concurrency", type=int, default=config.export.concurrency)
+    parser.add_argument("--force", action="store_true", help="Re-export unchanged sessions too")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Database file")
+    return asyncio.run(run(parser.parse_args()))
 
-    print(f"✅ Export complete: {Path(filename).absolute()}")
 
 if __name__ == "__main__":
-    asyncio.run(export_latest_session())
+    sys.exit(main())
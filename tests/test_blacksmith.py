@@ -0,0 +1,110 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from chambers.blacksmith import BlacksmithClient
+from chambers.blacksmith_stub import StandInBlacksmith
+
+DOCS = {
+    "schema.py": "class Schema:\n    fields = {}\n\nclass Other:\n    pass",
+    "plan.md": "# Plan\n\nThe Schema class validates sessions.",
+}
+
+
+@pytest_asyncio.fixture
+async def stand_in():
+    server = StandInBlacksmith(DOCS)
+    server.url = await server.start()
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def client(stand_in):
+    client = BlacksmithClient(stand_in.url, timeout_ms=1000)
+    yield client
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_queries_reuse_one_keep_alive_connection_and_session(stand_in, client):
+    chunks = await client.get_macro_chunks("Schema class validates")
+    assert chunks[:2] == ["The Schema class validates sessions.", "class Schema:\n    fields = {}"]
+
+    for query in ("Other", "Plan", "fields"):
+        assert await client.get_macro_chunks(query)
+    assert stand_in.connections == 1
+    assert len(stand_in.sessions) == 1
+    assert stand_in.calls["get_macro_chunks"] == 4
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_share_one_request(stand_in, client):
+    stand_in.delay_s = 0.1
+    results = await asyncio.gather(*(client.get_macro_chunks("Schema  class") for _ in range(5)))
+
+    assert all(result == results[0] and result for result in results)
+    assert stand_in.calls["get_macro_chunks"] == 1
+    assert client.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_or_missing_server_yields_empty_within_the_deadline(stand_in, caplog):
+    stand_in.delay_s = 1.0
+    client = BlacksmithClient(stand_in.url, timeout_ms=100)
+    try:
+        started = time.monotonic()
+        assert await client.get_macro_chunks("Schema") == []
+        assert await client.get_macro_chunks("Other") == []
+        assert time.monotonic() - started < 0.6
+        assert client.timeouts == 2
+        assert [r.levelname for r in caplog.records if "timed out" in r.getMessage()] == ["WARNING"]
+    finally:
+        await client.close()
+
+    unreachable = BlacksmithClient("http://127.0.0.1:9/mcp", timeout_ms=500)
+    try:
+        assert await unreachable.get_macro_chunks("Schema") == []
+    finally:
+        await unreachable.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_is_cleared_by_reindex(stand_in, tmp_path):
+    now = [0.0]
+    client = BlacksmithClient(stand_in.url, timeout_ms=1000, cache_ttl_s=60, clock=lambda: now[0])
+    try:
+        assert await client.get_macro_chunks("Schema") == await client.get_macro_chunks("Schema")
+        assert stand_in.calls["get_macro_chunks"] == 1 and client.hits == 1
+
+        now[0] = 61.0
+        await client.get_macro_chunks("Schema")
+        assert stand_in.calls["get_macro_chunks"] == 2
+
+        doc = tmp_path / "schema.md"
+        doc.write_text("The Schema moved to models.py.")
+        assert await client.reindex(str(doc))
+        assert stand_in.calls["reindex"] == 1
+        assert "The Schema moved to models.py." in await client.get_macro_chunks("Schema")
+        assert stand_in.calls["get_macro_chunks"] == 3
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_results_in_flight_during_a_reindex_are_not_cached(stand_in, client):
+    stand_in.delay_s = 0.1
+    pending = asyncio.ensure_future(client.get_macro_chunks("Schema"))
+    await asyncio.sleep(0.02)
+    client.invalidate()
+    assert await pending
+    await client.get_macro_chunks("Schema")
+    assert stand_in.calls["get_macro_chunks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_handshakes_again_when_the_server_forgets_its_session(stand_in, client):
+    await client.get_macro_chunks("Schema")
+    stand_in.sessions.clear()  # Server restart
+    assert await client.get_macro_chunks("Other")
+    assert len(stand_in.sessions) == 1
@@ -0,0 +1,31 @@
+from chambers.context import SystemPrompt
+from chambers.models.claude import ClaudeClient, MAX_CACHE_BREAKPOINTS
+
+
+def breakpoints(blocks):
+    return [i for i, b in enumerate(blocks) if "cache_control" in b]
+
+
+def test_system_breakpoints_on_stable_blocks_only():
+    prompt = SystemPrompt(["identity", "pinned", "history", "on-demand"], stable_blocks=3)
+    system = ClaudeClient._cached_system(prompt)
+    assert [b["text"] for b in system] == ["identity", "pinned", "history", "on-demand"]
+    assert breakpoints(system) == [1, 2]
+
+    # A plain string is cached as one block
+    assert breakpoints(ClaudeClient._cached_system("You are CLAUDE.")) == [0]
+
+
+def test_history_breakpoints_advance_in_steps():
+    messages = [{"role": "user", "content": f"m{i}"} for i in range(12)]
+    cached = ClaudeClient._cached_messages(messages, MAX_CACHE_BREAKPOINTS - 2)
+    assert breakpoints_in(cached) == [7, 11]
+    # Unmarked messages are passed through untouched
+    assert cached[0] is messages[0]
+
+    messages.append({"role": "assistant", "content": "m12"})
+    assert breakpoints_in(ClaudeClient._cached_messages(messages, 2)) == [7, 12]
+
+
+def breakpoints_in(messages):
+    return [i for i, m in enumerate(messages) if isinstance(m["content"], list)]
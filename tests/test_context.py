@@ -0,0 +1,76 @@
+from chambers.config import ContextConfig
+from chambers.context import ContextAssembler, TokenCounter
+
+
+class WordCounter(TokenCounter):
+    """Deterministic counter for tests: one token per word."""
+
+    def count(self, text):
+        return len(text.split())
+
+    def truncate(self, text, max_tokens):
+        return " ".join(text.split()[:max_tokens])
+
+
+def make_assembler(**budgets):
+    return ContextAssembler(ContextConfig(**budgets), counter=WordCounter())
+
+
+def test_hot_window_evicts_oldest_messages():
+    evicted = []
+    ctx = make_assembler(budget_hot=20)
+    ctx.on_evict = evicted.extend
+
+    messages = [{"role": "user", "content": f"message number {i}"} for i in range(5)]
+    ctx.sync(messages)  # 7 tokens each incl. overhead -> only 2 fit
+
+    assert [m["content"] for m in ctx.hot_messages()] == ["message number 3", "message number 4"]
+    assert [m["content"] for m in evicted] == ["message number 0", "message number 1", "message number 2"]
+    assert ctx.usage()["hot"] == (14, 20)
+
+
+def test_sync_is_incremental_and_keeps_newest_message():
+    ctx = make_assembler(budget_hot=5)
+    messages = [{"role": "user", "content": "short"}]
+    ctx.sync(messages)
+    messages.append({"role": "user", "content": "a very long message that alone exceeds the budget"})
+    ctx.sync(messages)
+
+    # The newest message is never evicted, even when over budget
+    assert ctx.hot_messages() == [messages[-1]]
+
+
+def test_slots_are_rendered_into_system_prompt_within_budget():
+    ctx = make_assembler(budget_pinned=6, budget_history=3)
+    ctx.set_pinned(["plan one two three", "framework four five six"])
+    ctx.add_summary("old summary here")
+    ctx.add_summary("new summary")
+
+    system = ctx.render_system("You are CLAUDE.")
+    assert system.startswith("You are CLAUDE.")
+    assert "## Pinned Context" in system
+    assert ctx.pinned_tokens <= 6
+    # Oldest summary dropped once the history budget overflowed
+    assert "old summary" not in system and "new summary" in system
+    assert "[Pinned: 2 docs]" in ctx.usage_summary()
+
+
+def test_subjective_views_are_maintained_incrementally():
+    ctx = make_assembler(budget_hot=100)
+    messages = [
+        {"role": "user", "content": "Hello Council"},
+        {"role": "assistant", "content": "[Claude]: I am Claude.", "speaker": "claude"},
+    ]
+    ctx.sync(messages)
+    claude_view = ctx.view("claude")
+    gemini_view = ctx.view("gemini")
+    assert [m["role"] for m in claude_view] == ["user", "assistant"]
+    assert [m["role"] for m in gemini_view] == ["user", "user"]
+
+    # Legacy message without a structured speaker: the tag is parsed once
+    messages.append({"role": "assistant", "content": "[Gemini]: And I am Gemini."})
+    ctx.sync(messages)
+    assert ctx.view("gemini")[-1]["role"] == "assistant"
+    assert ctx.view("claude")[-1]["role"] == "user"
+    # Views only ever contain what vendors accept
+    assert all(set(m) == {"role", "content"} for m in ctx.view("claude"))
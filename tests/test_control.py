@@ -0,0 +1,43 @@
+from chambers.control import Control, ControlParser, ControlToken
+
+
+def parse(chunks):
+    parser = ControlParser()
+    visible, tokens = [], []
+    for chunk in chunks:
+        text, found = parser.feed(chunk)
+        visible.append(text)
+        tokens.extend(found)
+    visible.append(parser.finish())
+    return visible, tokens
+
+
+def test_tags_split_across_chunks_are_recognized():
+    visible, tokens = parse(["Agreed [", "[NO", "D]", "] moving on"])
+    assert "".join(visible) == "Agreed  moving on"
+    assert tokens == [ControlToken(Control.NOD)]
+
+    visible, tokens = parse(["[[PA", "SS: Cl", "aude]", "]"])
+    assert "".join(visible) == ""
+    assert tokens == [ControlToken(Control.PASS, "Claude")]
+    assert tokens[0].ends_turn
+
+
+def test_plain_text_is_never_held_back():
+    visible, tokens = parse(["Hello ", "world, ", "see [note] and [[wiki link]]"])
+    assert visible[:3] == ["Hello ", "world, ", "see [note] and [[wiki link]]"]
+    assert tokens == []
+
+    # An unknown name is released as soon as it can't become a token
+    visible, _ = parse(["x [[foo", " bar"])
+    assert visible[0] == "x [[foo"
+
+
+def test_board_updates_and_unterminated_tags():
+    visible, tokens = parse(["a[[UPDATE_BOARD: goal: ship", " v2]]b [[THINK"])
+    assert tokens == [ControlToken(Control.UPDATE_BOARD, "goal: ship v2")]
+    # An unterminated tag at the end of the stream is just text
+    assert "".join(visible) == "ab [[THINK"
+
+    _, tokens = parse(["[[NOD: with an argument]]"])
+    assert tokens == []
@@ -1,27 +1,29 @@
 import pytest
 import asyncio
+from collections import deque
 from unittest.mock import MagicMock, AsyncMock, patch
 from chambers.coordinator import TurnCoordinator, ConfigValidator
-from chambers.config import config
+from chambers.config import AppConfig
 
 # Mock the Config to avoid needing real API keys
 @pytest.fixture(autouse=True)
 def mock_config():
-    with patch('chambers.coordinator.config') as mock_cfg:
-        # Setup mock models
-        mock_cfg.ai_models = {
-            "claude": MagicMock(enabled=True, vendor="anthropic", fallback=None),
-            "gemini": MagicMock(enabled=True, vendor="google", fallback=None),
-            "grok": MagicMock(enabled=True, vendor="xai", fallback=None),
-        }
+    # Real sub-configs (defaults), mock models; never read the local .env
+    test_cfg = AppConfig(_env_file=None)
+    test_cfg.ai_models = {
+        "claude": MagicMock(enabled=True, vendor="anthropic", fallback=None, model="claude-test"),
+        "gemini": MagicMock(enabled=True, vendor="google", fallback=None, model="gemini-test"),
+        "grok": MagicMock(enabled=True, vendor="xai", fallback=None, model="grok-test"),
+    }
+    with patch('chambers.coordinator.config', test_cfg) as mock_cfg:
         yield mock_cfg
 
 # Mock the Clients
 @pytest.fixture
 def mock_clients():
-    with patch('chambers.coordinator.ClaudeClient') as MockClaude, \
-         patch('chambers.coordinator.GeminiClient') as MockGemini, \
-         patch('chambers.coordinator.GrokClient') as MockGrok:
+    MockClaude, MockGemini, MockGrok = MagicMock(), MagicMock(), MagicMock()
+    classes = {"anthropic": MockClaude, "google": MockGemini, "xai": MockGrok}
+    with patch('chambers.coordinator.get_client_class', side_effect=classes.get):
         
         # Setup stream_response to return a generator
         async def async_gen(*args, **kwargs):
@@ -133,3 +135,444 @@ async def test_subjective_history_logic(mock_config, mock_clients):
     # Find Claude's message
     claude_msg = next(m for m in passed_messages if "I am Claude" in m["content"])
     assert claude_msg["role"] == "user"  # <--- The Critical Assertion
+
+@pytest.mark.asyncio
+async def test_parallel_round_streams_concurrently_in_order(mock_config, mock_clients):
+    """Parallel mode: speakers overlap, but output and history stay in speaker order."""
+    mock_config.latency.parallel_rounds = True
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    # Slowest speaker first, so a sequential run would take the full sum
+    delays = {"claude": 0.3, "gemini": 0.2, "grok": 0.1}
+    seen_histories = {}
+
+    def make_stream(ai_id):
+        async def stream(messages, system_prompt, **kwargs):
+            seen_histories[ai_id] = list(messages)
+            await asyncio.sleep(delays[ai_id])
+            yield f"{ai_id}-a "
+            yield f"{ai_id}-b"
+        return stream
+
+    for ai_id, client in coord.clients.items():
+        client.stream_response = make_stream(ai_id)
+
+    coord.speaker_queue = deque(["claude", "gemini", "grok"])
+    messages = [{"role": "user", "content": "@Council, report."}]
+    streamed = []
+
+    async def on_chunk(speaker, chunk):
+        streamed.append(speaker)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    responses = await coord.run_round(messages, stream_callback=on_chunk)
+    elapsed = loop.time() - started
+
+    assert elapsed < sum(delays.values())
+    assert [r["speaker"] for r in responses] == ["claude", "gemini", "grok"]
+    # Chunks are never interleaved between speakers
+    assert streamed == ["claude"] * 2 + ["gemini"] * 2 + ["grok"] * 2
+    # Committed in speaker order, and every speaker saw the same snapshot
+    assert [m["content"] for m in messages[1:]] == [
+        "[Claude]: claude-a claude-b",
+        "[Gemini]: gemini-a gemini-b",
+        "[Grok]: grok-a grok-b",
+    ]
+    assert all(len(h) == 1 for h in seen_histories.values())
+
+@pytest.mark.asyncio
+async def test_health_checks_are_concurrent_and_time_boxed(mock_config, mock_clients):
+    """A hung vendor is marked unhealthy at the deadline instead of stalling startup."""
+    mock_config.latency.health_check_timeout_s = 0.2
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def slow_ok():
+        await asyncio.sleep(0.1)
+        return True
+
+    mock_clients["claude"].return_value.health_check = slow_ok
+    mock_clients["gemini"].return_value.health_check = slow_ok
+    mock_clients["grok"].return_value.health_check = hang
+
+    coord = TurnCoordinator("test_session")
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await coord.initialize()
+
+    assert loop.time() - started < 0.5
+    assert list(coord.speaker_queue) == ["claude", "gemini"]
+    assert "grok" in coord.unhealthy_speakers
+
+
+@pytest.mark.asyncio
+async def test_cached_health_skips_probe(mock_config, mock_clients, tmp_path):
+    """A pass recorded within the TTL is reused on restart without probing."""
+    from chambers.database import Database
+
+    db = Database(tmp_path / "chambers.db")
+    await db.open()
+    try:
+        first = TurnCoordinator("s1", db=db)
+        await first.initialize()
+        await db.flush()
+
+        for mock in mock_clients.values():
+            mock.return_value.health_check.reset_mock()
+
+        second = TurnCoordinator("s2", db=db)
+        await second.initialize(wait_for_health=False)
+
+        assert list(second.speaker_queue) == ["claude", "gemini", "grok"]
+        await second.health_task
+        for mock in mock_clients.values():
+            mock.return_value.health_check.assert_not_called()
+    finally:
+        await db.close()
+
+def test_coordinator_import_does_not_load_vendor_sdks():
+    """Vendor SDKs are imported lazily by the client registry."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, chambers.coordinator; "
+        "print(sorted(m for m in ('anthropic', 'openai', 'google.generativeai') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+@pytest.mark.asyncio
+async def test_fatal_errors_are_not_retried_and_open_circuit_skips(mock_config, mock_clients):
+    """Auth failures fail fast; a vendor with an open circuit is skipped instantly."""
+    mock_config.resilience.backoff_base_s = 0.0
+    mock_config.resilience.breaker_failure_threshold = 1
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    calls = {"claude": 0, "grok": 0}
+
+    class AuthenticationError(Exception):
+        status_code = 401
+
+    async def auth_fails(messages, system_prompt, **kwargs):
+        calls["claude"] += 1
+        raise AuthenticationError("bad key")
+        yield
+
+    async def down(messages, system_prompt, **kwargs):
+        calls["grok"] += 1
+        raise ConnectionError("vendor down")
+        yield
+
+    coord.clients["claude"].stream_response = auth_fails
+    coord.clients["grok"].stream_response = down
+
+    assert await coord.execute_turn("claude", [], "sys") is None
+    assert calls["claude"] == 1
+    assert coord.turn_metadata["claude"]["error"] == "AuthenticationError"
+
+    assert await coord.execute_turn("grok", [], "sys") is None
+    assert calls["grok"] == mock_config.resilience.max_retries
+    # Breaker is now open: the next turn doesn't touch the vendor at all
+    assert await coord.execute_turn("grok", [], "sys") is None
+    assert calls["grok"] == mock_config.resilience.max_retries
+    assert coord.turn_metadata["grok"]["error"] == "circuit open"
+    for task in coord._probes.values():
+        task.cancel()
+
+@pytest.mark.asyncio
+async def test_interrupted_stream_resumes_from_partial_output(mock_config, mock_clients):
+    """Prefill-capable vendors continue the reply; only new text is streamed."""
+    from chambers.coordinator import StreamEvent
+
+    mock_config.resilience.backoff_base_s = 0.0
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    attempts = []
+
+    async def flaky(messages, system_prompt, **kwargs):
+        attempts.append(messages)
+        if len(attempts) == 1:
+            yield "The answer "
+            yield "is"
+            raise ConnectionError("dropped")
+        yield " 42."
+
+    client = coord.clients["claude"]
+    client.stream_response = flaky
+    client.supports_prefill = True
+    streamed = []
+
+    async def on_chunk(chunk):
+        streamed.append(chunk)
+
+    history = [{"role": "user", "content": "What is the answer?"}]
+    result = await coord.execute_turn("claude", history, "sys", stream_callback=on_chunk)
+
+    assert result == "The answer is 42."
+    assert streamed == ["The answer ", "is", " 42."]
+    assert attempts[1][-1] == {"role": "assistant", "content": "The answer is"}
+    assert coord.turn_metadata["claude"]["resumed"] == 1
+
+    # Without prefill support the UI is told to rewind before the restart
+    attempts.clear()
+    streamed.clear()
+    client.supports_prefill = False
+    result = await coord.execute_turn("claude", history, "sys", stream_callback=on_chunk)
+    assert streamed == ["The answer ", "is", StreamEvent.REWIND, " 42."]
+    assert result == " 42."
+
+@pytest.mark.asyncio
+async def test_slow_first_token_is_hedged_onto_fallback(mock_config, mock_clients):
+    """No first token before hedge_ttft_s: the same-vendor fallback races and wins."""
+    mock_config.latency.hedge_ttft_s = 0.05
+    mock_config.ai_models["gemini"].fallback = "gemini-flash"
+    mock_config.ai_models["gemini-flash"] = MagicMock(
+        enabled=False, vendor="google", fallback=None, model="gemini-flash-test"
+    )
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    primary_closed = asyncio.Event()
+
+    async def stalled(messages, system_prompt, **kwargs):
+        try:
+            await asyncio.sleep(10)
+            yield "too late"
+        finally:
+            primary_closed.set()
+
+    async def quick(messages, system_prompt, stop_sequences=None, usage=None):
+        yield "Flash "
+        yield "answer."
+        usage["output_tokens"] = 2
+
+    coord.clients["gemini"].stream_response = stalled
+    fallback = MagicMock(stream_response=quick)
+    coord.fallback_clients["gemini"] = fallback
+
+    result = await asyncio.wait_for(coord.execute_turn("gemini", [], "sys"), timeout=2)
+
+    assert result == "Flash answer."
+    assert primary_closed.is_set()
+    metadata = coord.turn_metadata["gemini"]
+    assert metadata["hedged"] is True
+    assert metadata["model"] == "gemini-flash-test"
+    assert metadata["fallback_from"] == "gemini-test"
+    assert metadata["usage"] == {"output_tokens": 2}
+
+    # A fast primary never starts the fallback
+    fallback.stream_response = MagicMock(side_effect=AssertionError("hedged"))
+    coord.clients["gemini"].stream_response = quick
+    assert await coord.execute_turn("gemini", [], "sys") == "Flash answer."
+    assert coord.turn_metadata["gemini"]["hedged"] is False
+
+@pytest.mark.asyncio
+async def test_round_emits_turn_metrics(mock_config, mock_clients):
+    """Each turn reports vendor-slot wait, TTFT, total time and throughput."""
+    from chambers.config import ObservabilityConfig
+    from chambers.metrics import MetricsRecorder
+
+    recorder = MetricsRecorder(ObservabilityConfig())
+    recorder.record = MagicMock()
+    coord = TurnCoordinator("test_session", metrics=recorder)
+    await coord.initialize()
+
+    await coord.run_round([{"role": "user", "content": "@Claude @Grok hi"}])
+
+    events = [c.args + (c.kwargs,) for c in recorder.record.call_args_list]
+    assert [(event, speaker) for event, speaker, _ in events] == [("turn", "claude"), ("turn", "grok")]
+    claude, grok = events[0][2], events[1][2]
+    assert claude["ttft_s"] is not None and claude["failed"] is False
+    assert claude["model"] == "claude-test"
+    # Speaking second is not queue wait: nobody contended for a vendor slot
+    assert grok["queue_wait_s"] < 0.05
+
+    # A busy vendor slot is reported as queue wait, and TTFT excludes it
+    coord.limit_vendor_concurrency(1)
+    slot = coord.vendor_slots["xai"]
+    await slot.acquire()
+    asyncio.get_running_loop().call_later(0.1, slot.release)
+    recorder.record.reset_mock()
+    await coord.run_round([{"role": "user", "content": "@Grok again"}])
+    grok = recorder.record.call_args.kwargs
+    assert grok["queue_wait_s"] >= 0.09 and grok["ttft_s"] < 0.05
+
+@pytest.mark.asyncio
+async def test_resume_loads_only_the_hot_tail(mock_config, mock_clients, tmp_path):
+    from chambers.database import Database
+
+    db = Database(tmp_path / "chambers.db")
+    await db.open()
+    try:
+        session_id = await db.create_session()
+        db.queue_messages(session_id, [
+            ("Vinga" if i % 2 == 0 else "claude", f"message {i} " + "word " * 40, None)
+            for i in range(1000)
+        ])
+        mock_config.context.budget_hot = 2000
+
+        coord = TurnCoordinator("fresh", db=db)
+        await coord.initialize()
+        history = await coord.resume(session_id)
+
+        assert coord.session_id == session_id
+        assert 0 < len(history) < 100
+        assert history[-1]["content"].startswith("[Claude]: message 999 ")
+        assert history[-1]["speaker"] == "claude"
+        assert coord.context.hot_messages() == history
+        assert coord.context.hot_tokens <= 2000
+
+        with pytest.raises(KeyError):
+            await coord.resume("missing")
+    finally:
+        await db.close()
+
+@pytest.mark.asyncio
+async def test_pass_cancels_the_stream_and_directs_the_next_speaker(mock_config, mock_clients):
+    """[[PASS: Grok]] ends Claude's turn at once and moves Grok ahead of Gemini."""
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+    order, closed = [], []
+
+    async def passing(messages, system_prompt, **kwargs):
+        order.append("claude")
+        try:
+            yield "[[PA"
+            yield "SS: Grok]]"
+            yield "a very long reply nobody asked for"
+        finally:
+            closed.append("claude")
+
+    def replying(ai_id):
+        async def stream(messages, system_prompt, **kwargs):
+            order.append(ai_id)
+            yield f"{ai_id} here [[NOD]]"
+        return stream
+
+    coord.clients["claude"].stream_response = passing
+    coord.clients["gemini"].stream_response = replying("gemini")
+    coord.clients["grok"].stream_response = replying("grok")
+    streamed = []
+
+    async def on_chunk(speaker, chunk):
+        streamed.append((speaker, chunk))
+
+    messages = [{"role": "user", "content": "@Council thoughts?"}]
+    responses = await coord.run_round(messages, stream_callback=on_chunk)
+
+    assert order == ["claude", "grok", "gemini"]
+    assert closed == ["claude"]  # Vendor stream closed before the rest was generated
+    assert responses[0] == {
+        "speaker": "claude", "content": "", "success": True, "metadata": responses[0]["metadata"],
+    }
+    assert responses[0]["metadata"]["passed"] and responses[0]["metadata"]["pass_to"] == "grok"
+    assert responses[1]["metadata"]["signals"] == ["nod"]
+    # Nothing of the pass is shown or enters the history
+    assert all(speaker != "claude" for speaker, _ in streamed)
+    assert [m["content"] for m in messages[1:]] == ["[Grok]: grok here ", "[Gemini]: gemini here "]
+
+@pytest.mark.asyncio
+async def test_signal_only_reply_is_a_successful_empty_turn(mock_config, mock_clients):
+    """A bare [[NOD]] is a valid turn, not a vendor outage."""
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    async def nodding(messages, system_prompt, **kwargs):
+        yield "[[NOD]]"
+
+    coord.clients["claude"].stream_response = nodding
+    messages = [{"role": "user", "content": "@Claude agreed?"}]
+    responses = await coord.run_round(messages)
+
+    assert responses == [{
+        "speaker": "claude", "content": "", "success": True, "metadata": responses[0]["metadata"],
+    }]
+    assert responses[0]["metadata"]["signals"] == ["nod"]
+    assert coord.breakers["anthropic"].failures == 0
+    assert len(messages) == 1  # Nothing enters the history
+
+@pytest.mark.asyncio
+async def test_speaker_bleed_is_cut_and_stop_sequences_are_sent(mock_config, mock_clients):
+    """Text written as another member is never shown or stored."""
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+    seen_stops, closed = [], []
+
+    async def bleeding(messages, system_prompt, stop_sequences=None, usage=None):
+        seen_stops.append(stop_sequences)
+        try:
+            yield "My view: ship it.\n\n[Gem"
+            yield "ini]: I agree with Claude!"
+            yield " More invented dialogue."
+        finally:
+            closed.append(True)
+
+    coord.clients["claude"].stream_response = bleeding
+    streamed = []
+
+    async def on_chunk(chunk):
+        streamed.append(chunk)
+
+    result = await coord.execute_turn("claude", [], "sys", stream_callback=on_chunk)
+
+    assert result == "My view: ship it."
+    assert "".join(streamed).rstrip() == "My view: ship it."
+    assert coord.turn_metadata["claude"]["bleed"] == "gemini"
+    assert closed == [True]
+    assert "\n[Gemini]:" in seen_stops[0] and "\n[Vinga]:" in seen_stops[0]
+    assert not any("Claude" in stop for stop in seen_stops[0])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cut_reply, content", [
+    (["Short.\n[Grok]: and more"], "Short."),  # SpeakerGuard cut
+    (["[[PASS]]", " and more"], ""),  # Early [[PASS]]
+])
+async def test_cut_turn_does_not_report_the_previous_turns_usage(mock_config, mock_clients, cut_reply, content):
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    async def reporting(messages, system_prompt, stop_sequences=None, usage=None):
+        yield "A full reply."
+        usage.update({"input_tokens": 50, "output_tokens": 999})
+
+    async def cut_short(messages, system_prompt, stop_sequences=None, usage=None):
+        for chunk in cut_reply:
+            yield chunk
+        usage.update({"output_tokens": 7})  # Never reached: the stream is closed first
+
+    coord.clients["claude"].stream_response = reporting
+    await coord.execute_turn("claude", [], "sys")
+    assert coord.turn_metadata["claude"]["usage"]["output_tokens"] == 999
+    assert "usage_partial" not in coord.turn_metadata["claude"]
+
+    coord.clients["claude"].stream_response = cut_short
+    assert await coord.execute_turn("claude", [], "sys") == content
+    metadata = coord.turn_metadata["claude"]
+    assert metadata["usage"] == {} and metadata["usage_partial"] is True
+
+
+@pytest.mark.asyncio
+async def test_reply_cut_at_its_first_line_is_an_empty_success(mock_config, mock_clients):
+    coord = TurnCoordinator("test_session")
+    await coord.initialize()
+
+    async def impersonating(messages, system_prompt, **kwargs):
+        yield "[Gemini]: I agree with Claude!"
+
+    coord.clients["claude"].stream_response = impersonating
+    messages = [{"role": "user", "content": "@Claude agreed?"}]
+    responses = await coord.run_round(messages)
+
+    assert responses == [{
+        "speaker": "claude", "content": "", "success": True, "metadata": responses[0]["metadata"],
+    }]
+    assert responses[0]["metadata"]["bleed"] == "gemini"
+    assert coord.breakers["anthropic"].failures == 0
+    assert len(messages) == 1  # Nothing enters the history
@@ -0,0 +1,141 @@
+import pytest
+import pytest_asyncio
+import aiosqlite
+from chambers.database import Database
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "chambers.db")
+    await database.open()
+    yield database
+    await database.close()
+
+
+@pytest.mark.asyncio
+async def test_round_is_written_behind_and_read_back_in_order(db):
+    session_id = await db.create_session()
+
+    db.queue_messages(session_id, [("Vinga", "Hello Council", None)])
+    committed = db.queue_messages(session_id, [
+        ("claude", "Hi", {"model": "claude-sonnet"}),
+        ("gemini", "Hello", None),
+    ])
+    await committed
+
+    rows = await db.get_session_messages(session_id)
+    assert [(r["speaker"], r["content"]) for r in rows] == [
+        ("Vinga", "Hello Council"),
+        ("claude", "Hi"),
+        ("gemini", "Hello"),
+    ]
+    assert '"model"' in rows[1]["metadata"]
+
+
+@pytest.mark.asyncio
+async def test_one_bad_write_does_not_lose_the_rest_of_its_batch(db):
+    session_id = await db.create_session()
+
+    # Queued back to back, so the writer picks them up as one batch
+    before = db.queue_messages(session_id, [("Vinga", "first", None)])
+    bad = db._enqueue([("INSERT INTO no_such_table VALUES (?)", (1,))])
+    after = db.queue_messages(session_id, [("claude", "second", None)])
+
+    await before
+    await after
+    with pytest.raises(aiosqlite.OperationalError):
+        await bad
+    rows = await db.get_session_messages(session_id)
+    assert [r["content"] for r in rows] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_writes(tmp_path):
+    path = tmp_path / "chambers.db"
+    database = Database(path)
+    await database.open()
+    session_id = await database.create_session()
+
+    # Queued but never awaited: close() must still make it durable
+    database.queue_messages(session_id, [("Vinga", "before shutdown", None)])
+    await database.close()
+
+    async with aiosqlite.connect(path) as conn:
+        async with conn.execute("SELECT content FROM messages") as cursor:
+            assert await cursor.fetchall() == [("before shutdown",)]
+
+
+@pytest.mark.asyncio
+async def test_keyset_paging_streams_and_windows_a_session(db):
+    session_id = await db.create_session()
+    other = await db.create_session()
+    db.queue_messages(session_id, [("claude", f"m{i}", None) for i in range(25)])
+    db.queue_messages(other, [("grok", "elsewhere", None)])
+
+    forward = [r["content"] async for r in db.iter_session_messages(session_id, page_size=4)]
+    assert forward == [f"m{i}" for i in range(25)]
+    backward = [r["content"] async for r in db.iter_session_messages(session_id, newest_first=True, page_size=4)]
+    assert backward == forward[::-1]
+
+    tail = await db.get_messages_before(session_id, limit=5)
+    assert [r["content"] for r in tail] == [f"m{i}" for i in range(20, 25)]
+    older = await db.get_messages_before(session_id, tail[0]["id"], limit=5)
+    assert [r["content"] for r in older] == [f"m{i}" for i in range(15, 20)]
+
+    assert (await db.get_session(session_id))["id"] == session_id
+    assert await db.get_session("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_full_text_search_ranks_and_pages_across_sessions(db):
+    first, second = await db.create_session(), await db.create_session()
+    db.queue_messages(first, [
+        ("Vinga", "How do we temper the blade?", None),
+        ("claude", "Temper it slowly; tempering twice helps.", None),
+    ])
+    db.queue_messages(second, [("gemini", "The blade needs an anvil.", None)])
+
+    hits = await db.search_messages("blade")
+    assert {hit["session_id"] for hit in hits} == {first, second}
+    assert "**blade**" in hits[0]["snippet"]
+
+    assert [h["speaker"] for h in await db.search_messages("temper*")][0] == "claude"
+    assert [h["session_id"] for h in await db.search_messages("blade", session_id=second)] == [second]
+    page = await db.search_messages("blade", limit=1, offset=1)
+    assert len(page) == 1 and page[0]["id"] != hits[0]["id"]
+
+    # FTS syntax in user input is searched literally instead of erroring
+    assert await db.search_messages('blade" OR NEAR(') == []
+
+
+@pytest.mark.asyncio
+async def test_search_index_is_backfilled_for_existing_databases(tmp_path):
+    path = tmp_path / "old.db"
+    async with aiosqlite.connect(path) as conn:
+        # A pre-FTS database (schema version 0) with history
+        await conn.executescript("""
+            CREATE TABLE sessions (id TEXT PRIMARY KEY, created_at TIMESTAMP,
+                last_updated TIMESTAMP, status TEXT, rotation_state TEXT);
+            CREATE TABLE messages (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT,
+                speaker TEXT, content TEXT, timestamp TIMESTAMP, metadata TEXT);
+            INSERT INTO sessions VALUES ('old', '2025-01-01', '2025-01-01', 'active', '{}');
+            INSERT INTO messages (session_id, speaker, content, timestamp, metadata)
+                VALUES ('old', 'grok', 'Forgotten lore about mithril', '2025-01-01T10:00:00', '{}');
+        """)
+        await conn.commit()
+
+    database = Database(path)
+    await database.open()
+    try:
+        assert [h["speaker"] for h in await database.search_messages("mithril")] == ["grok"]
+        # Triggers keep the index in sync from here on
+        await database.save_message("old", "claude", "More mithril, please", None)
+        assert len(await database.search_messages("mithril")) == 2
+    finally:
+        await database.close()
+
+    # Reopening doesn't migrate again
+    database = Database(path)
+    await database.open()
+    assert len(await database.search_messages("mithril")) == 2
+    await database.close()
@@ -0,0 +1,72 @@
+import json
+import pytest
+import pytest_asyncio
+from chambers.database import Database
+from chambers.export import Exporter
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "chambers.db")
+    await database.open()
+    yield database
+    await database.close()
+
+
+async def make_session(db, count, tag):
+    session_id = await db.create_session()
+    await db.queue_messages(session_id, [
+        ("Vinga" if i % 2 == 0 else "claude", f"{tag} message {i}", {"i": i}) for i in range(count)
+    ])
+    return session_id
+
+
+@pytest.mark.asyncio
+async def test_markdown_export_streams_every_message(db, tmp_path):
+    session_id = await make_session(db, 250, "big")
+    exporter = Exporter(db, tmp_path / "out", "md", concurrency=2)
+
+    result = await exporter.export(session_id)
+
+    text = exporter.path_for(session_id).read_text()
+    assert result.exported == [exporter.path_for(session_id)]
+    assert "**Messages:** 250" in text
+    assert text.count("### 🕒") == 250
+    assert text.index("big message 9\n") < text.index("big message 10\n")
+    assert not list((tmp_path / "out").glob("*.part"))
+
+
+@pytest.mark.asyncio
+async def test_bulk_ndjson_export_skips_unchanged_sessions(db, tmp_path):
+    first = await make_session(db, 3, "first")
+    second = await make_session(db, 2, "second")
+    exporter = Exporter(db, tmp_path / "out", "ndjson", concurrency=3)
+
+    result = await exporter.export("all")
+    assert len(result.exported) == 2 and result.skipped == 0
+    lines = [json.loads(l) for l in exporter.path_for(second).read_text().splitlines()]
+    assert lines[0]["type"] == "session" and lines[0]["id"] == second
+    assert [l["content"] for l in lines[1:]] == ["second message 0", "second message 1"]
+    assert lines[1]["metadata"] == {"i": 0}
+
+    # Nothing changed: everything is skipped
+    result = await exporter.export("all")
+    assert result.exported == [] and result.skipped == 2
+
+    # A new message touches last_updated: only that session is exported again
+    await db.save_message(first, "gemini", "late reply")
+    result = await exporter.export("all")
+    assert result.exported == [exporter.path_for(first)] and result.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_recency_selectors(db, tmp_path):
+    sessions = [await make_session(db, 1, f"s{i}") for i in range(4)]
+    exporter = Exporter(db, tmp_path / "out", "md")
+
+    assert (await exporter.export("last")).exported == [exporter.path_for(sessions[-1])]
+    result = await exporter.export("2-3")
+    assert sorted(result.exported) == sorted(exporter.path_for(s) for s in sessions[1:3])
+
+    with pytest.raises(ValueError):
+        await exporter.export("3-1")
@@ -0,0 +1,35 @@
+from chambers.models.gemini import GeminiClient
+
+
+def test_history_conversion_is_incremental():
+    client = GeminiClient()
+    m = [{"role": "user", "content": f"m{i}"} for i in range(4)]
+
+    first = client._sync_history(m[:3])
+    second = client._sync_history(m[:4])
+    # Already converted messages are reused, only the new one is converted
+    assert second[:3] == first and all(a is b for a, b in zip(first, second))
+    assert second[3].parts[0].text == "m3"
+
+    # Eviction from the front of the window keeps the rest
+    third = client._sync_history(m[1:4])
+    assert third[0] is second[1]
+
+    # An unrelated history is rebuilt from scratch
+    other = [{"role": "assistant", "content": "x"}]
+    assert client._sync_history(other)[0].role == "model"
+
+
+def test_sessions_sharing_a_client_keep_their_own_history():
+    client = GeminiClient()
+    a = [{"role": "user", "content": f"a{i}"} for i in range(3)]
+    b = [{"role": "user", "content": f"b{i}"} for i in range(3)]
+
+    first_a = client._sync_history(a[:2])
+    first_b = client._sync_history(b[:2])
+    # Interleaved turns extend each session's own history instead of rebuilding
+    second_a = client._sync_history(a)
+    second_b = client._sync_history(b)
+    assert all(x is y for x, y in zip(first_a, second_a)) and second_a[2].parts[0].text == "a2"
+    assert all(x is y for x, y in zip(first_b, second_b)) and second_b[2].parts[0].text == "b2"
+    assert len(client._histories) == 2
@@ -0,0 +1,47 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from chambers.config import AppConfig
+from chambers.models.grok import GrokClient
+
+
+async def one_chunk():
+    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hi"))], usage=None)
+    usage = SimpleNamespace(
+        prompt_tokens=12, completion_tokens=1, prompt_tokens_details=SimpleNamespace(cached_tokens=8)
+    )
+    yield SimpleNamespace(choices=[], usage=usage)
+
+
+async def sent_options(model):
+    cfg = AppConfig(_env_file=None, xai_api_key="test-key")
+    cfg.ai_models["grok"].model = model
+    with patch("chambers.models.grok.config", cfg):
+        client = GrokClient()
+    client.client.chat.completions.create = AsyncMock(return_value=one_chunk())
+    chunks = [c async for c in client.stream_response([], "sys", stop_sequences=["\n[Claude]:"] * 6)]
+    assert chunks == ["Hi"]
+    return client.client.chat.completions.create.call_args.kwargs
+
+
+@pytest.mark.asyncio
+async def test_reasoning_models_are_called_without_stop():
+    assert "stop" not in await sent_options("grok-4")
+    assert "stop" not in await sent_options("grok-3-mini")
+
+
+@pytest.mark.asyncio
+async def test_other_models_get_capped_stop_sequences():
+    assert len((await sent_options("grok-3"))["stop"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_usage_is_read_from_the_final_chunk():
+    cfg = AppConfig(_env_file=None, xai_api_key="test-key")
+    with patch("chambers.models.grok.config", cfg):
+        client = GrokClient()
+    client.client.chat.completions.create = AsyncMock(return_value=one_chunk())
+    usage = {}
+    assert [c async for c in client.stream_response([], "sys", usage=usage)] == ["Hi"]
+    assert client.client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert usage == {"input_tokens": 12, "output_tokens": 1, "cache_read_input_tokens": 8}
@@ -0,0 +1,139 @@
+import asyncio
+import io
+import json
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from chambers.config import AppConfig
+from chambers.database import Database
+from chambers.headless import EventWriter, HeadlessRunner, read_jobs
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    test_cfg = AppConfig(_env_file=None)
+    test_cfg.ai_models = {
+        "claude": MagicMock(enabled=True, vendor="anthropic", fallback=None, model="claude-test"),
+        "gemini": MagicMock(enabled=True, vendor="google", fallback=None, model="gemini-test"),
+    }
+    test_cfg.latency.hedge_ttft_s = None
+    with patch("chambers.coordinator.config", test_cfg):
+        yield test_cfg
+
+
+@pytest.fixture
+def in_flight():
+    """Fake vendors that track how many streams each has open at once."""
+    peak = {"anthropic": 0, "google": 0}
+    current = {"anthropic": 0, "google": 0}
+
+    def client_class(vendor):
+        def build(ai_id):
+            client = MagicMock()
+            client.health_check = AsyncMock(return_value=True)
+
+            async def stream_response(*args, **kwargs):
+                current[vendor] += 1
+                peak[vendor] = max(peak[vendor], current[vendor])
+                try:
+                    await asyncio.sleep(0.01)
+                    yield f"{ai_id} says "
+                    yield "hi"
+                finally:
+                    current[vendor] -= 1
+
+            client.stream_response = stream_response
+            return client
+        return build
+
+    with patch("chambers.coordinator.get_client_class", side_effect=client_class):
+        yield peak
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "chambers.db")
+    await database.open()
+    yield database
+    await database.close()
+
+
+def jobs_file(*lines):
+    return io.StringIO("".join(line + "\n" for line in lines))
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_ndjson_and_persists_sessions(db, in_flight):
+    out = io.StringIO()
+    runner = HeadlessRunner(db, EventWriter(out), concurrency=2)
+    source = jobs_file(
+        json.dumps({"id": "a", "prompt": "@Claude hello"}),
+        json.dumps({"prompt": ["First", "@Gemini second"]}),
+        "not json",
+    )
+
+    await runner.run(read_jobs(source))
+    await runner.close()
+
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    responses = [e for e in events if e["event"] == "response"]
+    assert sorted(e["job"] for e in events if e["event"] == "done") == ["2", "a"]
+    assert {(e["job"], e["turn"], e["speaker"]) for e in responses} == {
+        ("a", 0, "claude"), ("2", 0, "claude"), ("2", 0, "gemini"), ("2", 1, "gemini"),
+    }
+    assert all(e["content"].endswith("says hi") for e in responses)
+    assert [e for e in events if e["event"] == "error"][0]["job"] == "3"
+    assert events[-1] == {"event": "summary", "jobs": 3, "failed": 1, "elapsed_s": events[-1]["elapsed_s"]}
+
+    await db.flush()
+    session_id = next(e["session_id"] for e in events if e["event"] == "done" and e["job"] == "2")
+    rows = await db.get_session_messages(session_id)
+    assert [r["speaker"] for r in rows] == ["Vinga", "claude", "gemini", "Vinga", "gemini"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_that_are_not_objects_are_rejected_and_reading_goes_on():
+    source = jobs_file("[1, 2]", "42", json.dumps("@Claude hi"), "null")
+    jobs = [job async for job in read_jobs(source)]
+
+    assert [job["id"] for job in jobs] == ["1", "2", "3", "4"]
+    assert jobs[0]["error"] == "invalid job: expected an object or a string, got list"
+    assert jobs[1]["error"].endswith("got int") and jobs[3]["error"].endswith("got NoneType")
+    assert jobs[2] == {"id": "3", "prompt": "@Claude hi"}
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_clients_under_vendor_limit(db, in_flight):
+    out = io.StringIO()
+    runner = HeadlessRunner(db, EventWriter(out), concurrency=8, vendor_limit=2)
+    source = jobs_file(*(json.dumps({"prompt": f"@Claude question {i}"}) for i in range(10)))
+
+    await runner.run(read_jobs(source))
+    await runner.close()
+
+    events = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len([e for e in events if e["event"] == "done"]) == 10
+    assert in_flight["anthropic"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_job_still_closes_its_coordinator(db, in_flight):
+    out = io.StringIO()
+    runner = HeadlessRunner(db, EventWriter(out))
+    await runner.start()
+    forks = []
+    real_fork = runner.council.fork
+
+    def fork(session_id):
+        child = real_fork(session_id)
+        child.run_round = AsyncMock(side_effect=RuntimeError("boom"))
+        child.close = AsyncMock()
+        forks.append(child)
+        return child
+
+    runner.council.fork = fork
+    await runner.run_job({"id": "x", "prompt": "@Claude hi"})
+    await runner.close()
+
+    assert runner.failed == 1
+    forks[0].close.assert_awaited_once()
@@ -0,0 +1,45 @@
+import json
+from chambers.config import ObservabilityConfig
+from chambers.metrics import MetricsRecorder, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_summary_reports_rolling_percentiles_per_speaker():
+    recorder = MetricsRecorder(ObservabilityConfig(), window=10)
+    for i in range(20):
+        recorder.record("turn", "claude", ttft_s=float(i), total_s=1.0, retries=1)
+    recorder.record("turn", "grok", ttft_s=0.5, hedged=True, failed=False)
+
+    lines = recorder.summary().splitlines()
+    assert lines[0].startswith("claude")
+    # Only the last 10 samples (10..19) are in the window
+    assert "ttft p50 14.00s p95 19.00s" in lines[0]
+    assert "retries 20" in lines[0]
+    assert "hedged 1" in lines[1]
+
+
+def test_events_are_written_as_ndjson_when_enabled(tmp_path):
+    path = tmp_path / "logs" / "metrics.log"
+    recorder = MetricsRecorder(ObservabilityConfig(enable_metrics=True, log_path=str(path)))
+    recorder.record("turn", "gemini", ttft_s=0.8, usage={"input_tokens": 12})
+    recorder.record("db_write", "db", write_s=0.002, batch=1)
+    recorder.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["event"], e["speaker"]) for e in events] == [("turn", "gemini"), ("db_write", "db")]
+    assert events[0]["usage"] == {"input_tokens": 12}
+
+
+def test_disabled_recorder_never_touches_the_filesystem(tmp_path):
+    path = tmp_path / "metrics.log"
+    recorder = MetricsRecorder(ObservabilityConfig(enable_metrics=False, log_path=str(path)))
+    recorder.record("turn", "claude", ttft_s=1.0)
+    recorder.close()
+    assert not path.exists()
+    assert "claude" in recorder.summary()
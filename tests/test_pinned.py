@@ -0,0 +1,130 @@
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from chambers.config import AIModelConfig, AppConfig, ContextConfig
+from chambers.context import ContextAssembler, TokenCounter
+from chambers.coordinator import TurnCoordinator
+from chambers.models.base import AIClient
+from chambers.pinned import PinnedStore
+
+
+class CountingCounter(TokenCounter):
+    """One token per word; records every text it tokenizes."""
+
+    def __init__(self):
+        super().__init__()
+        self.counted = []
+
+    def count(self, text):
+        self.counted.append(text)
+        return len(text.split())
+
+    def truncate(self, text, max_tokens):
+        return " ".join(text.split()[:max_tokens])
+
+
+class PromptRecorder(AIClient):
+    def __init__(self):
+        self.prompts = []
+
+    async def health_check(self):
+        return True
+
+    async def stream_response(self, messages, system_prompt, **kwargs):
+        self.prompts.append(system_prompt)
+        yield "Noted."
+
+
+def make_store(tmp_path, counter=None):
+    paths = [str(tmp_path / "plan.md"), str(tmp_path / "missing.md"), str(tmp_path / "framework.md")]
+    return PinnedStore(paths, cache_dir=tmp_path / "cache", counter=counter or CountingCounter())
+
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_docs_are_tokenized_once_across_stores(tmp_path):
+    write(tmp_path / "plan.md", "plan one two three")
+    write(tmp_path / "framework.md", "framework four five six seven")
+    store = make_store(tmp_path)
+    store.refresh()
+    assert store.texts() == ["plan one two three", "framework four five six seven"]
+    assert store.fit("framework four five six seven", 3) == ("framework four five", 3)
+
+    # A new process: counts and the truncation come from the disk cache
+    counter = CountingCounter()
+    fresh = make_store(tmp_path, counter)
+    fresh.refresh()
+    assert fresh.fit("plan one two three", 10) == ("plan one two three", 4)
+    assert fresh.fit("framework four five six seven", 3) == ("framework four five", 3)
+    assert counter.counted == []
+
+
+def test_version_moves_only_when_content_changes(tmp_path):
+    plan = tmp_path / "plan.md"
+    write(plan, "plan one", mtime_ns=1_000_000_000)
+    store = make_store(tmp_path)
+    version = store.refresh()
+    assert store.refresh() == version
+
+    write(plan, "plan one", mtime_ns=2_000_000_000)  # touched, same bytes
+    assert store.refresh() == version
+    write(plan, "plan two", mtime_ns=3_000_000_000)
+    assert store.refresh() == version + 1
+    assert store.texts() == ["plan two"]
+
+    write(tmp_path / "framework.md", "framework")  # a doc that appears later
+    assert store.refresh() == version + 2
+    plan.unlink()
+    assert store.refresh() == version + 3
+    assert store.texts() == ["framework"]
+
+
+def test_unchanged_docs_keep_the_prefix_byte_stable(tmp_path):
+    write(tmp_path / "plan.md", "plan one two three")
+    write(tmp_path / "framework.md", "framework four five six seven")
+    counter = CountingCounter()
+    store = make_store(tmp_path, counter)
+    context = ContextAssembler(ContextConfig(budget_pinned=6), counter=counter)
+
+    store.refresh()
+    context.set_pinned(store.texts(), fit=store.fit)
+    first = context.render_system("You are CLAUDE.")
+    assert context.pinned_tokens == 6 and context.pinned_docs == 2
+
+    counter.counted.clear()
+    store.refresh()
+    context.set_pinned(store.texts(), fit=store.fit)
+    assert context.render_system("You are CLAUDE.").blocks[:2] == first.blocks[:2]
+    assert counter.counted == []
+
+
+@pytest.mark.asyncio
+async def test_coordinator_pins_docs_and_repins_only_on_change(tmp_path):
+    write(tmp_path / "plan.md", "plan one two three")
+    store = make_store(tmp_path)
+    cfg = AppConfig(_env_file=None)
+    cfg.ai_models = {"claude": AIModelConfig(model="claude-test", vendor="anthropic")}
+    cfg.latency.hedge_ttft_s = None
+    client = PromptRecorder()
+    with patch("chambers.coordinator.config", cfg), \
+            patch("chambers.coordinator.get_client_class", return_value=MagicMock(return_value=client)):
+        coord = TurnCoordinator("pinned", pinned=store)
+        await coord.initialize()
+        with patch.object(coord.context, "set_pinned", wraps=coord.context.set_pinned) as set_pinned:
+            messages = [{"role": "user", "content": "@Claude hi"}]
+            await coord.run_round(messages)
+            messages.append({"role": "user", "content": "@Claude again"})
+            await coord.run_round(messages)
+            assert set_pinned.call_count == 0
+            write(tmp_path / "plan.md", "plan revised")
+            await coord.run_round(messages)
+            assert set_pinned.call_count == 1
+        await coord.close()
+
+    first, second, third = client.prompts
+    assert first.blocks[1] == second.blocks[1] == "## Pinned Context\n\nplan one two three"
+    assert third.blocks[1] == "## Pinned Context\n\nplan revised"
@@ -0,0 +1,57 @@
+import pytest
+from rich.markdown import Markdown
+from chambers.config import UIConfig
+from chambers.render import MAX_BLOCK_LINES, MarkdownBlockSplitter, StreamRenderer
+
+
+def test_blocks_split_on_blank_lines_across_chunks():
+    splitter = MarkdownBlockSplitter()
+    for chunk in ["# Ti", "tle\n", "\nFirst para", "graph.\n\nSecond"]:
+        splitter.feed(chunk)
+    assert splitter.take_blocks() == ["# Title", "First paragraph."]
+    assert splitter.take_blocks() == []  # Nothing new
+    assert splitter.finish() == ["Second"]
+
+
+def test_code_fences_are_kept_whole():
+    splitter = MarkdownBlockSplitter()
+    splitter.feed("```python\nx = 1\n\ny = 2\n")
+    assert splitter.take_blocks() == []  # Blank line inside a fence is not a boundary
+    splitter.feed("```\nafter")
+    assert splitter.take_blocks() == ["```python\nx = 1\n\ny = 2\n```"]
+    assert splitter.finish() == ["after"]
+
+
+def test_long_tables_and_lists_are_not_split_mid_way():
+    rows = "".join(f"| r{i} | {i} |\n" for i in range(MAX_BLOCK_LINES * 2))
+    table = "| name | n |\n|---|---|\n" + rows
+    items = "".join(f"- item {i}\n" for i in range(MAX_BLOCK_LINES * 2))
+    prose = "".join(f"line {i}\n" for i in range(MAX_BLOCK_LINES))
+
+    splitter = MarkdownBlockSplitter()
+    splitter.feed(table + "\n" + items + "\n" + prose)
+    assert splitter.take_blocks() == [table.rstrip("\n"), items.rstrip("\n"), prose.rstrip("\n")]
+
+
+class FakeLog:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, renderable):
+        self.writes.append(renderable)
+
+
+@pytest.mark.asyncio
+async def test_renderer_buffers_until_flush_and_groups_by_speaker():
+    log = FakeLog()
+    renderer = StreamRenderer(log, UIConfig())
+    for token in "Hello there.\n\nBye".split(" "):
+        renderer.push("claude", token + " ")
+    renderer.push("gemini", "Hi")
+    assert log.writes == []  # push() never renders
+
+    await renderer.finish()
+    headers = [w for w in log.writes if isinstance(w, str)]
+    blocks = [w.markup for w in log.writes if isinstance(w, Markdown)]
+    assert len(headers) == 2 and "CLAUDE" in headers[0] and "GEMINI" in headers[1]
+    assert blocks == ["Hello there.", "Bye ", "Hi"]
@@ -0,0 +1,66 @@
+import pytest
+from types import SimpleNamespace
+from chambers.config import ResilienceConfig
+from chambers.resilience import (
+    BreakerState, CircuitBreaker, ErrorKind, TokenBucket, backoff_delay, classify_error, retry_after
+)
+
+
+class StatusError(Exception):
+    """Shaped like anthropic/openai APIStatusError."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+def test_classify_error():
+    assert classify_error(StatusError(429)) is ErrorKind.RETRYABLE
+    assert classify_error(StatusError(529)) is ErrorKind.RETRYABLE
+    assert classify_error(StatusError(401)) is ErrorKind.FATAL
+    assert classify_error(StatusError(400)) is ErrorKind.FATAL
+    assert classify_error(APIConnectionError("reset")) is ErrorKind.RETRYABLE
+    assert classify_error(TimeoutError()) is ErrorKind.RETRYABLE
+    assert classify_error(RuntimeError("unknown")) is ErrorKind.RETRYABLE
+
+
+def test_retry_after_hints_are_honored():
+    settings = ResilienceConfig(backoff_base_s=0.01, max_retry_after_s=10)
+    assert retry_after(StatusError(429, {"retry-after": "3"})) == 3.0
+    assert retry_after(StatusError(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after(StatusError(503)) is None
+
+    assert backoff_delay(0, settings, hint=3.0) >= 3.0
+    assert backoff_delay(0, settings, hint=60.0) is None  # Too long: give up
+    assert 0 <= backoff_delay(5, settings) <= settings.backoff_cap_s
+
+
+def test_circuit_breaker_opens_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker("xai", ResilienceConfig(breaker_failure_threshold=2, breaker_cooldown_s=30),
+                             clock=lambda: now[0])
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.state is BreakerState.OPEN and not breaker.allow()
+
+    now[0] = 31.0
+    assert breaker.state is BreakerState.HALF_OPEN and breaker.allow()
+    assert breaker.record_failure() is True  # Failed trial re-opens
+    assert not breaker.allow()
+
+    now[0] = 62.0
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_once_the_burst_is_spent():
+    bucket = TokenBucket(per_minute=6000, burst=2)  # 100/s
+    assert await bucket.acquire() == 0
+    assert await bucket.acquire() == 0
+    assert await bucket.acquire() > 0
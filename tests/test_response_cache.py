@@ -0,0 +1,170 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from unittest.mock import MagicMock, patch
+from chambers.config import AIModelConfig, AppConfig, ResponseCacheConfig
+from chambers.coordinator import TurnCoordinator
+from chambers.models.base import AIClient
+from chambers.response_cache import CACHE_HIT_USAGE, CachingClient, ResponseCache, cache_key
+
+
+class ScriptedClient(AIClient):
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def health_check(self):
+        return True
+
+    async def stream_response(self, messages, system_prompt, stop_sequences=None, usage=None):
+        self.calls += 1
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise ConnectionError("reset")
+            yield chunk
+        usage.update({"input_tokens": 10, "output_tokens": len(self.chunks)})
+
+
+class PacedClient(AIClient):
+    """Reports each call's own usage, after a pause that depends on the prompt."""
+
+    async def health_check(self):
+        return True
+
+    async def stream_response(self, messages, system_prompt, stop_sequences=None, usage=None):
+        slow = "slow" in messages[-1]["content"]
+        reply = "A slow, considered reply." if slow else "Quick one."
+        yield reply
+        await asyncio.sleep(0.05 if slow else 0.01)
+        usage.update({"input_tokens": 10, "output_tokens": len(reply)})
+
+
+@pytest_asyncio.fixture
+async def cache(tmp_path):
+    store = ResponseCache(tmp_path / "cache.db", ResponseCacheConfig(memory_entries=2))
+    await store.open()
+    yield store
+    await store.close()
+
+
+async def collect(client, messages, system="sys", usage=None):
+    return [chunk async for chunk in client.stream_response(messages, system, usage=usage)]
+
+
+def test_key_covers_model_temperature_prompt_and_messages():
+    messages = [{"role": "user", "content": "hi"}]
+    base = cache_key("m", 0.7, "sys", messages)
+    assert base == cache_key("m", 0.7, "sys", [{"content": "hi", "role": "user"}])
+    assert base != cache_key("m2", 0.7, "sys", messages)
+    assert base != cache_key("m", 0.2, "sys", messages)
+    assert base != cache_key("m", 0.7, "other", messages)
+    assert base != cache_key("m", 0.7, "sys", messages + [{"role": "user", "content": "again"}])
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_replay_from_memory_and_disk(cache, tmp_path):
+    inner = ScriptedClient(["The ", "forge ", "is hot."])
+    client = CachingClient(inner, cache, "model-a", 0.7)
+    messages = [{"role": "user", "content": "Status?"}]
+
+    first, second = {}, {}
+    assert await collect(client, messages, usage=first) == ["The ", "forge ", "is hot."]
+    assert first == {"input_tokens": 10, "output_tokens": 3}
+    assert await collect(client, messages, usage=second) == ["The ", "forge ", "is hot."]
+    assert inner.calls == 1 and second == CACHE_HIT_USAGE
+
+    # A fresh process (empty LRU) still hits the disk store
+    await cache.close()
+    reopened = ResponseCache(tmp_path / "cache.db", ResponseCacheConfig())
+    await reopened.open()
+    try:
+        client = CachingClient(inner, reopened, "model-a", 0.7)
+        assert await collect(client, messages) == ["The ", "forge ", "is hot."]
+        assert inner.calls == 1 and reopened.hits == 1
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_streams_are_not_cached(cache):
+    inner = ScriptedClient(["partial ", "reply"], fail_after=1)
+    client = CachingClient(inner, cache, "model-a", 0.7)
+    messages = [{"role": "user", "content": "Status?"}]
+
+    with pytest.raises(ConnectionError):
+        await collect(client, messages)
+    inner.fail_after = None
+    assert await collect(client, messages) == ["partial ", "reply"]
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_store_evicts_expired_then_least_recently_used(tmp_path):
+    settings = ResponseCacheConfig(memory_entries=0, max_mb=0.001)  # ~1 KB
+    store = ResponseCache(tmp_path / "cache.db", settings)
+    await store.open()
+    try:
+        await store.put("old", "m", ["x" * 300], {})
+        await store.put("kept", "m", ["y" * 300], {})
+        assert await store.get("old") is not None  # "old" is now the most recent hit
+        await store.put("new", "m", ["z" * 300], {})
+        await store.put("newest", "m", ["w" * 300], {})
+
+        assert await store.get("kept") is None
+        assert await store.get("newest") is not None
+
+        settings.max_age_days = 1 / 86400  # One second
+        await store._conn.execute("UPDATE responses SET created_at = ?", (time.time() - 5,))
+        assert await store.get("newest") is None
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_replays_cached_turns_through_the_callback(cache):
+    cfg = AppConfig(_env_file=None)
+    cfg.ai_models = {"claude": AIModelConfig(model="claude-test", vendor="anthropic")}
+    cfg.latency.hedge_ttft_s = None
+    inner = ScriptedClient(["Hello ", "Vinga"])
+    client_class = MagicMock(return_value=inner)
+    with patch("chambers.coordinator.config", cfg), \
+            patch("chambers.coordinator.get_client_class", return_value=client_class):
+        coord = TurnCoordinator("cached", response_cache=cache)
+        await coord.initialize()
+        streamed = []
+
+        async def callback(speaker, chunk):
+            streamed.append(chunk)
+
+        for _ in range(2):
+            responses = await coord.run_round([{"role": "user", "content": "@Claude hi"}], stream_callback=callback)
+            assert responses[0]["content"] == "Hello Vinga"
+        await coord.close()
+
+    assert inner.calls == 1
+    assert streamed == ["Hello ", "Vinga", "Hello ", "Vinga"]
+    assert responses[0]["metadata"]["usage"] == CACHE_HIT_USAGE
+
+
+@pytest.mark.asyncio
+async def test_concurrent_forked_sessions_each_get_their_own_usage(cache):
+    cfg = AppConfig(_env_file=None)
+    cfg.ai_models = {"claude": AIModelConfig(model="claude-test", vendor="anthropic")}
+    cfg.latency.hedge_ttft_s = None
+    with patch("chambers.coordinator.config", cfg), \
+            patch("chambers.coordinator.get_client_class", return_value=MagicMock(return_value=PacedClient())):
+        coord = TurnCoordinator("first", response_cache=cache)
+        await coord.initialize()
+        other = coord.fork("second")
+        slow, quick = await asyncio.gather(
+            coord.run_round([{"role": "user", "content": "@Claude slow question"}]),
+            other.run_round([{"role": "user", "content": "@Claude quick question"}]),
+        )
+        await coord.close()
+
+    # The quick session finishes while the slow one is still streaming on the same client
+    for responses in (slow, quick):
+        assert responses[0]["metadata"]["usage"]["output_tokens"] == len(responses[0]["content"])
+    assert slow[0]["content"] != quick[0]["content"]
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from chambers.config import AppConfig, ServerConfig
+from chambers.database import Database
+from chambers.server import CouncilServer
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    test_cfg = AppConfig(_env_file=None)
+    test_cfg.ai_models = {
+        "claude": MagicMock(enabled=True, vendor="anthropic", fallback=None, model="claude-test"),
+        "gemini": MagicMock(enabled=True, vendor="google", fallback=None, model="gemini-test"),
+    }
+    test_cfg.latency.hedge_ttft_s = None
+    with patch("chambers.coordinator.config", test_cfg):
+        yield test_cfg
+
+
+@pytest.fixture
+def mock_clients():
+    built = []
+
+    def client_class(vendor):
+        def build(ai_id):
+            client = MagicMock()
+            client.health_check = AsyncMock(return_value=True)
+
+            async def stream_response(messages, *args, **kwargs):
+                await asyncio.sleep(0.01)
+                yield f"{ai_id} heard {messages[-1]['content']}"
+
+            client.stream_response = stream_response
+            built.append(ai_id)
+            return client
+        return build
+
+    with patch("chambers.coordinator.get_client_class", side_effect=client_class):
+        yield built
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sessions = set()
+        self.events = []
+
+    def send(self, event, **fields):
+        self.events.append({"event": event, **fields})
+
+    def named(self, event):
+        return [e for e in self.events if e["event"] == event]
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "chambers.db")
+    await database.open()
+    yield database
+    await database.close()
+
+
+async def wait_for(conn, event, count):
+    for _ in range(500):
+        if len(conn.named(event)) >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"only {len(conn.named(event))} {event} events")
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_one_client_pool(db, mock_clients):
+    server = CouncilServer(db, ServerConfig(max_active_rounds=4))
+    await server.start()
+    conn = FakeConnection()
+    try:
+        for i in range(3):
+            await server.handle(conn, {"op": "open", "id": i})
+        session_ids = [e["session_id"] for e in conn.named("opened")]
+        for i, session_id in enumerate(session_ids):
+            await server.handle(conn, {"op": "say", "session_id": session_id, "text": f"@Claude hi {i}"})
+        await wait_for(conn, "round_done", 3)
+    finally:
+        await server.close()
+
+    # One client per member, not per session
+    assert sorted(mock_clients) == ["claude", "gemini"]
+    replies = {e["session_id"]: e["content"] for e in conn.named("response")}
+    assert replies == {sid: f"claude heard @Claude hi {i}" for i, sid in enumerate(session_ids)}
+
+    await db.flush()
+    rows = await db.get_session_messages(session_ids[0])
+    assert [(r["speaker"], r["content"]) for r in rows] == [
+        ("Vinga", "@Claude hi 0"), ("claude", "claude heard @Claude hi 0"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rounds_are_scheduled_round_robin_across_sessions(db, mock_clients):
+    server = CouncilServer(db, ServerConfig(max_active_rounds=1))
+    await server.start()
+    conn = FakeConnection()
+    try:
+        await server.handle(conn, {"op": "open"})
+        await server.handle(conn, {"op": "open"})
+        busy, quiet = [e["session_id"] for e in conn.named("opened")]
+        for i in range(3):
+            await server.handle(conn, {"op": "say", "session_id": busy, "text": f"@Gemini {i}"})
+        await server.handle(conn, {"op": "say", "session_id": quiet, "text": "@Gemini me too"})
+        await wait_for(conn, "round_done", 4)
+    finally:
+        await server.close()
+
+    # The quiet session waits for one busy round, not for all three
+    order = [e["session_id"] for e in conn.named("round_start")]
+    assert order == [busy, quiet, busy, busy]
+
+
+@pytest.mark.asyncio
+async def test_protocol_errors_and_unix_socket(db, mock_clients, tmp_path):
+    server = CouncilServer(db)
+    await server.start()
+    socket_path = str(tmp_path / "council.sock")
+    listener = await asyncio.start_unix_server(server.serve_connection, path=socket_path)
+    try:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+
+        async def request(payload):
+            writer.write((json.dumps(payload) + "\n").encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        assert (await request({"op": "fly", "id": 1}))["error"] == "unknown op 'fly'"
+        missing = await request({"op": "attach", "id": 2, "session_id": "nope"})
+        assert missing == {"event": "error", "ref": 2, "error": "No session nope"}
+        opened = await request({"op": "open", "id": 3})
+        status = await request({"op": "status", "id": 4})
+        assert status["sessions"] == 1 and status["speakers"] == ["claude", "gemini"]
+
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        # Disconnected and idle: the session is unloaded (it lives on in the DB)
+        assert opened["session_id"] not in server.sessions
+    finally:
+        listener.close()
+        await listener.wait_closed()
+        await server.close()
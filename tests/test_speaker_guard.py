@@ -0,0 +1,36 @@
+from chambers.speaker_guard import SpeakerGuard, stop_sequences
+
+OTHERS = ["gemini", "grok", "Vinga"]
+
+
+def guard_stream(chunks):
+    guard = SpeakerGuard(OTHERS)
+    emitted = []
+    for chunk in chunks:
+        text, stop = guard.feed(chunk)
+        emitted.append(text)
+        if stop:
+            return emitted, guard.speaker
+    emitted.append(guard.finish())
+    return emitted, None
+
+
+def test_cuts_at_another_speakers_tag_split_across_chunks():
+    emitted, speaker = guard_stream(["I think so.\n", "[Gem", "ini]: I agree", " with myself"])
+    assert "".join(emitted) == "I think so.\n"
+    assert speaker == "gemini"
+
+    emitted, speaker = guard_stream(["Done.\n  **Vinga**: thanks!"])
+    assert emitted == ["Done."] and speaker == "vinga"
+
+
+def test_ordinary_lines_stream_through():
+    chunks = ["Grokking this ", "takes time.\n", "The [Gemini]: tag mid-line is fine.\n", "Gr"]
+    emitted, speaker = guard_stream(chunks)
+    assert speaker is None
+    assert emitted[:3] == ["Grokking this ", "takes time.\n", "The [Gemini]: tag mid-line is fine.\n"]
+    assert "".join(emitted) == "".join(chunks)
+
+
+def test_stop_sequences_lead_with_history_tag_form():
+    assert stop_sequences(["gemini", "grok"]) == ["\n[Gemini]:", "\n[Grok]:", "\nGemini:", "\nGrok:"]
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from chambers.config import ContextConfig, LatencyConfig
+from chambers.context import ContextAssembler
+from chambers.database import Database
+from chambers.summarizer import Summarizer
+from test_context import WordCounter
+
+
+class SlowSummaryClient:
+    def __init__(self, reply="Claude proposed tempering twice.", delay=0.05, error=None):
+        self.reply, self.delay, self.error = reply, delay, error
+        self.prompts = []
+
+    async def stream_response(self, messages, system_prompt):
+        self.prompts.append(messages[0]["content"])
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        yield self.reply
+
+
+def make_summarizer(client, db=None, chunk_tokens=20, **latency):
+    settings = ContextConfig(budget_hot=20, summary_chunk_tokens=chunk_tokens, summary_excerpt_tokens=2)
+    ctx = ContextAssembler(settings, counter=WordCounter())
+    summarizer = Summarizer(
+        ctx, settings, LatencyConfig(**latency), "session-1", lambda: client, model="flash", db=db
+    )
+    ctx.on_evict = summarizer.on_evict
+    return ctx, summarizer
+
+
+def council_messages(count):
+    return [
+        {"role": "assistant", "content": f"[Claude]: point number {i} about the blade", "speaker": "claude"}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_evicted_chunk_is_truncated_at_once_and_summarized_in_background():
+    client = SlowSummaryClient()
+    db = MagicMock()
+    ctx, summarizer = make_summarizer(client, db=db)
+
+    messages = council_messages(6)  # 11 tokens each: 5 evicted, 2 per chunk
+    ctx.sync(messages)
+
+    # No waiting: excerpts stand in for the evicted messages right away
+    system = ctx.render_system("base")
+    assert "Earlier (excerpts):\n- [Claude]: point…" in system
+    assert "Messages 1-2" not in system
+
+    await summarizer.drain()
+    system = ctx.render_system("base")
+    assert "Messages 1-2:\nClaude proposed tempering twice." in system
+    assert "Messages 3-4:" in system
+    # Message 5 is still in the open chunk: excerpt only
+    assert "- [Claude]: point…" in system
+    assert client.prompts[0].startswith("[Claude]: point number 0")
+    assert [c.args[:3] for c in db.save_summary.call_args_list] == [
+        ("session-1", 0, 2), ("session-1", 2, 4)
+    ]
+    await summarizer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_summary_keeps_the_placeholder():
+    client = SlowSummaryClient(error=ConnectionError("down"), delay=0)
+    ctx, summarizer = make_summarizer(client)
+    ctx.sync(council_messages(3))
+    await summarizer.drain()
+
+    system = ctx.render_system("base")
+    assert "Earlier (excerpts)" in system and "Messages 1-2" not in system
+    await summarizer.close()
+
+
+@pytest.mark.asyncio
+async def test_stored_summaries_come_back_on_resume(tmp_path):
+    db = Database(tmp_path / "chambers.db")
+    await db.open()
+    try:
+        session_id = await db.create_session()
+        db.save_summary(session_id, 0, 10, "Messages 1-10:\nOld decisions.", "flash")
+        db.save_summary(session_id, 10, 20, "Messages 11-20:\nNewer decisions.", "flash")
+        db.save_summary(session_id, 20, 30, "Messages 21-30:\nStill in the hot window.", "flash")
+
+        ctx, summarizer = make_summarizer(SlowSummaryClient(), db=db)
+        ctx.add_summary("From another session")
+        assert await summarizer.restore(session_id, up_to_seq=20) == 2
+
+        system = ctx.render_system("base")
+        assert system.index("Old decisions") < system.index("Newer decisions")
+        assert "another session" not in system and "Still in the hot" not in system
+    finally:
+        await db.close()